@@ -9,14 +9,44 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import CONF_HOST, CONF_PORT, DOMAIN
+from .backfill import HistoryBackfill
+from .const import (
+    CONF_BACKFILL_HISTORY,
+    CONF_EXPOSE_METRICS,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_PROXY_HOST,
+    CONF_PROXY_MAX_AGE,
+    CONF_PROXY_PORT,
+    DEFAULT_BACKFILL_HISTORY,
+    DEFAULT_EXPOSE_METRICS,
+    DEFAULT_PROXY_HOST,
+    DEFAULT_PROXY_MAX_AGE,
+    DEFAULT_PROXY_PORT,
+    DOMAIN,
+)
 from .coordinator import SolarmaxCoordinator
+from .metrics import async_register_metrics_view
+from .proxy import MaxTalkProxy
+from .services import async_setup_services
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Solarmax integration."""
+    await async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -33,11 +63,49 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Use runtime_data instead of hass.data
     entry.runtime_data = coordinator
 
+    # Close the frame capture file when the entry is unloaded
+    if coordinator.api.capture is not None:
+        entry.async_on_unload(coordinator.api.capture.close)
+
     # Set up update listener for options changes
     entry.async_on_unload(entry.add_update_listener(async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Fill the statistics from the inverter's own yield history in the background
+    if entry.data.get(CONF_BACKFILL_HISTORY, DEFAULT_BACKFILL_HISTORY):
+        if coordinator.api.supports_history:
+            backfill = HistoryBackfill(hass, entry, coordinator)
+            await backfill.async_start()
+            entry.async_on_unload(backfill.async_stop)
+        else:
+            _LOGGER.warning(
+                "Yield history cannot be read from %s over this protocol",
+                entry.data[CONF_HOST],
+            )
+
+    # Share the inverter with other MaxTalk clients through the integration
+    if proxy_port := entry.data.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT):
+        proxy = MaxTalkProxy(
+            coordinator,
+            proxy_port,
+            host=entry.data.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST),
+            max_age=entry.data.get(CONF_PROXY_MAX_AGE, DEFAULT_PROXY_MAX_AGE),
+        )
+        try:
+            await proxy.async_start()
+        except OSError as err:
+            _LOGGER.error(
+                "Failed to start the MaxTalk proxy on port %d: %s", proxy_port, err
+            )
+        else:
+            coordinator.proxy = proxy
+            entry.async_on_unload(proxy.async_stop)
+
+    # The scrape endpoint only serves entries with metrics enabled
+    if entry.data.get(CONF_EXPOSE_METRICS, DEFAULT_EXPOSE_METRICS):
+        async_register_metrics_view(hass)
+
     _LOGGER.info(
         "Successfully set up Solarmax inverter at %s:%s",
         entry.data[CONF_HOST],
@@ -55,8 +123,10 @@ async def async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        # Runtime data is automatically cleaned up
-        pass
+        # Free the gateway's I/O queue; other inverters behind the same
+        # gateway get a new one with their next request
+        coordinator = entry.runtime_data
+        coordinator.io_worker.release(coordinator.api.host)
 
     return unload_ok
 
@@ -0,0 +1,95 @@
+"""Oversampling aggregation for Solarmax measurements."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from typing import Any
+
+
+class FieldAccumulator:
+    """Running mean/min/max of one field, updated in O(1) per sample."""
+
+    __slots__ = ("count", "total", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        """Initialize an empty accumulator."""
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of all samples, or None if there are none."""
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+
+class WindowAggregator:
+    """Aggregate polled samples over fixed publishing windows.
+
+    Measurement fields are averaged over the window and carry their minimum
+    and maximum; all other fields (counters, status codes) publish their
+    latest sample.
+    """
+
+    def __init__(self, window: float, fields: Iterable[str]) -> None:
+        """Initialize the aggregator."""
+        self.window = window
+        self._accumulators = {field: FieldAccumulator() for field in fields}
+        self._latest: dict[str, dict[str, Any]] = {}
+        self._window_start: float | None = None
+
+    def add(self, data: dict[str, dict[str, Any]], now: float) -> bool:
+        """Add one poll result; return True once the window is complete."""
+        if self._window_start is None:
+            self._window_start = now
+
+        for field, sample in data.items():
+            self._latest[field] = sample
+            accumulator = self._accumulators.get(field)
+            value = sample.get("value")
+            if accumulator is not None and isinstance(value, (int, float)):
+                accumulator.add(value)
+
+        return now - self._window_start >= self.window
+
+    def flush(self) -> dict[str, dict[str, Any]]:
+        """Return the aggregated window and start a new one."""
+        result: dict[str, dict[str, Any]] = {}
+        for field, sample in self._latest.items():
+            accumulator = self._accumulators.get(field)
+            if accumulator is None or not accumulator.count:
+                result[field] = sample
+                continue
+
+            result[field] = {
+                "value": round(accumulator.mean, 3),
+                "raw_value": sample.get("raw_value"),
+                "min": accumulator.minimum,
+                "max": accumulator.maximum,
+                "samples": accumulator.count,
+            }
+            accumulator.reset()
+
+        self._latest = {}
+        self._window_start = None
+        return result
@@ -0,0 +1,189 @@
+"""Background backfill of the yield history stored in Solarmax inverters."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date
+from typing import Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_DEVICE_NAME, DEFAULT_DEVICE_NAME, DOMAIN
+from .coordinator import SolarmaxCoordinator
+from .solarmax_api import (
+    HISTORY_DAY_CODES,
+    HISTORY_MONTH_CODES,
+    HISTORY_YEAR_CODES,
+    SolarmaxConnectionError,
+    SolarmaxProtocolError,
+    SolarmaxTimeoutError,
+)
+from .statistics_import import statistic_id
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# Number of history codes read per request
+BATCH_SIZE = 8
+
+HISTORY_CODES = HISTORY_DAY_CODES + HISTORY_MONTH_CODES + HISTORY_YEAR_CODES
+
+# Statistic name suffix per history period, keyed by code prefix
+PERIODS = {
+    "DD": ("daily_yield", "Daily Yield"),
+    "DM": ("monthly_yield", "Monthly Yield"),
+    "DY": ("yearly_yield", "Yearly Yield"),
+}
+
+
+class HistoryBackfill:
+    """Read the inverter's yield history and import it as statistics.
+
+    One small batch of history codes is read after each live poll, once the
+    gateway's request budget allows another request, so batches stay spaced
+    from live polls and refreshes. Progress and all records seen so far are
+    checkpointed, so an interrupted backfill resumes where it stopped after
+    a restart.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, coordinator: SolarmaxCoordinator
+    ) -> None:
+        """Initialize the backfill."""
+        self.hass = hass
+        self.entry_id = entry.entry_id
+        self.device_name = entry.data.get(CONF_DEVICE_NAME, DEFAULT_DEVICE_NAME)
+        self.coordinator = coordinator
+
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.backfill.{entry.entry_id}"
+        )
+        self._next_index = 0
+        # Records by period prefix, then ISO date -> energy in kWh
+        self._records: dict[str, dict[str, float]] = {prefix: {} for prefix in PERIODS}
+        self._task: asyncio.Task[None] | None = None
+        self._remove_listener: CALLBACK_TYPE | None = None
+
+    @property
+    def is_complete(self) -> bool:
+        """Return if all history codes have been read."""
+        return self._next_index >= len(HISTORY_CODES)
+
+    async def async_start(self) -> None:
+        """Load the checkpoint and start reading after live polls."""
+        if checkpoint := await self._store.async_load():
+            self._next_index = checkpoint.get("next_index", 0)
+            for prefix, records in checkpoint.get("records", {}).items():
+                self._records.setdefault(prefix, {}).update(records)
+
+        if self.is_complete:
+            # Re-read recent history on every start to fill gaps from outages
+            self._next_index = 0
+
+        self._remove_listener = self.coordinator.async_add_listener(
+            self._handle_coordinator_update
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the backfill."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Schedule the next batch after a successful live poll."""
+        if self._task is not None or self.is_complete:
+            return
+        if not self.coordinator.last_update_success:
+            return
+
+        self._task = self.hass.async_create_task(self._async_read_batch())
+
+    async def _async_read_batch(self) -> None:
+        """Read one batch of history codes and checkpoint the progress."""
+        codes = list(HISTORY_CODES[self._next_index : self._next_index + BATCH_SIZE])
+        try:
+            # The poll has just used the gateway's budget; wait for the
+            # spacing instead of hitting the gateway right behind it
+            await self.coordinator.gateway_bucket.async_acquire()
+            records = await self.coordinator.async_run_io(
+                self.coordinator.api.get_history, codes
+            )
+        except (
+            SolarmaxConnectionError,
+            SolarmaxTimeoutError,
+            SolarmaxProtocolError,
+        ) as err:
+            _LOGGER.debug("History batch %s failed, will retry: %s", codes[0], err)
+            return
+        finally:
+            self._task = None
+
+        for code, record in records.items():
+            if record is not None:
+                self._records[code[:2]][record.date.isoformat()] = record.energy
+
+        self._next_index += len(codes)
+        self._store.async_delay_save(self._checkpoint, SAVE_DELAY)
+        _LOGGER.debug(
+            "Read history %s to %s (%d/%d)",
+            codes[0],
+            codes[-1],
+            self._next_index,
+            len(HISTORY_CODES),
+        )
+
+        if self.is_complete:
+            self._import_statistics()
+
+    @callback
+    def _checkpoint(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"next_index": self._next_index, "records": self._records}
+
+    @callback
+    def _import_statistics(self) -> None:
+        """Import all known history records as external statistics."""
+        for prefix, (suffix, name) in PERIODS.items():
+            records = self._records[prefix]
+            if not records:
+                continue
+
+            total = 0.0
+            statistics: list[StatisticData] = []
+            for day in sorted(records):
+                total += records[day]
+                start = dt_util.as_utc(
+                    dt_util.start_of_local_day(date.fromisoformat(day))
+                )
+                statistics.append(
+                    StatisticData(start=start, state=records[day], sum=total)
+                )
+
+            async_add_external_statistics(
+                self.hass,
+                StatisticMetaData(
+                    has_mean=False,
+                    has_sum=True,
+                    name=f"{self.device_name} {name}",
+                    source=DOMAIN,
+                    statistic_id=statistic_id(self.entry_id, suffix),
+                    unit_of_measurement="kWh",
+                ),
+                statistics,
+            )
+
+        _LOGGER.info("Imported yield history of %s", self.device_name)
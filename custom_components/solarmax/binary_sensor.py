@@ -0,0 +1,136 @@
+"""Binary sensor platform for Solarmax integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import generate_entity_id
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import BINARY_SENSOR_TYPES, CONF_DEVICE_NAME, DOMAIN
+from .coordinator import SolarmaxCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Binary sensors only read coordinator state
+PARALLEL_UPDATES = 0
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Solarmax binary sensor platform."""
+    coordinator: SolarmaxCoordinator = entry.runtime_data
+    device_name = entry.data.get(CONF_DEVICE_NAME, "Solarmax Inverter")
+
+    async_add_entities(
+        SolarmaxBinarySensor(coordinator, entry, key, config, device_name)
+        for key, config in BINARY_SENSOR_TYPES.items()
+    )
+
+
+class SolarmaxBinarySensor(CoordinatorEntity[SolarmaxCoordinator], BinarySensorEntity):
+    """Binary sensor for the connection and alarm state of an inverter."""
+
+    # Change with every failed poll; keep them out of the recorder
+    _unrecorded_attributes = frozenset(
+        {"consecutive_failures", "last_successful_update", "last_api_connection"}
+    )
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: SolarmaxCoordinator,
+        entry: ConfigEntry,
+        key: str,
+        config: dict[str, Any],
+        device_name: str,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator)
+        self.key = key
+
+        device_name_normalized = device_name.lower().replace(" ", "_").replace("-", "_")
+        self._attr_unique_id = f"{entry.entry_id}-{key}"
+        self._attr_translation_key = config["translation_key"]
+        self.entity_id = generate_entity_id(
+            "binary_sensor.{}",
+            f"{device_name_normalized}_{key}",
+            hass=coordinator.hass,
+        )
+
+        if "device_class" in config:
+            self._attr_device_class = config["device_class"]
+        if "entity_category" in config:
+            self._attr_entity_category = config["entity_category"]
+        if "icon" in config:
+            self._attr_icon = config["icon"]
+
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": device_name,
+            "manufacturer": "Solarmax",
+            "model": "Inverter",
+            "sw_version": "1.0.0",
+        }
+
+    @property
+    def _alarm_code(self) -> int | None:
+        """Return the current alarm code."""
+        if self.coordinator.data is None:
+            return None
+        alarm = self.coordinator.data.value("SAL")
+        return alarm if isinstance(alarm, int) else None
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return the state of the binary sensor."""
+        if self.key == "connectivity":
+            return self.coordinator.last_update_success
+        if self.key == "expected_offline":
+            return self.coordinator.is_expected_offline
+
+        alarm = self._alarm_code
+        if alarm is None:
+            return None
+        return alarm != 0
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        if self.key != "alarm_active":
+            # The connection state is always known
+            return True
+        return self.coordinator.last_update_success or (
+            self.coordinator.is_field_fresh("SAL")
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return additional state attributes."""
+        if self.key == "alarm_active":
+            alarm = self._alarm_code
+            return {"code": alarm} if alarm is not None else None
+        if self.key != "connectivity":
+            return None
+
+        attributes: dict[str, Any] = {
+            "consecutive_failures": self.coordinator.consecutive_failures
+        }
+        if self.coordinator.last_successful_update:
+            attributes["last_successful_update"] = (
+                self.coordinator.last_successful_update.isoformat()
+            )
+        if self.coordinator.api.last_successful_connection:
+            attributes["last_api_connection"] = (
+                self.coordinator.api.last_successful_connection.isoformat()
+            )
+        return attributes
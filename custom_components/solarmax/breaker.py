@@ -0,0 +1,99 @@
+"""Circuit breaker for Solarmax inverter connections."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_PROBE_DELAY = 30  # seconds
+DEFAULT_MAX_PROBE_DELAY = 900  # seconds
+
+
+class CircuitBreaker:
+    """Stop polling an inverter that keeps failing.
+
+    After ``failure_threshold`` consecutive failed polls the breaker opens
+    and requests are refused without any I/O. Once the probe delay has
+    passed it is half-open: a single cheap probe may run, which closes the
+    breaker on success or reopens it with the delay doubled (up to
+    ``max_probe_delay``) on failure. Polls run in executor threads, so the
+    state is guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        probe_delay: float = DEFAULT_PROBE_DELAY,
+        max_probe_delay: float = DEFAULT_MAX_PROBE_DELAY,
+    ) -> None:
+        """Initialize the breaker closed."""
+        self.failure_threshold = failure_threshold
+        self.probe_delay = probe_delay
+        self.max_probe_delay = max_probe_delay
+        self._failures = 0
+        self._opened = False
+        self._delay = probe_delay
+        self._next_probe = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Return the current breaker state."""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        """Return the state; the caller holds the lock."""
+        if not self._opened:
+            return STATE_CLOSED
+        if time.monotonic() >= self._next_probe:
+            return STATE_HALF_OPEN
+        return STATE_OPEN
+
+    @property
+    def failures(self) -> int:
+        """Return the number of consecutive failures."""
+        return self._failures
+
+    @property
+    def next_probe_in(self) -> float | None:
+        """Return the seconds until the next probe while the breaker is open."""
+        if not self._opened:
+            return None
+        return max(self._next_probe - time.monotonic(), 0.0)
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        with self._lock:
+            self._failures = 0
+            self._opened = False
+            self._delay = self.probe_delay
+
+    def record_failure(self) -> None:
+        """Count a failure and open the breaker once the threshold is hit."""
+        with self._lock:
+            self._failures += 1
+            if self._opened:
+                # A failed probe doubles the wait before the next one
+                self._delay = min(self._delay * 2, self.max_probe_delay)
+            elif self._failures < self.failure_threshold:
+                return
+            self._opened = True
+            self._next_probe = time.monotonic() + self._delay
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics and repairs."""
+        next_probe_in = self.next_probe_in
+        return {
+            "state": self.state,
+            "failures": self._failures,
+            "next_probe_in": (
+                round(next_probe_in) if next_probe_in is not None else None
+            ),
+        }
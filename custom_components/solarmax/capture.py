@@ -0,0 +1,234 @@
+"""Raw MaxTalk frame capture and replay for the Solarmax integration."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any, NamedTuple
+
+from .solarmax_api import FIELD_MAP_INVERTER, SolarmaxAPI, SolarmaxConnectionError
+
+_LOGGER = logging.getLogger(__name__)
+
+DIRECTION_REQUEST = ">"
+DIRECTION_RESPONSE = "<"
+
+DEFAULT_MAX_BYTES = 1_000_000
+DEFAULT_BACKUP_COUNT = 3
+
+
+class CapturedFrame(NamedTuple):
+    """One captured frame."""
+
+    timestamp: float  # seconds since the start of the capture
+    direction: str
+    frame: str
+
+
+def _escape(frame: str) -> str:
+    """Keep a frame on a single line."""
+    return frame.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _unescape(frame: str) -> str:
+    """Reverse _escape."""
+    result = []
+    chars = iter(frame)
+    for char in chars:
+        if char == "\\":
+            char = {"n": "\n", "r": "\r"}.get(next(chars, ""), "\\")
+        result.append(char)
+    return "".join(result)
+
+
+class FrameCapture:
+    """Write request/response frames to a size-capped rotating file.
+
+    Each line holds the monotonic time in microseconds since the capture
+    started, the direction (``>`` request, ``<`` response) and the raw frame,
+    e.g. ``1520311 < {01;FB;2C|64:PAC=BB8|0E4D}``. When the file would exceed
+    ``max_bytes`` it is rotated to ``.1`` and older files shift up to
+    ``backup_count``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+    ) -> None:
+        """Initialize the capture; the file is opened on the first frame."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._start_ns = time.monotonic_ns()
+        self._file: Any = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def record(self, direction: str, frame: str) -> None:
+        """Append a frame (called from the executor thread doing the I/O)."""
+        elapsed_us = (time.monotonic_ns() - self._start_ns) // 1000
+        line = f"{elapsed_us} {direction} {_escape(frame)}\n"
+
+        with self._lock:
+            try:
+                if self._file is None:
+                    self._open()
+                if self._size + len(line) > self.max_bytes and self._size:
+                    self._rotate()
+                self._file.write(line)
+                self._file.flush()
+                self._size += len(line)
+            except OSError as err:
+                _LOGGER.warning("Failed to write frame capture %s: %s", self.path, err)
+
+    def close(self) -> None:
+        """Close the capture file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _open(self) -> None:
+        """Open the capture file for appending."""
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def _rotate(self) -> None:
+        """Shift the capture files and start a new one."""
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+
+def read_capture(path: str) -> list[CapturedFrame]:
+    """Read a capture file written by FrameCapture."""
+    frames = []
+    with open(path, encoding="utf-8") as capture_file:
+        for line in capture_file:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            elapsed_us, direction, frame = line.split(" ", 2)
+            frames.append(
+                CapturedFrame(int(elapsed_us) / 1_000_000, direction, _unescape(frame))
+            )
+    return frames
+
+
+class _ReplaySocket:
+    """Stand-in for the socket handed out by ReplayAPI."""
+
+    def close(self) -> None:
+        """Nothing to close."""
+
+
+class ReplayAPI(SolarmaxAPI):
+    """SolarmaxAPI transport that answers requests from a capture file.
+
+    Responses are replayed in capture order, so the frames go through the
+    same parsing as live data. With ``speed`` 1.0 each response is delayed
+    by its captured latency, higher values replay faster and 0 disables the
+    delays entirely.
+    """
+
+    def __init__(self, path: str, speed: float = 0.0) -> None:
+        """Initialize the replay transport."""
+        super().__init__(host="replay", port=0)
+        self.speed = speed
+        self._frames = read_capture(path)
+        self._position = 0
+
+    @property
+    def exhausted(self) -> bool:
+        """Return if all captured responses have been replayed."""
+        return not any(
+            frame.direction == DIRECTION_RESPONSE
+            for frame in self._frames[self._position :]
+        )
+
+    def _create_socket_connection(self, retries: int = 3) -> Any:
+        """Pretend to connect."""
+        if self.exhausted:
+            raise SolarmaxConnectionError("Capture exhausted")
+        return _ReplaySocket()
+
+    def build_requests(self, field_map: dict[str, str]) -> list[str]:
+        """Return the captured request frames of the next poll.
+
+        A capture keeps the framing of the version that recorded it, so its
+        requests are sent again as long as together they ask for exactly
+        the requested fields; otherwise the fields are packed as usual.
+        """
+        requests: list[str] = []
+        remaining = set(field_map)
+        for frame in self._frames[self._position :]:
+            if not remaining:
+                break
+            if frame.direction != DIRECTION_REQUEST:
+                continue
+            codes = set(self._request_codes(frame.frame))
+            if not codes <= remaining:
+                break
+            requests.append(frame.frame)
+            remaining -= codes
+
+        if remaining:
+            return super().build_requests(field_map)
+        return requests
+
+    def _send_request_and_receive_response(self, sock: Any, request: str) -> str:
+        """Return the next captured response."""
+        request_time = None
+        while self._position < len(self._frames):
+            frame = self._frames[self._position]
+            self._position += 1
+
+            if frame.direction == DIRECTION_REQUEST:
+                request_time = frame.timestamp
+                if frame.frame != request:
+                    _LOGGER.debug(
+                        "Replayed request differs from capture: %s", frame.frame
+                    )
+                continue
+
+            if self.speed and request_time is not None:
+                time.sleep(max(frame.timestamp - request_time, 0) / self.speed)
+            return frame.frame
+
+        raise SolarmaxConnectionError("Capture exhausted")
+
+    def replay_all(self) -> Iterator[dict[str, Any]]:
+        """Decode every remaining captured response, e.g. for benchmarks.
+
+        Unlike polling through the coordinator, the gaps between the captured
+        polls are reproduced as well when ``speed`` is set.
+        """
+        previous_response: float | None = None
+        while not self.exhausted:
+            if self.speed and previous_response is not None:
+                next_request = next(
+                    frame
+                    for frame in self._frames[self._position :]
+                    if frame.direction == DIRECTION_REQUEST
+                )
+                time.sleep(
+                    max(next_request.timestamp - previous_response, 0) / self.speed
+                )
+
+            response = self._send_request_and_receive_response(
+                _ReplaySocket(), self.build_request(FIELD_MAP_INVERTER)
+            )
+            previous_response = self._frames[self._position - 1].timestamp
+            yield self.convert_to_json(FIELD_MAP_INVERTER, response)
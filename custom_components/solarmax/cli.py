@@ -0,0 +1,460 @@
+"""Headless poller and logger for Solarmax inverters.
+
+Polls one or more inverters without Home Assistant and streams the decoded
+samples to stdout or a file:
+
+    python -m custom_components.solarmax.cli 192.168.1.100 192.168.1.101:12346
+
+The protocol modules only need the standard library. Importing the package
+with ``-m`` pulls in Home Assistant, so on hosts without it run the file
+directly instead: ``python custom_components/solarmax/cli.py HOST``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import math
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, TextIO
+
+if __package__:
+    from .solarmax_api import (
+        FIELD_GROUPS,
+        FIELD_MAP_INVERTER,
+        SolarmaxAPI,
+        SolarmaxCircuitOpenError,
+        SolarmaxConnectionError,
+        SolarmaxProtocolError,
+        SolarmaxTimeoutError,
+    )
+else:  # pragma: no cover - exercised by running the file as a script
+    import importlib
+    import importlib.machinery
+    import importlib.util
+    from pathlib import Path
+
+    # Register the integration directory as a bare package, so the relative
+    # imports of the protocol modules resolve without running __init__.py
+    _spec = importlib.machinery.ModuleSpec("solarmax", None, is_package=True)
+    _spec.submodule_search_locations = [str(Path(__file__).resolve().parent)]
+    sys.modules["solarmax"] = importlib.util.module_from_spec(_spec)
+    _api = importlib.import_module("solarmax.solarmax_api")
+
+    FIELD_GROUPS = _api.FIELD_GROUPS
+    FIELD_MAP_INVERTER = _api.FIELD_MAP_INVERTER
+    SolarmaxAPI = _api.SolarmaxAPI
+    SolarmaxCircuitOpenError = _api.SolarmaxCircuitOpenError
+    SolarmaxConnectionError = _api.SolarmaxConnectionError
+    SolarmaxProtocolError = _api.SolarmaxProtocolError
+    SolarmaxTimeoutError = _api.SolarmaxTimeoutError
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PORT = 12345
+DEFAULT_INTERVAL = 10  # seconds
+DEFAULT_TIMEOUT = 10  # seconds
+
+# Tier name of the fields without an interval of their own
+DEFAULT_TIER = "default"
+
+CSV_COLUMNS = (
+    "timestamp",
+    "host",
+    "port",
+    "tier",
+    "latency_ms",
+    "field",
+    "value",
+    "raw_value",
+    "error",
+)
+
+POLL_ERRORS = (
+    SolarmaxConnectionError,
+    SolarmaxTimeoutError,
+    SolarmaxProtocolError,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Tier:
+    """A set of fields polled at a common interval."""
+
+    name: str
+    interval: float
+    field_map: dict[str, str]
+
+
+def parse_target(target: str) -> tuple[str, int]:
+    """Split a ``host[:port]`` argument."""
+    host, sep, port = target.rpartition(":")
+    if not sep:
+        return target, DEFAULT_PORT
+    if not host or not port.isdigit():
+        raise argparse.ArgumentTypeError(f"invalid inverter address: {target}")
+    return host, int(port)
+
+
+def parse_tier(value: str) -> tuple[str, float]:
+    """Split a ``group=seconds`` argument."""
+    group, sep, interval = value.partition("=")
+    if not sep or group not in FIELD_GROUPS:
+        raise argparse.ArgumentTypeError(
+            f"invalid tier {value!r}, expected GROUP=SECONDS with GROUP one of "
+            f"{', '.join(FIELD_GROUPS)}"
+        )
+    try:
+        seconds = float(interval)
+    except ValueError:
+        seconds = 0
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(f"invalid interval in tier {value!r}")
+    return group, seconds
+
+
+def build_tiers(interval: float, tiers: list[tuple[str, float]]) -> list[Tier]:
+    """Return the poll tiers; untiered fields share the base interval."""
+    result = [
+        Tier(
+            group,
+            seconds,
+            {code: FIELD_MAP_INVERTER[code] for code in FIELD_GROUPS[group]},
+        )
+        for group, seconds in dict(tiers).items()
+    ]
+    tiered = {code for tier in result for code in tier.field_map}
+    remaining = {
+        code: name for code, name in FIELD_MAP_INVERTER.items() if code not in tiered
+    }
+    if remaining:
+        result.append(Tier(DEFAULT_TIER, interval, remaining))
+    return result
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    rank = max(math.ceil(percent / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+@dataclass(slots=True)
+class LatencyStats:
+    """Poll counts and latencies of one inverter."""
+
+    polls: int = 0
+    failures: int = 0
+    suspended: int = 0
+    latencies: list[float] = field(default_factory=list)
+
+    def add_success(self, latency: float) -> None:
+        """Record a successful poll."""
+        self.polls += 1
+        self.latencies.append(latency)
+
+    def add_failure(self, suspended: bool = False) -> None:
+        """Record a failed poll or one refused by the circuit breaker."""
+        self.polls += 1
+        if suspended:
+            self.suspended += 1
+        else:
+            self.failures += 1
+
+    def summary(self) -> dict[str, Any]:
+        """Return the counts and the latency distribution in milliseconds."""
+        result: dict[str, Any] = {
+            "polls": self.polls,
+            "failures": self.failures,
+            "suspended": self.suspended,
+        }
+        if not self.latencies:
+            return result
+
+        latencies = sorted(self.latencies)
+        result.update(
+            {
+                "min_ms": round(latencies[0] * 1000, 1),
+                "mean_ms": round(sum(latencies) / len(latencies) * 1000, 1),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+                "max_ms": round(latencies[-1] * 1000, 1),
+            }
+        )
+        return result
+
+
+class NdjsonWriter:
+    """Write one JSON object per poll."""
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize the writer."""
+        self.stream = stream
+
+    def write(
+        self,
+        timestamp: str,
+        api: SolarmaxAPI,
+        tier: Tier,
+        latency: float,
+        data: dict[str, Any] | None,
+        error: Exception | None = None,
+    ) -> None:
+        """Write a poll result."""
+        record: dict[str, Any] = {
+            "timestamp": timestamp,
+            "host": api.host,
+            "port": api.port,
+            "tier": tier.name,
+            "latency_ms": round(latency * 1000, 1),
+        }
+        if error is not None:
+            record["error"] = f"{type(error).__name__}: {error}"
+        else:
+            record["data"] = data
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+
+class CsvWriter:
+    """Write one CSV row per field, or per failed poll."""
+
+    def __init__(self, stream: TextIO) -> None:
+        """Initialize the writer and write the header."""
+        self.stream = stream
+        self._writer = csv.writer(stream, lineterminator="\n")
+        self._writer.writerow(CSV_COLUMNS)
+        self.stream.flush()
+
+    def write(
+        self,
+        timestamp: str,
+        api: SolarmaxAPI,
+        tier: Tier,
+        latency: float,
+        data: dict[str, Any] | None,
+        error: Exception | None = None,
+    ) -> None:
+        """Write a poll result."""
+        prefix = (timestamp, api.host, api.port, tier.name, round(latency * 1000, 1))
+        if error is not None:
+            self._writer.writerow(
+                (*prefix, "", "", "", f"{type(error).__name__}: {error}")
+            )
+        else:
+            self._writer.writerows(
+                (*prefix, code, sample["value"], sample["raw_value"], "")
+                for code, sample in data.items()
+            )
+        self.stream.flush()
+
+
+WRITERS = {"ndjson": NdjsonWriter, "csv": CsvWriter}
+
+
+class Poller:
+    """Poll the tiers of one inverter, one request at a time."""
+
+    def __init__(self, api: SolarmaxAPI) -> None:
+        """Initialize the poller."""
+        self.api = api
+        self.stats = LatencyStats()
+        # The inverter answers one client at a time, so tiers take turns
+        self._lock = asyncio.Lock()
+
+    async def poll(self, tier: Tier, writer: NdjsonWriter | CsvWriter) -> None:
+        """Poll a tier once and write the result."""
+        async with self._lock:
+            timestamp = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+            start = time.perf_counter()
+            try:
+                data = await asyncio.to_thread(self.api.get_data, tier.field_map)
+            except POLL_ERRORS as err:
+                latency = time.perf_counter() - start
+                self.stats.add_failure(isinstance(err, SolarmaxCircuitOpenError))
+                _LOGGER.debug("Poll of %s failed: %s", self.api.host, err)
+                writer.write(timestamp, self.api, tier, latency, None, err)
+                return
+
+            latency = time.perf_counter() - start
+            self.stats.add_success(latency)
+            writer.write(timestamp, self.api, tier, latency, data)
+
+    async def run_tier(
+        self, tier: Tier, writer: NdjsonWriter | CsvWriter, count: int | None
+    ) -> None:
+        """Poll a tier at its interval, without drifting or catching up."""
+        loop = asyncio.get_running_loop()
+        next_run = loop.time()
+        polls = 0
+        while count is None or polls < count:
+            await self.poll(tier, writer)
+            polls += 1
+            if count is not None and polls >= count:
+                break
+            # Skip runs missed by slow polls instead of firing them back to back
+            next_run += tier.interval
+            next_run = max(next_run, loop.time())
+            await asyncio.sleep(next_run - loop.time())
+
+
+def build_pollers(args: argparse.Namespace) -> dict[str, Poller]:
+    """Return a poller per inverter, keyed by its address."""
+    return {
+        f"{host}:{port}": Poller(SolarmaxAPI(host, port, args.timeout))
+        for host, port in args.targets
+    }
+
+
+async def run(
+    args: argparse.Namespace, stream: TextIO, pollers: dict[str, Poller]
+) -> None:
+    """Poll all inverters until the count or duration is reached."""
+    writer = WRITERS[args.format](stream)
+    tiers = build_tiers(args.interval, args.tier)
+
+    tasks = [
+        asyncio.create_task(poller.run_tier(tier, writer, args.count))
+        for poller in pollers.values()
+        for tier in tiers
+    ]
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=args.duration)
+        for task in done:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def format_stats(pollers: dict[str, Poller]) -> str:
+    """Return the latency report of all inverters as a table."""
+    columns = (
+        "polls",
+        "failures",
+        "suspended",
+        "min_ms",
+        "mean_ms",
+        "p50_ms",
+        "p95_ms",
+        "max_ms",
+    )
+    rows = [("inverter", *columns)]
+    for target, poller in pollers.items():
+        summary = poller.stats.summary()
+        rows.append((target, *(str(summary.get(column, "-")) for column in columns)))
+
+    widths = [max(len(row[index]) for row in rows) for index in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(
+            cell.rjust(width) if index else cell.ljust(width)
+            for index, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="solarmax",
+        description="Poll Solarmax inverters and stream the decoded samples.",
+    )
+    parser.add_argument(
+        "targets",
+        metavar="HOST[:PORT]",
+        nargs="+",
+        type=parse_target,
+        help=f"inverter address, port {DEFAULT_PORT} by default",
+    )
+    parser.add_argument(
+        "-i",
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help="seconds between polls of fields without a tier (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-t",
+        "--tier",
+        metavar="GROUP=SECONDS",
+        type=parse_tier,
+        action="append",
+        default=[],
+        help=f"poll a field group at its own interval; groups: {', '.join(FIELD_GROUPS)}",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=sorted(WRITERS),
+        default="ndjson",
+        help="output format (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="file to append samples to, - for stdout (default)",
+    )
+    parser.add_argument(
+        "-n",
+        "--count",
+        type=int,
+        help="stop after this many polls per inverter and tier",
+    )
+    parser.add_argument(
+        "-d",
+        "--duration",
+        type=float,
+        help="stop after this many seconds",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=DEFAULT_TIMEOUT,
+        help="connection and poll timeout in seconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="log protocol details to stderr",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the poller; the latency report goes to stderr."""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    stream = (
+        sys.stdout
+        if args.output == "-"
+        else open(args.output, "a", newline="", encoding="utf-8")
+    )
+    pollers = build_pollers(args)
+    try:
+        asyncio.run(run(args, stream, pollers))
+    except KeyboardInterrupt:
+        # Ctrl-C ends an open-ended run; the report still covers it
+        pass
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    print(format_stats(pollers), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
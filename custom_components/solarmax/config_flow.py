@@ -12,15 +12,63 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
+    CONF_ADDRESS,
+    CONF_BACKFILL_HISTORY,
+    CONF_BAUDRATE,
+    CONF_CAPTURE_FRAMES,
+    CONF_CONFIGURE_DEADBAND,
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_MAX_AGE,
+    CONF_DEADBAND_RELATIVE,
+    CONF_DEADBAND_SENSOR,
+    CONF_DEADBANDS,
     CONF_DEVICE_NAME,
+    CONF_EVENT_DEBOUNCE,
+    CONF_EXPOSE_METRICS,
+    CONF_FRAME_GAP,
+    CONF_HEALTH_MAX_LATENCY,
+    CONF_HEALTH_MIN_SUCCESS_RATE,
     CONF_HOST,
+    CONF_IMPORT_STATISTICS,
     CONF_PORT,
+    CONF_PROTOCOL,
+    CONF_PROXY_HOST,
+    CONF_PROXY_MAX_AGE,
+    CONF_PROXY_PORT,
+    CONF_PUBLISH_INTERVAL,
+    CONF_STALE_WINDOW,
+    CONF_TRACE_SAMPLE_RATE,
     CONF_UPDATE_INTERVAL,
+    DEADBAND_SENSORS,
+    DEFAULT_ADDRESS,
+    DEFAULT_BACKFILL_HISTORY,
+    DEFAULT_BAUDRATE,
+    DEFAULT_CAPTURE_FRAMES,
+    DEFAULT_DEADBAND_MAX_AGE,
     DEFAULT_DEVICE_NAME,
+    DEFAULT_EVENT_DEBOUNCE,
+    DEFAULT_EXPOSE_METRICS,
+    DEFAULT_FRAME_GAP,
+    DEFAULT_HEALTH_MAX_LATENCY,
+    DEFAULT_HEALTH_MIN_SUCCESS_RATE,
+    DEFAULT_IMPORT_STATISTICS,
+    DEFAULT_MODBUS_PORT,
     DEFAULT_PORT,
+    DEFAULT_PROTOCOL,
+    DEFAULT_PROXY_HOST,
+    DEFAULT_PROXY_MAX_AGE,
+    DEFAULT_PROXY_PORT,
+    DEFAULT_PUBLISH_INTERVAL,
+    DEFAULT_STALE_WINDOW,
+    DEFAULT_TRACE_SAMPLE_RATE,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    PROTOCOL_MODBUS,
+    PROTOCOL_SERIAL,
+    PROTOCOLS,
 )
+from .modbus_api import ModbusAPI
+from .serial_api import BAUDRATES, SerialAPI
 from .solarmax_api import SolarmaxAPI
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,11 +76,15 @@ _LOGGER = logging.getLogger(__name__)
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST, description={"suggested_value": "192.168.1.100"}): str,
-        vol.Required(
-            CONF_PORT,
-            default=DEFAULT_PORT,
-            description={"suggested_value": DEFAULT_PORT},
-        ): vol.Coerce(int),
+        # Left empty, the standard port of the protocol is used
+        vol.Optional(CONF_PORT): vol.Coerce(int),
+        vol.Optional(CONF_PROTOCOL, default=DEFAULT_PROTOCOL): vol.In(PROTOCOLS),
+        vol.Optional(CONF_ADDRESS, default=DEFAULT_ADDRESS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=249)
+        ),
+        vol.Optional(CONF_BAUDRATE, default=DEFAULT_BAUDRATE): vol.All(
+            vol.Coerce(int), vol.In(BAUDRATES)
+        ),
         vol.Optional(
             CONF_UPDATE_INTERVAL,
             default=DEFAULT_UPDATE_INTERVAL,
@@ -52,7 +104,19 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
-    api = SolarmaxAPI(data[CONF_HOST], data[CONF_PORT])
+    protocol = data.get(CONF_PROTOCOL, DEFAULT_PROTOCOL)
+    address = data.get(CONF_ADDRESS, DEFAULT_ADDRESS)
+    if protocol == PROTOCOL_SERIAL:
+        api = SerialAPI(
+            data[CONF_HOST],
+            baudrate=data.get(CONF_BAUDRATE, DEFAULT_BAUDRATE),
+            address=address,
+            frame_gap=data.get(CONF_FRAME_GAP, DEFAULT_FRAME_GAP) / 1000,
+        )
+    elif protocol == PROTOCOL_MODBUS:
+        api = ModbusAPI(data[CONF_HOST], data[CONF_PORT], address=address)
+    else:
+        api = SolarmaxAPI(data[CONF_HOST], data[CONF_PORT], address=address)
 
     # Test the connection
     if not await hass.async_add_executor_job(api.test_connection):
@@ -79,10 +143,19 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            # Check for duplicate entries
-            await self.async_set_unique_id(
-                f"{user_input[CONF_HOST]}:{user_input[CONF_PORT]}"
-            )
+            if CONF_PORT not in user_input:
+                protocol = user_input.get(CONF_PROTOCOL, DEFAULT_PROTOCOL)
+                user_input[CONF_PORT] = (
+                    DEFAULT_MODBUS_PORT if protocol == PROTOCOL_MODBUS else DEFAULT_PORT
+                )
+
+            # Check for duplicate entries; inverters sharing a bus differ
+            # by their address only
+            unique_id = f"{user_input[CONF_HOST]}:{user_input[CONF_PORT]}"
+            address = user_input.get(CONF_ADDRESS, DEFAULT_ADDRESS)
+            if address != DEFAULT_ADDRESS:
+                unique_id = f"{unique_id}:{address}"
+            await self.async_set_unique_id(unique_id)
             self._abort_if_unique_id_configured()
 
             try:
@@ -102,8 +175,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
             description_placeholders={
-                "host": "IP address of your Solarmax inverter",
-                "port": "Communication port (usually 12345)",
+                "host": "IP address of your Solarmax inverter, or its serial device",
+                "port": "Communication port; empty for 12345, or 502 for Modbus TCP",
                 "update_interval": "How often to poll for data (seconds)",
                 "device_name": "Friendly name for this inverter",
             },
@@ -116,6 +189,7 @@ class OptionsFlow(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
         self.config_entry = config_entry
+        self._user_input: dict[str, Any] = {}
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
@@ -124,6 +198,7 @@ class OptionsFlow(config_entries.OptionsFlow):
         errors: dict[str, str] = {}
 
         if user_input is not None:
+            configure_deadband = user_input.pop(CONF_CONFIGURE_DEADBAND, False)
             try:
                 # Validate the new configuration
                 await validate_input(self.hass, user_input)
@@ -135,17 +210,10 @@ class OptionsFlow(config_entries.OptionsFlow):
                 _LOGGER.exception("Unexpected exception during reconfiguration")
                 errors["base"] = "unknown"
             else:
-                # Update the config entry with new data
-                self.hass.config_entries.async_update_entry(
-                    self.config_entry,
-                    data=user_input,
-                    title=user_input.get(CONF_DEVICE_NAME, self.config_entry.title),
-                )
-
-                # Trigger a reload of the integration to apply changes
-                await self.hass.config_entries.async_reload(self.config_entry.entry_id)
-
-                return self.async_create_entry(title="", data={})
+                self._user_input = user_input
+                if configure_deadband:
+                    return await self.async_step_deadband()
+                return await self._async_save()
 
         # Pre-populate form with current values
         current_data = self.config_entry.data
@@ -155,6 +223,22 @@ class OptionsFlow(config_entries.OptionsFlow):
                 vol.Required(
                     CONF_PORT, default=current_data.get(CONF_PORT, DEFAULT_PORT)
                 ): vol.Coerce(int),
+                vol.Optional(
+                    CONF_PROTOCOL,
+                    default=current_data.get(CONF_PROTOCOL, DEFAULT_PROTOCOL),
+                ): vol.In(PROTOCOLS),
+                vol.Optional(
+                    CONF_ADDRESS,
+                    default=current_data.get(CONF_ADDRESS, DEFAULT_ADDRESS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=249)),
+                vol.Optional(
+                    CONF_BAUDRATE,
+                    default=current_data.get(CONF_BAUDRATE, DEFAULT_BAUDRATE),
+                ): vol.All(vol.Coerce(int), vol.In(BAUDRATES)),
+                vol.Optional(
+                    CONF_FRAME_GAP,
+                    default=current_data.get(CONF_FRAME_GAP, DEFAULT_FRAME_GAP),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
                 vol.Optional(
                     CONF_UPDATE_INTERVAL,
                     default=current_data.get(
@@ -165,6 +249,77 @@ class OptionsFlow(config_entries.OptionsFlow):
                     CONF_DEVICE_NAME,
                     default=current_data.get(CONF_DEVICE_NAME, DEFAULT_DEVICE_NAME),
                 ): str,
+                vol.Optional(
+                    CONF_PUBLISH_INTERVAL,
+                    default=current_data.get(
+                        CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_STALE_WINDOW,
+                    default=current_data.get(CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_HEALTH_MIN_SUCCESS_RATE,
+                    default=current_data.get(
+                        CONF_HEALTH_MIN_SUCCESS_RATE, DEFAULT_HEALTH_MIN_SUCCESS_RATE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_HEALTH_MAX_LATENCY,
+                    default=current_data.get(
+                        CONF_HEALTH_MAX_LATENCY, DEFAULT_HEALTH_MAX_LATENCY
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_EVENT_DEBOUNCE,
+                    default=current_data.get(
+                        CONF_EVENT_DEBOUNCE, DEFAULT_EVENT_DEBOUNCE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_IMPORT_STATISTICS,
+                    default=current_data.get(
+                        CONF_IMPORT_STATISTICS, DEFAULT_IMPORT_STATISTICS
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_BACKFILL_HISTORY,
+                    default=current_data.get(
+                        CONF_BACKFILL_HISTORY, DEFAULT_BACKFILL_HISTORY
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_CAPTURE_FRAMES,
+                    default=current_data.get(
+                        CONF_CAPTURE_FRAMES, DEFAULT_CAPTURE_FRAMES
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_TRACE_SAMPLE_RATE,
+                    default=current_data.get(
+                        CONF_TRACE_SAMPLE_RATE, DEFAULT_TRACE_SAMPLE_RATE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_EXPOSE_METRICS,
+                    default=current_data.get(
+                        CONF_EXPOSE_METRICS, DEFAULT_EXPOSE_METRICS
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_PROXY_PORT,
+                    default=current_data.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Optional(
+                    CONF_PROXY_HOST,
+                    default=current_data.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST),
+                ): str,
+                vol.Optional(
+                    CONF_PROXY_MAX_AGE,
+                    default=current_data.get(CONF_PROXY_MAX_AGE, DEFAULT_PROXY_MAX_AGE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(CONF_CONFIGURE_DEADBAND, default=False): bool,
             }
         )
 
@@ -178,6 +333,72 @@ class OptionsFlow(config_entries.OptionsFlow):
             },
         )
 
+    async def async_step_deadband(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Configure the publishing deadband of a single sensor."""
+        deadbands = dict(self.config_entry.data.get(CONF_DEADBANDS, {}))
+
+        if user_input is not None:
+            sensor_key = user_input[CONF_DEADBAND_SENSOR]
+            absolute = user_input.get(CONF_DEADBAND_ABSOLUTE, 0)
+            relative = user_input.get(CONF_DEADBAND_RELATIVE, 0)
+
+            if absolute or relative:
+                deadbands[sensor_key] = {
+                    CONF_DEADBAND_ABSOLUTE: absolute,
+                    CONF_DEADBAND_RELATIVE: relative,
+                    CONF_DEADBAND_MAX_AGE: user_input.get(
+                        CONF_DEADBAND_MAX_AGE, DEFAULT_DEADBAND_MAX_AGE
+                    ),
+                }
+            else:
+                # Both thresholds at zero disables the deadband
+                deadbands.pop(sensor_key, None)
+
+            self._user_input[CONF_DEADBANDS] = deadbands
+            return await self._async_save()
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_DEADBAND_SENSOR, default="PAC"): vol.In(
+                    DEADBAND_SENSORS
+                ),
+                vol.Optional(CONF_DEADBAND_ABSOLUTE, default=0): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+                vol.Optional(CONF_DEADBAND_RELATIVE, default=0): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=100)
+                ),
+                vol.Optional(
+                    CONF_DEADBAND_MAX_AGE, default=DEFAULT_DEADBAND_MAX_AGE
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            }
+        )
+
+        return self.async_show_form(
+            step_id="deadband",
+            data_schema=schema,
+            description_placeholders={
+                "configured": ", ".join(sorted(deadbands)) or "-",
+            },
+        )
+
+    async def _async_save(self) -> FlowResult:
+        """Store the new configuration and reload the integration."""
+        # Merge so settings that are not part of the form are kept
+        data = {**self.config_entry.data, **self._user_input}
+        self.hass.config_entries.async_update_entry(
+            self.config_entry,
+            data=data,
+            title=data.get(CONF_DEVICE_NAME, self.config_entry.title),
+        )
+
+        # Trigger a reload of the integration to apply changes
+        await self.hass.config_entries.async_reload(self.config_entry.entry_id)
+
+        return self.async_create_entry(title="", data={})
+
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
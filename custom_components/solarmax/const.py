@@ -7,13 +7,93 @@ DOMAIN = "solarmax"
 # Configuration constants
 CONF_HOST = "host"
 CONF_PORT = "port"
+CONF_PROTOCOL = "protocol"
+CONF_ADDRESS = "address"
+CONF_BAUDRATE = "baudrate"
+CONF_FRAME_GAP = "frame_gap"
 CONF_UPDATE_INTERVAL = "update_interval"
 CONF_DEVICE_NAME = "device_name"
+CONF_PUBLISH_INTERVAL = "publish_interval"
+CONF_IMPORT_STATISTICS = "import_statistics"
+CONF_BACKFILL_HISTORY = "backfill_history"
+CONF_CAPTURE_FRAMES = "capture_frames"
+CONF_STALE_WINDOW = "stale_window"
+CONF_HEALTH_MIN_SUCCESS_RATE = "health_min_success_rate"
+CONF_HEALTH_MAX_LATENCY = "health_max_latency"
+CONF_EVENT_DEBOUNCE = "event_debounce"
+CONF_EXPOSE_METRICS = "expose_metrics"
+CONF_TRACE_SAMPLE_RATE = "trace_sample_rate"
+CONF_PROXY_HOST = "proxy_host"
+CONF_PROXY_PORT = "proxy_port"
+CONF_PROXY_MAX_AGE = "proxy_max_age"
+
+# Per-sensor deadband publishing
+CONF_CONFIGURE_DEADBAND = "configure_deadband"
+CONF_DEADBANDS = "deadbands"
+CONF_DEADBAND_SENSOR = "deadband_sensor"
+CONF_DEADBAND_ABSOLUTE = "deadband_absolute"
+CONF_DEADBAND_RELATIVE = "deadband_relative"
+CONF_DEADBAND_MAX_AGE = "deadband_max_age"
 
 # Default values
 DEFAULT_PORT = 12345
+DEFAULT_MODBUS_PORT = 502
+DEFAULT_ADDRESS = 1
+DEFAULT_BAUDRATE = 19200
+DEFAULT_FRAME_GAP = 50  # milliseconds of bus silence between serial frames
 DEFAULT_UPDATE_INTERVAL = 30
 DEFAULT_DEVICE_NAME = "Solarmax Inverter"
+DEFAULT_DEADBAND_MAX_AGE = 600
+DEFAULT_PUBLISH_INTERVAL = 0  # Publish every poll
+DEFAULT_IMPORT_STATISTICS = False
+DEFAULT_BACKFILL_HISTORY = False
+DEFAULT_CAPTURE_FRAMES = False
+DEFAULT_STALE_WINDOW = 300  # seconds
+DEFAULT_HEALTH_MIN_SUCCESS_RATE = 80  # percent
+DEFAULT_HEALTH_MAX_LATENCY = 5  # seconds
+DEFAULT_EVENT_DEBOUNCE = 60  # seconds
+DEFAULT_EXPOSE_METRICS = False
+DEFAULT_TRACE_SAMPLE_RATE = 10  # percent of successful polls kept in the trace
+DEFAULT_PROXY_HOST = "127.0.0.1"  # proxy only reachable from this host
+DEFAULT_PROXY_PORT = 0  # MaxTalk proxy disabled
+DEFAULT_PROXY_MAX_AGE = 60  # seconds a polled value answers proxy clients
+
+# Protocols spoken by the inverter
+PROTOCOL_MAXTALK = "maxtalk"
+PROTOCOL_MODBUS = "modbus"
+PROTOCOL_SERIAL = "serial"
+PROTOCOLS = [PROTOCOL_MAXTALK, PROTOCOL_MODBUS, PROTOCOL_SERIAL]
+DEFAULT_PROTOCOL = PROTOCOL_MAXTALK
+
+# Number of daytime polls the connection health is judged on
+HEALTH_WINDOW_SIZE = 20
+
+# Minimum spacing between on-demand requests to the same gateway (seconds)
+DEFAULT_REFRESH_MIN_SPACING = 5
+
+# OpenMetrics scrape endpoint
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+
+# Live websocket subscriptions (seconds between samples)
+DEFAULT_LIVE_INTERVAL = 2
+MIN_LIVE_INTERVAL = 1
+
+# Services
+SERVICE_REFRESH = "refresh"
+SERVICE_PROFILE = "profile"
+SERVICE_TRACE_MEMORY = "trace_memory"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_GROUP = "group"
+ATTR_REFRESHES = "refreshes"
+DEFAULT_PROFILE_REFRESHES = 5
+MAX_PROFILE_REFRESHES = 100
+ATTR_POLLS = "polls"
+DEFAULT_TRACE_MEMORY_POLLS = 5
+MAX_TRACE_MEMORY_POLLS = 100
+
+# Events
+EVENT_STATUS_CHANGED = f"{DOMAIN}_status_changed"
+EVENT_ALARM = f"{DOMAIN}_alarm"
 
 # Sensor types and their properties
 SENSOR_TYPES = {
@@ -249,3 +329,83 @@ SENSOR_TYPES = {
         "enabled_by_default": True,  # Keep enabled - important for monitoring
     },
 }
+
+# Sensors with numeric measurements that support deadband publishing
+DEADBAND_SENSORS = [
+    key
+    for key, config in SENSOR_TYPES.items()
+    if config.get("state_class") == "measurement"
+]
+
+# Minimum/maximum sensors, available when oversampling is enabled
+AGGREGATE_SENSOR_TYPES = {
+    "PAC_min": {
+        "name": "AC Power Minimum",
+        "translation_key": "pac_min",
+        "source": "PAC",
+        "statistic": "min",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "icon": "mdi:solar-power",
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "enabled_by_default": False,
+    },
+    "PAC_max": {
+        "name": "AC Power Maximum",
+        "translation_key": "pac_max",
+        "source": "PAC",
+        "statistic": "max",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "icon": "mdi:solar-power",
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "enabled_by_default": False,
+    },
+    "PDC_min": {
+        "name": "DC Power Minimum",
+        "translation_key": "pdc_min",
+        "source": "PDC",
+        "statistic": "min",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "icon": "mdi:solar-power",
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "enabled_by_default": False,
+    },
+    "PDC_max": {
+        "name": "DC Power Maximum",
+        "translation_key": "pdc_max",
+        "source": "PDC",
+        "statistic": "max",
+        "unit": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "icon": "mdi:solar-power",
+        "entity_category": EntityCategory.DIAGNOSTIC,
+        "enabled_by_default": False,
+    },
+}
+
+# Binary sensors derived from the coordinator's connection state and alarms
+BINARY_SENSOR_TYPES = {
+    "connectivity": {
+        "name": "Connectivity",
+        "translation_key": "connectivity",
+        "device_class": "connectivity",
+        "entity_category": EntityCategory.DIAGNOSTIC,
+    },
+    "expected_offline": {
+        "name": "Expected Offline",
+        "translation_key": "expected_offline",
+        "icon": "mdi:weather-night",
+        "entity_category": EntityCategory.DIAGNOSTIC,
+    },
+    "alarm_active": {
+        "name": "Alarm Active",
+        "translation_key": "alarm_active",
+        "device_class": "problem",
+    },
+}
@@ -2,35 +2,163 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import Callable
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, TypeVar
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
+from .aggregation import WindowAggregator
+from .breaker import CircuitBreaker
+from .capture import FrameCapture
 from .const import (
+    CONF_ADDRESS,
+    CONF_BAUDRATE,
+    CONF_CAPTURE_FRAMES,
+    CONF_DEVICE_NAME,
+    CONF_EVENT_DEBOUNCE,
+    CONF_FRAME_GAP,
+    CONF_HEALTH_MAX_LATENCY,
+    CONF_HEALTH_MIN_SUCCESS_RATE,
     CONF_HOST,
+    CONF_IMPORT_STATISTICS,
     CONF_PORT,
+    CONF_PROTOCOL,
+    CONF_PUBLISH_INTERVAL,
+    CONF_STALE_WINDOW,
+    CONF_TRACE_SAMPLE_RATE,
     CONF_UPDATE_INTERVAL,
+    DEFAULT_ADDRESS,
+    DEFAULT_BAUDRATE,
+    DEFAULT_CAPTURE_FRAMES,
+    DEFAULT_DEVICE_NAME,
+    DEFAULT_EVENT_DEBOUNCE,
+    DEFAULT_FRAME_GAP,
+    DEFAULT_HEALTH_MAX_LATENCY,
+    DEFAULT_HEALTH_MIN_SUCCESS_RATE,
+    DEFAULT_IMPORT_STATISTICS,
+    DEFAULT_PROTOCOL,
+    DEFAULT_PUBLISH_INTERVAL,
+    DEFAULT_REFRESH_MIN_SPACING,
+    DEFAULT_STALE_WINDOW,
+    DEFAULT_TRACE_SAMPLE_RATE,
     DOMAIN,
+    HEALTH_WINDOW_SIZE,
+    PROTOCOL_MODBUS,
+    PROTOCOL_SERIAL,
+    SENSOR_TYPES,
 )
-from .solarmax_api import SolarmaxAPI, SolarmaxConnectionError, SolarmaxTimeoutError
+from .events import TransitionEvents
+from .health import HealthWindow, RequestCounters
+from .live import BusyCheck, LiveCallback, LiveFeed, LiveSubscription
+from .modbus_api import ModbusAPI
+from .profiler import RefreshSession
+from .proxy import MaxTalkProxy
+from .ratelimit import TokenBucket
+from .serial_api import SerialAPI
+from .snapshot import Snapshot
+from .solarmax_api import (
+    FIELD_MAP_INVERTER,
+    SolarmaxAPI,
+    SolarmaxCircuitOpenError,
+    SolarmaxConnectionError,
+    SolarmaxProtocolError,
+    SolarmaxTimeoutError,
+    field_map_for_group,
+)
+from .statistics_import import HourlyStatistics
+from .tracing import Tracer
+from .worker import IOWorker
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# Error kinds of the request counters, most specific first
+ERROR_KINDS: tuple[tuple[type[Exception], str], ...] = (
+    (SolarmaxCircuitOpenError, "circuit_open"),
+    (SolarmaxConnectionError, "connection"),
+    (SolarmaxTimeoutError, "timeout"),
+    (SolarmaxProtocolError, "protocol"),
+)
+
+
+def _error_kind(err: Exception) -> str:
+    """Return the counter label of a failed request."""
+    for error_type, kind in ERROR_KINDS:
+        if isinstance(err, error_type):
+            return kind
+    return "other"
+
+
+def _get_io_worker(hass: HomeAssistant) -> IOWorker:
+    """Return the I/O worker shared by all inverters."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if "io_worker" not in domain_data:
+        worker = IOWorker(hass.loop)
+        domain_data["io_worker"] = worker
+
+        @callback
+        def _shutdown(_event: Event) -> None:
+            worker.shutdown()
 
-class SolarmaxCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _shutdown)
+    return domain_data["io_worker"]
+
+
+def _get_gateway_bucket(hass: HomeAssistant, host: str) -> TokenBucket:
+    """Return the token bucket shared by all inverters behind a gateway."""
+    buckets: dict[str, TokenBucket] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        "gateway_buckets", {}
+    )
+    if host not in buckets:
+        buckets[host] = TokenBucket(DEFAULT_REFRESH_MIN_SPACING)
+    return buckets[host]
+
+
+class SolarmaxCoordinator(DataUpdateCoordinator[Snapshot]):
     """Class to manage fetching Solarmax data."""
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the coordinator."""
-        self.api = SolarmaxAPI(
-            host=entry.data[CONF_HOST],
-            port=entry.data[CONF_PORT],
+        capture = None
+        if entry.data.get(CONF_CAPTURE_FRAMES, DEFAULT_CAPTURE_FRAMES):
+            capture = FrameCapture(
+                hass.config.path(f"{DOMAIN}_capture_{entry.entry_id}.log")
+            )
+
+        protocol = entry.data.get(CONF_PROTOCOL, DEFAULT_PROTOCOL)
+        sample_rate = (
+            entry.data.get(CONF_TRACE_SAMPLE_RATE, DEFAULT_TRACE_SAMPLE_RATE) / 100
         )
+        if protocol == PROTOCOL_SERIAL:
+            self.api: SolarmaxAPI = SerialAPI(
+                device=entry.data[CONF_HOST],
+                baudrate=entry.data.get(CONF_BAUDRATE, DEFAULT_BAUDRATE),
+                address=entry.data.get(CONF_ADDRESS, DEFAULT_ADDRESS),
+                frame_gap=entry.data.get(CONF_FRAME_GAP, DEFAULT_FRAME_GAP) / 1000,
+                capture=capture,
+                tracer=Tracer(logging.getLogger(SerialAPI.__module__), sample_rate),
+            )
+        else:
+            api_class = ModbusAPI if protocol == PROTOCOL_MODBUS else SolarmaxAPI
+            self.api = api_class(
+                host=entry.data[CONF_HOST],
+                port=entry.data[CONF_PORT],
+                capture=capture,
+                tracer=Tracer(logging.getLogger(api_class.__module__), sample_rate),
+                address=entry.data.get(CONF_ADDRESS, DEFAULT_ADDRESS),
+            )
 
         update_interval = timedelta(seconds=entry.data.get(CONF_UPDATE_INTERVAL, 30))
 
@@ -47,6 +175,93 @@ class SolarmaxCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._last_successful_update = None
         self._is_expected_offline = False
 
+        # Stale-while-revalidate: sample time of every field's last good value
+        # and the interval it is read at; the value is served until its next
+        # read is overdue by more than stale_window seconds
+        self._stale_window = entry.data.get(CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW)
+        self._sampled_at: dict[str, datetime] = {}
+        self._read_interval: dict[str, float] = {}
+        # Failed polls after a failed poll do not notify the entities, so
+        # they are told when the next last good value turns stale
+        self._unsub_expiry: CALLBACK_TYPE | None = None
+
+        # Metadata of the published snapshots
+        self._sequence = 0
+        self._poll_duration: float | None = None
+
+        # Connection health over recent daytime polls, surfaced as a repair
+        # issue when it drops below the configured thresholds
+        self._health = HealthWindow(HEALTH_WINDOW_SIZE)
+        self._health_issue = False
+        self._min_success_rate = entry.data.get(
+            CONF_HEALTH_MIN_SUCCESS_RATE, DEFAULT_HEALTH_MIN_SUCCESS_RATE
+        )
+        self._max_latency = entry.data.get(
+            CONF_HEALTH_MAX_LATENCY, DEFAULT_HEALTH_MAX_LATENCY
+        )
+        self._issue_id = f"connection_issues_{entry.entry_id}"
+        self._entry_id = entry.entry_id
+
+        # Lifetime totals of all API requests, exported as metrics
+        self._request_counters = RequestCounters()
+
+        # All requests run on the integration's own I/O worker, queued per
+        # gateway so scheduled, on-demand and live polls never overlap
+        self._io_worker = _get_io_worker(hass)
+
+        # Websocket subscribers, fed by every poll plus a fast poll of their
+        # fields that only runs while anyone is subscribed
+        self._live = LiveFeed()
+        self._live_task: asyncio.Task[None] | None = None
+
+        # Profiling and memory tracing sessions watching the next refreshes
+        self._refresh_sessions: list[RefreshSession] = []
+
+        # MaxTalk proxy serving other clients, set up with the entry
+        self.proxy: MaxTalkProxy | None = None
+
+        # Debounced solarmax_status_changed / solarmax_alarm events
+        self._events = TransitionEvents(
+            hass,
+            entry.entry_id,
+            entry.data.get(CONF_DEVICE_NAME, DEFAULT_DEVICE_NAME),
+            entry.data.get(CONF_EVENT_DEBOUNCE, DEFAULT_EVENT_DEBOUNCE),
+        )
+
+        # On-demand refreshes: one in-flight poll per inverter, spaced per gateway
+        self._gateway_bucket = _get_gateway_bucket(hass, entry.data[CONF_HOST])
+        self._pending_refresh: tuple[str | None, asyncio.Task[None]] | None = None
+
+        # Optional oversampling: poll every update_interval, publish the
+        # window mean/min/max every publish_interval
+        self._aggregator: WindowAggregator | None = None
+        publish_interval = entry.data.get(
+            CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL
+        )
+        if publish_interval > update_interval.total_seconds():
+            self._aggregator = WindowAggregator(
+                publish_interval,
+                (
+                    key
+                    for key, config in SENSOR_TYPES.items()
+                    if config.get("state_class") == "measurement"
+                ),
+            )
+
+        # Optional hourly long-term statistics computed from every poll
+        self._statistics: HourlyStatistics | None = None
+        if entry.data.get(CONF_IMPORT_STATISTICS, DEFAULT_IMPORT_STATISTICS):
+            if "recorder" in hass.config.components:
+                self._statistics = HourlyStatistics(
+                    hass,
+                    entry.entry_id,
+                    entry.data.get(CONF_DEVICE_NAME, DEFAULT_DEVICE_NAME),
+                )
+            else:
+                _LOGGER.warning(
+                    "Statistics import is enabled but the recorder is not loaded"
+                )
+
     def _is_night_time(self) -> bool:
         """Check if it's currently night time (when inverter is expected to be offline)."""
         try:
@@ -62,15 +277,18 @@ class SolarmaxCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             return current_hour >= 20 or current_hour < 6
 
         except Exception as e:
-            _LOGGER.debug(f"Error checking night time: {e}")
+            _LOGGER.debug("Error checking night time: %s", e)
             # Fallback: simple time-based check
             current_hour = dt_util.now().hour
             return current_hour >= 20 or current_hour < 6
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    async def _async_update_data(self) -> Snapshot:
         """Fetch data from the inverter with intelligent error handling."""
+        # Scheduled polls count against the gateway budget too, but never wait
+        self._gateway_bucket.try_acquire()
+
         try:
-            data = await self.hass.async_add_executor_job(self.api.get_data)
+            data = await self._async_fetch()
 
             if not data:
                 raise UpdateFailed("No data received from inverter")
@@ -86,7 +304,22 @@ class SolarmaxCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             self._is_expected_offline = False
 
             _LOGGER.debug("Successfully updated data from inverter")
-            return data
+            self._record_samples(data)
+
+            if self._statistics is not None:
+                self._statistics.add(data, dt_util.utcnow())
+
+            if (published := self._aggregate(data)) is None:
+                # Returning unchanged data does not notify the entities
+                return self.data
+            return self._publish(published)
+
+        except SolarmaxCircuitOpenError as err:
+            # Already reported when the breaker opened; keep the log quiet
+            self._consecutive_failures += 1
+            self._is_expected_offline = self._is_night_time()
+            _LOGGER.debug("Skipping poll: %s", err)
+            raise UpdateFailed(f"Polling suspended: {err}") from err
 
         except (SolarmaxConnectionError, SolarmaxTimeoutError) as err:
             self._consecutive_failures += 1
@@ -96,18 +329,20 @@ class SolarmaxCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             if is_night:
                 # During night time, connection failures are expected
                 self._is_expected_offline = True
-                _LOGGER.debug(f"Inverter offline during night time (expected): {err}")
+                _LOGGER.debug("Inverter offline during night time (expected): %s", err)
                 raise UpdateFailed(f"Inverter offline (night time): {err}") from err
 
             elif self._consecutive_failures == 1:
                 # First failure during day - could be temporary, log as warning
-                _LOGGER.warning(f"First connection failure during day time: {err}")
+                _LOGGER.warning("First connection failure during day time: %s", err)
                 raise UpdateFailed(f"Connection failed (attempt 1): {err}") from err
 
             elif self._consecutive_failures <= 3:
                 # Multiple failures but not too many - could be inverter restart
                 _LOGGER.warning(
-                    f"Connection failure #{self._consecutive_failures} during day time: {err}"
+                    "Connection failure #%d during day time: %s",
+                    self._consecutive_failures,
+                    err,
                 )
                 raise UpdateFailed(
                     f"Connection failed (attempt {self._consecutive_failures}): {err}"
@@ -130,11 +365,408 @@ class SolarmaxCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                     )
                 raise UpdateFailed(f"Persistent connection failure: {err}") from err
 
+        except SolarmaxProtocolError as err:
+            # The inverter answered, but no frame survived verification
+            self._consecutive_failures += 1
+            _LOGGER.warning("Corrupt response from inverter: %s", err)
+            raise UpdateFailed(f"Corrupt response from inverter: {err}") from err
+
         except Exception as err:
             self._consecutive_failures += 1
-            _LOGGER.error(f"Unexpected error communicating with inverter: {err}")
+            _LOGGER.error("Unexpected error communicating with inverter: %s", err)
             raise UpdateFailed(f"Unexpected error: {err}") from err
 
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh and update entities, watched by any attached sessions."""
+        if not self._refresh_sessions:
+            await super()._async_refresh(*args, **kwargs)
+            return
+
+        sessions = list(self._refresh_sessions)
+        for session in sessions:
+            session.enter()
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            for session in sessions:
+                if session.exit(self) and session in self._refresh_sessions:
+                    self._refresh_sessions.remove(session)
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll and the next expiry of a last good value."""
+        super()._schedule_refresh()
+        self._schedule_expiry()
+
+    @callback
+    def _unschedule_refresh(self) -> None:
+        """Stop polling and expiring values once the last entity is gone."""
+        super()._unschedule_refresh()
+        self._cancel_expiry()
+
+    @callback
+    def _schedule_expiry(self) -> None:
+        """Notify the entities a second after the next field turns stale."""
+        self._cancel_expiry()
+        now = dt_util.utcnow()
+        remaining = [
+            self.field_read_interval(field)
+            + self._stale_window
+            - (now - sampled_at).total_seconds()
+            for field, sampled_at in self._sampled_at.items()
+        ]
+        if fresh := [seconds for seconds in remaining if seconds >= 0]:
+            self._unsub_expiry = async_call_later(
+                self.hass, min(fresh) + 1, self._handle_expiry
+            )
+
+    @callback
+    def _cancel_expiry(self) -> None:
+        """Cancel the pending expiry notification."""
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+
+    @callback
+    def _handle_expiry(self, _now: datetime) -> None:
+        """Let the entities re-check their availability."""
+        self._unsub_expiry = None
+        self.async_update_listeners()
+        if self._listeners:
+            self._schedule_expiry()
+
+    def attach_refresh_session(self, session: RefreshSession) -> None:
+        """Let a session watch the next refreshes."""
+        self._refresh_sessions.append(session)
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        """Poll all fields and record the outcome in the health window."""
+        return await self._async_call_api(record_health=True)
+
+    async def async_run_io(self, fn: Callable[..., _T], *args: Any) -> _T:
+        """Run a blocking call on the I/O worker, in turn with other requests.
+
+        Requests to the same gateway run one at a time, in order.
+        """
+        return await self._io_worker.submit(self.api.host, fn, *args)
+
+    async def _async_call_api(
+        self, *args: Any, record_health: bool = False
+    ) -> dict[str, Any]:
+        """Run get_data on the I/O worker and count the request.
+
+        Latencies are the time the request ran, without its queue wait.
+        """
+        job = self._io_worker.submit(self.api.host, self.api.get_data, *args)
+        try:
+            data = await job
+        except Exception as err:
+            self._request_counters.add(job.duration or 0.0, _error_kind(err))
+            if record_health:
+                self._record_health(False, job.duration or 0.0)
+            raise
+
+        duration = job.duration or 0.0
+        self._request_counters.add(duration, None if data else "protocol")
+        if record_health:
+            self._poll_duration = duration
+            self._record_health(bool(data), duration)
+        return data
+
+    def _record_health(self, success: bool, latency: float) -> None:
+        """Update the health window and raise or clear the repair issue."""
+        if self._is_night_time():
+            # The inverter switches off at night; that says nothing about health
+            return
+
+        self._health.add(success, latency)
+        if not self._health.is_full:
+            return
+
+        mean_latency = self._health.mean_latency
+        healthy = self._health.success_rate >= self._min_success_rate and (
+            mean_latency is None or mean_latency <= self._max_latency
+        )
+        if healthy == (not self._health_issue):
+            return
+
+        self._health_issue = not healthy
+        if healthy:
+            _LOGGER.info("Connection to %s is healthy again", self.api.endpoint)
+            ir.async_delete_issue(self.hass, DOMAIN, self._issue_id)
+            return
+
+        _LOGGER.warning(
+            "Connection to %s is unhealthy: %.0f%% of polls succeeded, "
+            "mean latency %s",
+            self.api.endpoint,
+            self._health.success_rate,
+            f"{mean_latency:.1f}s" if mean_latency is not None else "n/a",
+        )
+        placeholders = {
+            "host": self.api.host,
+            "port": str(self.api.port),
+            "failures": str(self._health.failures),
+        }
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            self._issue_id,
+            is_fixable=True,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="connection_issues",
+            translation_placeholders=placeholders,
+            data={**placeholders, "entry_id": self._entry_id},
+        )
+
+    async def async_refresh_fields(self, group: str | None = None) -> None:
+        """Refresh the inverter on demand, coalescing concurrent requests.
+
+        Callers asking for data already covered by the poll in flight (a full
+        poll, or one for the same field group) join it instead of starting
+        another one.
+        """
+        while (pending := self._pending_refresh) is not None:
+            pending_group, pending_task = pending
+            await asyncio.shield(pending_task)
+            if pending_group is None or pending_group == group:
+                return
+
+        task = self.hass.async_create_task(self._async_refresh_fields(group))
+        self._pending_refresh = (group, task)
+        task.add_done_callback(self._clear_pending_refresh)
+        await asyncio.shield(task)
+
+    def _clear_pending_refresh(self, task: asyncio.Task[None]) -> None:
+        """Forget a finished on-demand refresh."""
+        if self._pending_refresh is not None and self._pending_refresh[1] is task:
+            self._pending_refresh = None
+
+    async def _async_refresh_fields(self, group: str | None) -> None:
+        """Perform an on-demand refresh once the gateway allows it."""
+        await self._gateway_bucket.async_acquire()
+
+        if group is None:
+            # async_refresh reports failures through last_update_success
+            await self.async_refresh()
+            if not self.last_update_success:
+                raise HomeAssistantError(
+                    f"Failed to refresh {self.api.endpoint}: {self.last_exception}"
+                ) from self.last_exception
+            return
+
+        data = await self._async_call_api(field_map_for_group(group))
+        if not data:
+            raise UpdateFailed(f"No data received for field group {group}")
+
+        _LOGGER.debug("Refreshed field group %s on demand", group)
+        self._record_samples(data)
+        if (published := self._aggregate(data)) is None:
+            # The samples are published with the current window
+            return
+        if self.data:
+            # Fields outside the group keep their current values
+            published = {**self.data.as_dict(), **published}
+        self.async_set_updated_data(self._publish(published))
+
+    def _aggregate(self, data: dict[str, Any]) -> dict[str, Any] | None:
+        """Add a poll result to the window; return the data to publish, if any."""
+        if self._aggregator is None:
+            return data
+        if not self._aggregator.add(data, time.monotonic()) and self.data is not None:
+            return None
+        return self._aggregator.flush()
+
+    def _record_samples(self, data: dict[str, Any]) -> None:
+        """Remember when the fields of a successful poll were read."""
+        now = dt_util.utcnow()
+        update_interval = self.update_interval.total_seconds()
+        for field in data:
+            if (previous := self._sampled_at.get(field)) is not None:
+                # Fields read less often than every poll get more time
+                self._read_interval[field] = max(
+                    (now - previous).total_seconds(), update_interval
+                )
+            self._sampled_at[field] = now
+        self._events.process(data, now)
+        if self._live:
+            self._live.publish(data, now)
+
+    @callback
+    def async_subscribe_live(
+        self,
+        live_callback: LiveCallback,
+        fields: frozenset[str] | None,
+        interval: float,
+        busy: BusyCheck | None = None,
+    ) -> CALLBACK_TYPE:
+        """Stream samples of the given fields; return the unsubscribe callback.
+
+        The first subscriber starts a poll of the subscribed fields at the
+        shortest subscribed interval, which bypasses the entities, pauses
+        while the inverter is expected offline and stops again with the last
+        unsubscribe. Deliveries wait while busy returns True.
+        """
+        subscription = LiveSubscription(
+            live_callback, fields, interval, self.hass.loop, busy
+        )
+        self._live.add(subscription)
+        if self._live_task is None:
+            self._live_task = self.hass.async_create_background_task(
+                self._async_live_poll(), f"{DOMAIN} live poll {self.api.host}"
+            )
+            _LOGGER.debug("Started live polling of %s", self.api.host)
+
+        @callback
+        def unsubscribe() -> None:
+            self._live.remove(subscription)
+            if not self._live:
+                self._stop_live_poll()
+
+        return unsubscribe
+
+    def _stop_live_poll(self) -> None:
+        """Stop the fast poll."""
+        if self._live_task is not None:
+            self._live_task.cancel()
+            self._live_task = None
+            _LOGGER.debug("Stopped live polling of %s", self.api.host)
+
+    async def _async_live_poll(self) -> None:
+        """Poll the subscribed fields until the last subscriber leaves."""
+        while self._live:
+            start = time.monotonic()
+            if self._is_expected_offline:
+                # The scheduled polls find out when the inverter wakes up;
+                # failing live polls would only trip the circuit breaker
+                await asyncio.sleep(self._live.interval)
+                continue
+            fields = self._live.fields
+            field_map = (
+                None
+                if fields is None
+                else {code: FIELD_MAP_INVERTER[code] for code in fields}
+            )
+            try:
+                data = await self._async_call_api(field_map)
+            except (
+                SolarmaxConnectionError,
+                SolarmaxTimeoutError,
+                SolarmaxProtocolError,
+            ) as err:
+                _LOGGER.debug("Live poll of %s failed: %s", self.api.host, err)
+            else:
+                if data:
+                    self._record_samples(data)
+
+            if not self._live:
+                break
+            await asyncio.sleep(
+                max(self._live.interval - (time.monotonic() - start), 0)
+            )
+
+    async def async_shutdown(self) -> None:
+        """Stop the live poll, sessions and timers with the scheduled polls."""
+        self._stop_live_poll()
+        self._cancel_expiry()
+        if self._statistics is not None:
+            self._statistics.async_stop()
+        sessions, self._refresh_sessions = self._refresh_sessions, []
+        for session in sessions:
+            session.detach(self)
+        await super().async_shutdown()
+
+    def _publish(self, data: dict[str, Any]) -> Snapshot:
+        """Build the next snapshot from a poll result.
+
+        Fields missing from the poll keep their last good value while it is
+        within the staleness window.
+        """
+        if self.data:
+            stale = {
+                field: sample
+                for field, sample in self.data.as_dict().items()
+                if field not in data and self.is_field_fresh(field)
+            }
+            if stale:
+                data = {**stale, **data}
+
+        self._sequence += 1
+        return Snapshot.from_data(
+            data,
+            sequence=self._sequence,
+            sampled_at=dt_util.utcnow(),
+            duration=self._poll_duration,
+        )
+
+    def field_sampled_at(self, field: str) -> datetime | None:
+        """Return when a field's last good value was read."""
+        return self._sampled_at.get(field)
+
+    def field_age(self, field: str) -> float | None:
+        """Return the age of a field's last good value in seconds."""
+        sampled_at = self._sampled_at.get(field)
+        if sampled_at is None:
+            return None
+        return (dt_util.utcnow() - sampled_at).total_seconds()
+
+    def field_read_interval(self, field: str) -> float:
+        """Return the interval a field is read at in seconds."""
+        return self._read_interval.get(field, self.update_interval.total_seconds())
+
+    def is_field_fresh(self, field: str) -> bool:
+        """Return if a field's next read is overdue by at most the stale window."""
+        age = self.field_age(field)
+        return (
+            age is not None
+            and age <= self.field_read_interval(field) + self._stale_window
+        )
+
+    @property
+    def stale_window(self) -> float:
+        """Return how long overdue last good values are served, in seconds."""
+        return self._stale_window
+
+    @property
+    def health(self) -> HealthWindow:
+        """Return the rolling connection health of daytime polls."""
+        return self._health
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """Return the circuit breaker guarding the inverter connection."""
+        return self.api.breaker
+
+    @property
+    def live_subscribers(self) -> bool:
+        """Return if any websocket subscriber is connected."""
+        return bool(self._live)
+
+    @property
+    def request_counters(self) -> RequestCounters:
+        """Return the lifetime request, error and latency totals."""
+        return self._request_counters
+
+    @property
+    def io_worker(self) -> IOWorker:
+        """Return the worker running the requests to the inverter."""
+        return self._io_worker
+
+    @property
+    def gateway_bucket(self) -> TokenBucket:
+        """Return the request budget shared with other inverters on the gateway."""
+        return self._gateway_bucket
+
+    @property
+    def is_aggregating(self) -> bool:
+        """Return if polled samples are aggregated before publishing."""
+        return self._aggregator is not None
+
+    @property
+    def imports_statistics(self) -> bool:
+        """Return if hourly statistics are imported as external statistics."""
+        return self._statistics is not None
+
     @property
     def is_expected_offline(self) -> bool:
         """Return if the inverter is expected to be offline (e.g., night time)."""
@@ -2,23 +2,30 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import CONF_HOST, CONF_PORT
+from .const import CONF_HOST, CONF_PORT, DOMAIN
 from .coordinator import SolarmaxCoordinator
 
 REDACT_KEYS = {CONF_HOST}
 
 
+def _isoformat(value: datetime | None) -> str | None:
+    """Return a timestamp as ISO string."""
+    return value.isoformat() if isinstance(value, datetime) else None
+
+
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
     coordinator: SolarmaxCoordinator = entry.runtime_data
+    snapshot = coordinator.data
 
     # Collect all diagnostic data
     diagnostics_data = {
@@ -39,10 +46,19 @@ async def async_get_config_entry_diagnostics(
                 str(coordinator.last_exception) if coordinator.last_exception else None
             ),
             "update_interval": str(coordinator.update_interval),
-            "data_available": coordinator.data is not None,
-            "data_keys": list(coordinator.data.keys()) if coordinator.data else [],
+            "data_available": snapshot is not None,
+            "data_keys": list(snapshot) if snapshot is not None else [],
+            "consecutive_failures": coordinator.consecutive_failures,
+            "last_successful_update": _isoformat(coordinator.last_successful_update),
+            "is_expected_offline": coordinator.is_expected_offline,
+        },
+        "api_connection": {
+            "last_successful_connection": _isoformat(
+                coordinator.api.last_successful_connection
+            ),
+            "circuit_breaker": coordinator.api.breaker.as_dict(),
+            "io_queue": coordinator.io_worker.stats(coordinator.api.host),
         },
-        "api_connection": {},
         "sensor_data": {},
         "system_info": {
             "ha_version": hass.config.as_dict().get("version"),
@@ -50,53 +66,23 @@ async def async_get_config_entry_diagnostics(
         },
     }
 
-    # Add coordinator-specific diagnostics
-    if hasattr(coordinator, "consecutive_failures"):
-        diagnostics_data["coordinator"][
-            "consecutive_failures"
-        ] = coordinator.consecutive_failures
-
-    if (
-        hasattr(coordinator, "last_successful_update")
-        and coordinator.last_successful_update
-    ):
-        diagnostics_data["coordinator"][
-            "last_successful_update"
-        ] = coordinator.last_successful_update.isoformat()
-
-    if hasattr(coordinator, "is_expected_offline"):
-        diagnostics_data["coordinator"][
-            "is_expected_offline"
-        ] = coordinator.is_expected_offline
-
-    # Add API connection diagnostics
-    if (
-        hasattr(coordinator.api, "last_successful_connection")
-        and coordinator.api.last_successful_connection
-    ):
-        diagnostics_data["api_connection"][
-            "last_successful_connection"
-        ] = coordinator.api.last_successful_connection.isoformat()
-
-    if hasattr(coordinator.api, "connection_attempts"):
-        diagnostics_data["api_connection"][
-            "connection_attempts"
-        ] = coordinator.api.connection_attempts
-
-    if hasattr(coordinator.api, "timeout_errors"):
-        diagnostics_data["api_connection"][
-            "timeout_errors"
-        ] = coordinator.api.timeout_errors
-
-    # Add current sensor data (with redacted sensitive info)
-    if coordinator.data:
-        diagnostics_data["sensor_data"] = {}
-        for sensor_key, sensor_data in coordinator.data.items():
-            diagnostics_data["sensor_data"][sensor_key] = {
-                "value": sensor_data.get("value"),
-                "raw_value": sensor_data.get("raw_value"),
-                "timestamp": sensor_data.get("timestamp"),
+    # Add the published snapshot
+    if snapshot is not None:
+        diagnostics_data["snapshot"] = {
+            "sequence": snapshot.sequence,
+            "sampled_at": _isoformat(snapshot.sampled_at),
+            "poll_duration": snapshot.duration,
+        }
+        diagnostics_data["sensor_data"] = {
+            code: {
+                "value": snapshot.value(code),
+                "raw_value": snapshot.raw(code),
+                # Carried-over values are older than the snapshot
+                "timestamp": _isoformat(coordinator.field_sampled_at(code)),
+                "age": coordinator.field_age(code),
             }
+            for code in snapshot
+        }
 
     # Add device information
     device_info = {
@@ -107,4 +93,21 @@ async def async_get_config_entry_diagnostics(
     }
     diagnostics_data["device_info"] = device_info
 
+    # Recent polls with their full debug detail, formatted only now
+    tracer = coordinator.api.tracer
+    diagnostics_data["trace"] = {
+        "sample_rate": tracer.sample_rate,
+        "polls": tracer.polls,
+        "kept": tracer.kept,
+        "records": tracer.as_list(redact=[entry.data.get(CONF_HOST, "")]),
+    }
+
+    # Clients served by the MaxTalk proxy
+    diagnostics_data["proxy"] = (
+        coordinator.proxy.stats() if coordinator.proxy is not None else None
+    )
+
+    # Allocation sites of the last solarmax.trace_memory run, for all inverters
+    diagnostics_data["memory_report"] = hass.data.get(DOMAIN, {}).get("memory_report")
+
     return diagnostics_data
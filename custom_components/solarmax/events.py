@@ -0,0 +1,99 @@
+"""Debounced status and alarm transition events for Solarmax inverters."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import EVENT_ALARM, EVENT_STATUS_CHANGED
+
+# Event fired for transitions of each code field
+EVENT_FIELDS = {"SYS": EVENT_STATUS_CHANGED, "SAL": EVENT_ALARM}
+
+
+class CodeTransition(NamedTuple):
+    """A confirmed change of a status or alarm code."""
+
+    previous_code: int | None
+    previous_since: datetime | None
+    code: int
+    since: datetime
+
+
+class CodeDebouncer:
+    """Confirm code changes only after they persisted for the debounce time.
+
+    Only the stable code and one candidate are kept, so each update is O(1).
+    A candidate that flips back before the debounce time has passed is
+    dropped without a transition.
+    """
+
+    __slots__ = ("debounce", "code", "since", "_candidate", "_candidate_since")
+
+    def __init__(self, debounce: float) -> None:
+        """Initialize the debouncer without a known code."""
+        self.debounce = debounce
+        self.code: int | None = None
+        self.since: datetime | None = None
+        self._candidate: int | None = None
+        self._candidate_since: datetime | None = None
+
+    def update(self, code: int, now: datetime) -> CodeTransition | None:
+        """Add a polled code; return the transition once it is confirmed."""
+        if self.code is None:
+            # The first code is the starting point, not a transition
+            self.code, self.since = code, now
+            return None
+        if code == self.code:
+            self._candidate = None
+            return None
+
+        if code != self._candidate:
+            self._candidate, self._candidate_since = code, now
+        if (now - self._candidate_since).total_seconds() < self.debounce:
+            return None
+
+        transition = CodeTransition(self.code, self.since, code, self._candidate_since)
+        self.code, self.since = code, self._candidate_since
+        self._candidate = None
+        return transition
+
+
+class TransitionEvents:
+    """Fire status and alarm events for debounced code transitions."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, device_name: str, debounce: float
+    ) -> None:
+        """Initialize the event source."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self.device_name = device_name
+        self._debouncers = {field: CodeDebouncer(debounce) for field in EVENT_FIELDS}
+
+    def process(self, data: dict[str, dict[str, Any]], now: datetime) -> None:
+        """Check a poll result for transitions and fire their events."""
+        for field, debouncer in self._debouncers.items():
+            code = data.get(field, {}).get("raw_value")
+            if not isinstance(code, int):
+                continue
+            if (transition := debouncer.update(code, now)) is None:
+                continue
+
+            event_data = {
+                "config_entry_id": self.entry_id,
+                "device_name": self.device_name,
+                "previous_code": transition.previous_code,
+                "previous_since": (
+                    transition.previous_since.isoformat()
+                    if transition.previous_since
+                    else None
+                ),
+                "code": transition.code,
+                "since": transition.since.isoformat(),
+            }
+            if field == "SAL":
+                event_data["active"] = transition.code != 0
+            self.hass.bus.async_fire(EVENT_FIELDS[field], event_data)
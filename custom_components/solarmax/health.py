@@ -0,0 +1,91 @@
+"""Connection health tracking for Solarmax inverters."""
+
+from __future__ import annotations
+
+from collections import deque
+
+
+class HealthWindow:
+    """Rolling success rate and latency over the last polls.
+
+    Sums are updated when a poll enters or leaves the window, so every
+    update and every query is O(1) regardless of the window size.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty window."""
+        self.size = size
+        self._polls: deque[tuple[bool, float]] = deque()
+        self._successes = 0
+        self._latency_total = 0.0
+
+    def add(self, success: bool, latency: float) -> None:
+        """Add a poll, evicting the oldest one once the window is full."""
+        if len(self._polls) == self.size:
+            old_success, old_latency = self._polls.popleft()
+            self._successes -= old_success
+            if old_success:
+                self._latency_total -= old_latency
+
+        self._polls.append((success, latency))
+        self._successes += success
+        if success:
+            self._latency_total += latency
+
+    @property
+    def count(self) -> int:
+        """Return the number of polls in the window."""
+        return len(self._polls)
+
+    @property
+    def is_full(self) -> bool:
+        """Return if the window holds enough polls to judge health."""
+        return len(self._polls) == self.size
+
+    @property
+    def failures(self) -> int:
+        """Return the number of failed polls in the window."""
+        return len(self._polls) - self._successes
+
+    @property
+    def success_rate(self) -> float | None:
+        """Return the share of successful polls in percent."""
+        if not self._polls:
+            return None
+        return 100 * self._successes / len(self._polls)
+
+    @property
+    def mean_latency(self) -> float | None:
+        """Return the mean duration of successful polls in seconds."""
+        if not self._successes:
+            return None
+        return self._latency_total / self._successes
+
+    def reset(self) -> None:
+        """Forget all polls."""
+        self._polls.clear()
+        self._successes = 0
+        self._latency_total = 0.0
+
+
+class RequestCounters:
+    """Monotonic request, error and latency totals of an inverter's API.
+
+    Unlike the health window these never reset, so they can be exported as
+    counters and rated by the scraper.
+    """
+
+    __slots__ = ("requests", "errors", "latency_total")
+
+    def __init__(self) -> None:
+        """Initialize all counters at zero."""
+        self.requests = 0
+        self.errors: dict[str, int] = {}
+        self.latency_total = 0.0
+
+    def add(self, latency: float, error: str | None = None) -> None:
+        """Count a request and its duration, and its error kind if it failed."""
+        self.requests += 1
+        self.latency_total += latency
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
@@ -0,0 +1,138 @@
+"""Live sample feed for Solarmax websocket subscribers."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+# Receives the merged samples, their sample time and the number of dropped
+# intermediate values
+LiveCallback = Callable[[dict[str, dict[str, Any]], datetime, int], None]
+
+# Returns if the subscriber has not taken the last deliveries yet
+BusyCheck = Callable[[], bool]
+
+
+class LiveSubscription:
+    """Deliver samples to one subscriber at most once per interval.
+
+    Samples arriving while a delivery is held back are merged, so only the
+    latest value of every field is sent and intermediate values are dropped
+    instead of queueing up for a slow subscriber. Deliveries are also held
+    back while the subscriber is still busy with earlier ones.
+    """
+
+    __slots__ = (
+        "fields",
+        "interval",
+        "_callback",
+        "_busy",
+        "_loop",
+        "_pending",
+        "_sampled_at",
+        "_dropped",
+        "_last_sent",
+        "_timer",
+    )
+
+    def __init__(
+        self,
+        callback: LiveCallback,
+        fields: frozenset[str] | None,
+        interval: float,
+        loop: asyncio.AbstractEventLoop,
+        busy: BusyCheck | None = None,
+    ) -> None:
+        """Initialize the subscription; fields None selects all fields."""
+        self.fields = fields
+        self.interval = interval
+        self._callback = callback
+        self._busy = busy
+        self._loop = loop
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._sampled_at: datetime | None = None
+        self._dropped = 0
+        self._last_sent = float("-inf")
+        self._timer: asyncio.TimerHandle | None = None
+
+    def push(self, data: dict[str, dict[str, Any]], sampled_at: datetime) -> None:
+        """Queue the selected fields of a sample for delivery."""
+        if self.fields is not None:
+            data = {code: data[code] for code in self.fields if code in data}
+        if not data:
+            return
+
+        self._dropped += len(self._pending.keys() & data.keys())
+        self._pending.update(data)
+        self._sampled_at = sampled_at
+        if self._timer is not None:
+            return
+
+        delay = self._last_sent + self.interval - time.monotonic()
+        if delay <= 0:
+            self._flush()
+        else:
+            self._timer = self._loop.call_later(delay, self._flush)
+
+    def _flush(self) -> None:
+        """Deliver the pending samples."""
+        if self._busy is not None and self._busy():
+            # Keep merging until the subscriber caught up
+            self._timer = self._loop.call_later(self.interval, self._flush)
+            return
+        self._timer = None
+        pending, self._pending = self._pending, {}
+        dropped, self._dropped = self._dropped, 0
+        self._last_sent = time.monotonic()
+        self._callback(pending, self._sampled_at, dropped)
+
+    def cancel(self) -> None:
+        """Stop delivering samples."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = {}
+
+
+class LiveFeed:
+    """The live subscriptions of one inverter."""
+
+    def __init__(self) -> None:
+        """Initialize the feed without subscribers."""
+        self._subscriptions: set[LiveSubscription] = set()
+
+    def __bool__(self) -> bool:
+        """Return if anyone is subscribed."""
+        return bool(self._subscriptions)
+
+    def add(self, subscription: LiveSubscription) -> None:
+        """Add a subscription."""
+        self._subscriptions.add(subscription)
+
+    def remove(self, subscription: LiveSubscription) -> None:
+        """Remove a subscription and drop its pending samples."""
+        subscription.cancel()
+        self._subscriptions.discard(subscription)
+
+    @property
+    def fields(self) -> frozenset[str] | None:
+        """Return the fields any subscriber selected, None for all fields."""
+        fields: set[str] = set()
+        for subscription in self._subscriptions:
+            if subscription.fields is None:
+                return None
+            fields |= subscription.fields
+        return frozenset(fields)
+
+    @property
+    def interval(self) -> float:
+        """Return the shortest interval any subscriber asked for."""
+        return min(subscription.interval for subscription in self._subscriptions)
+
+    def publish(self, data: dict[str, dict[str, Any]], sampled_at: datetime) -> None:
+        """Offer a sample to every subscriber."""
+        for subscription in self._subscriptions:
+            subscription.push(data, sampled_at)
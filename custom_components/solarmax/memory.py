@@ -0,0 +1,162 @@
+"""tracemalloc snapshot diffs around Solarmax poll cycles."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sysconfig
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .profiler import RefreshSession
+
+if TYPE_CHECKING:
+    from .coordinator import SolarmaxCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Frames kept per allocation; enough to reach from logging or Home Assistant
+# internals back to the integration code that caused the allocation
+TRACE_FRAMES = 25
+
+# Allocation sites listed in the report
+TOP_SITES = 25
+
+_PACKAGE_DIR = os.path.dirname(__file__)
+_PATH_ROOTS = (
+    os.path.dirname(_PACKAGE_DIR),
+    sysconfig.get_paths()["purelib"],
+    sysconfig.get_paths()["stdlib"],
+)
+
+
+def _location(frame: tracemalloc.Frame) -> str:
+    """Return a frame as a short path and line number."""
+    filename = frame.filename
+    for root in _PATH_ROOTS:
+        if filename.startswith(root + os.sep):
+            filename = filename[len(root) + 1 :]
+            break
+    return f"{filename}:{frame.lineno}"
+
+
+def diff_snapshots(
+    before: tracemalloc.Snapshot,
+    after: tracemalloc.Snapshot,
+    limit: int = TOP_SITES,
+) -> dict[str, Any]:
+    """Compare allocations with integration code anywhere in their traceback.
+
+    Each site names the innermost integration frame, which caused the
+    allocation, and the innermost frame overall, which made it.
+    """
+    filters = [
+        tracemalloc.Filter(True, os.path.join(_PACKAGE_DIR, "*"), all_frames=True)
+    ]
+    stats = after.filter_traces(filters).compare_to(
+        before.filter_traces(filters), "traceback"
+    )
+
+    sites = []
+    for stat in stats[:limit]:
+        frames = stat.traceback
+        caller = next(
+            (
+                frame
+                for frame in reversed(frames)
+                if frame.filename.startswith(_PACKAGE_DIR)
+            ),
+            frames[-1],
+        )
+        sites.append(
+            {
+                "site": _location(caller),
+                "allocated_at": _location(frames[-1]),
+                "size_diff": stat.size_diff,
+                "size": stat.size,
+                "count_diff": stat.count_diff,
+                "count": stat.count,
+            }
+        )
+    return {
+        "size_diff": sum(stat.size_diff for stat in stats),
+        "count_diff": sum(stat.count_diff for stat in stats),
+        "sites": sites,
+    }
+
+
+class MemorySession(RefreshSession):
+    """Diff tracemalloc snapshots taken before and after N refreshes.
+
+    Tracing slows every allocation of the process, so it only runs while
+    the session does, unless something else had started it already.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: list[SolarmaxCoordinator],
+        polls: int,
+    ) -> None:
+        """Initialize the session; nothing is traced before async_start()."""
+        super().__init__(hass, coordinators, polls)
+        self._before: tracemalloc.Snapshot | None = None
+        self._started_tracing = False
+        self._started_at = dt_util.utcnow()
+        # Resolves to the report, or None if no refresh completed
+        self.finished: asyncio.Future[dict[str, Any] | None] = hass.loop.create_future()
+
+    async def async_start(self) -> None:
+        """Start tracing, take the first snapshot and attach."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started_tracing = True
+        self._before = await self._hass.async_add_executor_job(
+            tracemalloc.take_snapshot
+        )
+        self._started_at = dt_util.utcnow()
+        self.attach()
+        _LOGGER.info(
+            "Tracing memory over the next %d polls of %d inverters",
+            self._refreshes,
+            len(self._coordinators),
+        )
+
+    async def _async_finish(self) -> None:
+        """Take the second snapshot and store the report."""
+        try:
+            after = await self._hass.async_add_executor_job(tracemalloc.take_snapshot)
+        finally:
+            if self._started_tracing:
+                tracemalloc.stop()
+
+        if not self._completed:
+            # Every inverter was unloaded before its first refresh
+            _LOGGER.info("Memory trace finished without any poll")
+            self.finished.set_result(None)
+            return
+
+        diff = await self._hass.async_add_executor_job(
+            diff_snapshots, self._before, after
+        )
+        report = {
+            "started_at": self._started_at.isoformat(),
+            "finished_at": dt_util.utcnow().isoformat(),
+            "polls": self._refreshes,
+            "inverters": len(self._coordinators),
+            "trace_frames": after.traceback_limit,
+            **diff,
+        }
+        self._hass.data.setdefault(DOMAIN, {})["memory_report"] = report
+        _LOGGER.info(
+            "Memory trace finished: %+d bytes in %+d blocks allocated by the "
+            "integration; see the diagnostics for the allocation sites",
+            report["size_diff"],
+            report["count_diff"],
+        )
+        self.finished.set_result(report)
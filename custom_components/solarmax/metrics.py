@@ -0,0 +1,270 @@
+"""OpenMetrics scrape endpoint for Solarmax inverters."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, NamedTuple
+
+from aiohttp import web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from .breaker import STATE_CLOSED
+from .const import (
+    CONF_DEVICE_NAME,
+    CONF_EXPOSE_METRICS,
+    DEFAULT_DEVICE_NAME,
+    DEFAULT_EXPOSE_METRICS,
+    DOMAIN,
+    METRICS_URL,
+)
+from .coordinator import SolarmaxCoordinator
+from .snapshot import FIELD_CODES
+from .worker import IOWorker
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class Family(NamedTuple):
+    """A metric family and its metadata."""
+
+    name: str
+    type: str
+    help: str
+
+
+# Samples of a family must be contiguous, so every entry renders one block
+# per family and the response interleaves them in this order
+FAMILIES = (
+    Family("solarmax_value", "gauge", "Scaled value of an inverter field"),
+    Family("solarmax_raw_value", "gauge", "Value of an inverter field as sent"),
+    Family(
+        "solarmax_sample_timestamp_seconds",
+        "gauge",
+        "Unix time the published values were sampled",
+    ),
+    Family("solarmax_poll_duration_seconds", "gauge", "Duration of the last full poll"),
+    Family("solarmax_api_requests", "counter", "Requests sent to the inverter"),
+    Family("solarmax_api_errors", "counter", "Failed requests by error kind"),
+    Family(
+        "solarmax_api_request_duration_seconds",
+        "summary",
+        "Duration of requests to the inverter",
+    ),
+    Family(
+        "solarmax_consecutive_failures",
+        "gauge",
+        "Failed polls since the last successful one",
+    ),
+    Family(
+        "solarmax_circuit_breaker_open",
+        "gauge",
+        "Whether polls are suspended by the circuit breaker",
+    ),
+)
+
+# Families of the I/O worker, one sample per gateway
+GATEWAY_FAMILIES = (
+    Family("solarmax_io_queue_depth", "gauge", "Requests waiting for the gateway"),
+    Family("solarmax_io_busy", "gauge", "Whether a request to the gateway is running"),
+    Family(
+        "solarmax_io_queue_wait_seconds",
+        "summary",
+        "Time requests waited for the gateway",
+    ),
+)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: int | float) -> str:
+    """Format a sample value."""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def render_entry(
+    entry_id: str, device_name: str, coordinator: SolarmaxCoordinator
+) -> tuple[str, ...]:
+    """Render the samples of one inverter, one block per family."""
+    labels = f'entry_id="{_escape(entry_id)}",device="{_escape(device_name)}"'
+    blocks: dict[str, list[str]] = {family.name: [] for family in FAMILIES}
+
+    if (snapshot := coordinator.data) is not None:
+        for code, value, raw_value in zip(
+            FIELD_CODES, snapshot.values, snapshot.raw_values
+        ):
+            field_labels = f'{labels},field="{code}"'
+            if isinstance(value, (int, float)):
+                blocks["solarmax_value"].append(
+                    f"solarmax_value{{{field_labels}}} {_number(value)}"
+                )
+            if isinstance(raw_value, (int, float)):
+                blocks["solarmax_raw_value"].append(
+                    f"solarmax_raw_value{{{field_labels}}} {_number(raw_value)}"
+                )
+        if snapshot.sampled_at is not None:
+            blocks["solarmax_sample_timestamp_seconds"].append(
+                f"solarmax_sample_timestamp_seconds{{{labels}}} "
+                f"{_number(snapshot.sampled_at.timestamp())}"
+            )
+        if snapshot.duration is not None:
+            blocks["solarmax_poll_duration_seconds"].append(
+                f"solarmax_poll_duration_seconds{{{labels}}} "
+                f"{_number(snapshot.duration)}"
+            )
+
+    counters = coordinator.request_counters
+    blocks["solarmax_api_requests"].append(
+        f"solarmax_api_requests_total{{{labels}}} {counters.requests}"
+    )
+    blocks["solarmax_api_errors"].extend(
+        f'solarmax_api_errors_total{{{labels},error="{kind}"}} {count}'
+        for kind, count in sorted(counters.errors.items())
+    )
+    blocks["solarmax_api_request_duration_seconds"].extend(
+        (
+            f"solarmax_api_request_duration_seconds_count{{{labels}}} "
+            f"{counters.requests}",
+            f"solarmax_api_request_duration_seconds_sum{{{labels}}} "
+            f"{_number(counters.latency_total)}",
+        )
+    )
+    blocks["solarmax_consecutive_failures"].append(
+        f"solarmax_consecutive_failures{{{labels}}} "
+        f"{coordinator.consecutive_failures}"
+    )
+    blocks["solarmax_circuit_breaker_open"].append(
+        f"solarmax_circuit_breaker_open{{{labels}}} "
+        f"{int(coordinator.breaker.state != STATE_CLOSED)}"
+    )
+
+    return tuple(
+        "".join(f"{line}\n" for line in blocks[family.name]) for family in FAMILIES
+    )
+
+
+def render_gateways(worker: IOWorker) -> tuple[str, ...]:
+    """Render the queue samples of all gateways, one block per family."""
+    depth: list[str] = []
+    busy: list[str] = []
+    wait: list[str] = []
+    for gateway, queue in sorted(worker.queues.items()):
+        labels = f'gateway="{_escape(gateway)}"'
+        depth.append(f"solarmax_io_queue_depth{{{labels}}} {queue.depth}\n")
+        busy.append(f"solarmax_io_busy{{{labels}}} {int(queue.running is not None)}\n")
+        wait.append(
+            f"solarmax_io_queue_wait_seconds_count{{{labels}}} {queue.started}\n"
+            f"solarmax_io_queue_wait_seconds_sum{{{labels}}} "
+            f"{_number(queue.wait_total)}\n"
+        )
+    return "".join(depth), "".join(busy), "".join(wait)
+
+
+class MetricsRenderer:
+    """Render the exposition, re-rendering only inverters that polled since.
+
+    Everything an inverter exports changes only with a request to it, so its
+    blocks are cached by snapshot sequence and request count, and the whole
+    body is reused while no inverter has polled and no queue has changed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty caches."""
+        self._entries: dict[str, tuple[tuple[int, int, int], tuple[str, ...]]] = {}
+        self._body: tuple[Any, bytes] | None = None
+
+    def render(self, entries: list[ConfigEntry], worker: IOWorker | None) -> bytes:
+        """Return the exposition of the given loaded entries and I/O queues."""
+        keys: list[tuple[str, tuple[int, int, int]]] = []
+        blocks: list[tuple[str, ...]] = []
+        for entry in entries:
+            coordinator: SolarmaxCoordinator = entry.runtime_data
+            # A reloaded entry gets a new coordinator with fresh counters
+            key = (
+                id(coordinator),
+                coordinator.data.sequence if coordinator.data is not None else 0,
+                coordinator.request_counters.requests,
+            )
+            cached = self._entries.get(entry.entry_id)
+            if cached is None or cached[0] != key:
+                cached = (
+                    key,
+                    render_entry(
+                        entry.entry_id,
+                        entry.data.get(CONF_DEVICE_NAME, DEFAULT_DEVICE_NAME),
+                        coordinator,
+                    ),
+                )
+                self._entries[entry.entry_id] = cached
+            keys.append((entry.entry_id, key))
+            blocks.append(cached[1])
+
+        body_key = (keys, worker.version if worker is not None else None)
+        if self._body is not None and self._body[0] == body_key:
+            return self._body[1]
+
+        # Forget entries that were removed or unloaded
+        for entry_id in self._entries.keys() - {entry_id for entry_id, _ in keys}:
+            del self._entries[entry_id]
+
+        lines: list[str] = []
+        for index, family in enumerate(FAMILIES):
+            lines.append(f"# TYPE {family.name} {family.type}\n")
+            lines.append(f"# HELP {family.name} {family.help}\n")
+            lines.extend(entry_blocks[index] for entry_blocks in blocks)
+        if worker is not None:
+            for family, block in zip(GATEWAY_FAMILIES, render_gateways(worker)):
+                lines.append(f"# TYPE {family.name} {family.type}\n")
+                lines.append(f"# HELP {family.name} {family.help}\n")
+                lines.append(block)
+        lines.append("# EOF\n")
+
+        body = "".join(lines).encode()
+        self._body = (body_key, body)
+        return body
+
+
+class SolarmaxMetricsView(HomeAssistantView):
+    """Serve the inverters with metrics enabled in OpenMetrics format."""
+
+    url = METRICS_URL
+    name = "api:solarmax:metrics"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        self._renderer = MetricsRenderer()
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the current exposition."""
+        hass = request.app[KEY_HASS]
+        entries = [
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.LOADED
+            and entry.data.get(CONF_EXPOSE_METRICS, DEFAULT_EXPOSE_METRICS)
+        ]
+        return web.Response(
+            body=self._renderer.render(
+                entries, hass.data.get(DOMAIN, {}).get("io_worker")
+            ),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+
+def async_register_metrics_view(hass: HomeAssistant) -> None:
+    """Register the scrape endpoint once, when the first entry enables it."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if domain_data.get("metrics_view"):
+        return
+    if hass.http is None:
+        _LOGGER.warning("Metrics are enabled but the HTTP server is not loaded")
+        return
+    hass.http.register_view(SolarmaxMetricsView())
+    domain_data["metrics_view"] = True
+    _LOGGER.debug("Serving OpenMetrics at %s", METRICS_URL)
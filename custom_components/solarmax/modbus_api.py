@@ -0,0 +1,238 @@
+"""Modbus TCP transport for Solarmax inverters."""
+
+from __future__ import annotations
+
+import logging
+import struct
+import time
+from typing import TYPE_CHECKING, Any
+
+from .breaker import CircuitBreaker
+from .const import DEFAULT_MODBUS_PORT
+from .solarmax_api import (
+    DEFAULT_ADDRESS,
+    SolarmaxAPI,
+    SolarmaxConnectionError,
+    SolarmaxProtocolError,
+    SolarmaxTimeoutError,
+)
+from .tracing import Tracer
+
+if TYPE_CHECKING:
+    from .capture import FrameCapture
+
+_LOGGER = logging.getLogger(__name__)
+
+FUNCTION_READ_INPUT_REGISTERS = 0x04
+
+# Registers per read request allowed by the Modbus specification
+MAX_READ_REGISTERS = 125
+
+# Unused registers read past rather than splitting a block into two requests
+MAX_REGISTER_GAP = 16
+
+# Start address and size in 16-bit words of the input register of every field.
+# Values use the raw units of the MaxTalk fields, so both transports are
+# scaled alike by map_data_value().
+#
+# Provisional: Solarmax has not published a register map for the SP/SMT
+# series, and this layout has not been checked against a real inverter.
+# The field order follows FIELD_MAP_INVERTER, grouped into blocks per
+# measurement kind. Inverters with another layout can pass their own map
+# as ``registers``.
+REGISTER_MAP: dict[str, tuple[int, int]] = {
+    "KDY": (0x00, 2),
+    "KMT": (0x02, 2),
+    "KYR": (0x04, 2),
+    "KT0": (0x06, 2),
+    "PDC": (0x10, 1),
+    "PD01": (0x11, 1),
+    "PD02": (0x12, 1),
+    "UD01": (0x13, 1),
+    "UD02": (0x14, 1),
+    "IDC": (0x15, 1),
+    "ID01": (0x16, 1),
+    "ID02": (0x17, 1),
+    "PAC": (0x20, 1),
+    "UL1": (0x21, 1),
+    "UL2": (0x22, 1),
+    "UL3": (0x23, 1),
+    "IL1": (0x24, 1),
+    "IL2": (0x25, 1),
+    "IL3": (0x26, 1),
+    "CAC": (0x30, 2),
+    "KHR": (0x32, 2),
+    "TKK": (0x34, 1),
+    "SAL": (0x35, 2),
+    "SYS": (0x37, 1),
+}
+
+# MBAP header: transaction id, protocol id, length, unit id
+_HEADER = struct.Struct(">HHHB")
+
+
+def plan_reads(
+    codes: list[str],
+    registers: dict[str, tuple[int, int]] = REGISTER_MAP,
+    max_gap: int = MAX_REGISTER_GAP,
+    max_count: int = MAX_READ_REGISTERS,
+) -> list[tuple[int, int, list[str]]]:
+    """Group fields into the fewest contiguous register reads.
+
+    Returns (start address, register count, field codes) per read. Codes
+    without a register are left out.
+    """
+    reads: list[tuple[int, int, list[str]]] = []
+    for code in sorted(
+        (code for code in codes if code in registers), key=lambda c: registers[c]
+    ):
+        address, words = registers[code]
+        if reads:
+            start, count, fields = reads[-1]
+            end = max(start + count, address + words)
+            if address - (start + count) <= max_gap and end - start <= max_count:
+                reads[-1] = (start, end - start, [*fields, code])
+                continue
+        reads.append((address, words, [code]))
+    return reads
+
+
+class ModbusAPI(SolarmaxAPI):
+    """SolarmaxAPI transport reading input registers over Modbus TCP.
+
+    All requested fields are read with as few block register reads as
+    possible on one connection. Retries, the circuit breaker and tracing
+    work as for MaxTalk.
+    """
+
+    supports_history = False
+
+    def __init__(
+        self,
+        host: str,
+        port: int = DEFAULT_MODBUS_PORT,
+        timeout: int = 10,
+        capture: FrameCapture | None = None,
+        breaker: CircuitBreaker | None = None,
+        tracer: Tracer | None = None,
+        address: int = DEFAULT_ADDRESS,
+        registers: dict[str, tuple[int, int]] | None = None,
+    ):
+        """Initialize the API; the bus address is used as Modbus unit id."""
+        super().__init__(host, port, timeout, capture, breaker, tracer, address)
+        self.registers = registers if registers is not None else REGISTER_MAP
+        self._transaction_id = 0
+
+    def _ping(self, sock: Any, code: str) -> bool:
+        """Read the register of a single field."""
+        address, words = self.registers[code]
+        self.read_input_registers(sock, address, words)
+        return True
+
+    def _read_fields(
+        self, sock: Any, field_map: dict[str, str], deadline: float
+    ) -> dict[str, Any]:
+        """Read the requested fields block by block.
+
+        Blocks answered with a Modbus exception are skipped, so fields a
+        model does not have do not fail the other fields.
+        """
+        data: dict[str, Any] = {}
+        for start, count, codes in plan_reads(list(field_map), self.registers):
+            try:
+                words = self.read_input_registers(sock, start, count)
+            except SolarmaxProtocolError as err:
+                self.tracer.debug(
+                    "Skipping registers %d-%d: %s", start, start + count - 1, err
+                )
+                continue
+            for code in codes:
+                address, size = self.registers[code]
+                raw = 0
+                for word in words[address - start : address - start + size]:
+                    raw = (raw << 16) | word
+                data[code] = {"value": self.map_data_value(code, raw), "raw_value": raw}
+
+        if not data:
+            raise SolarmaxProtocolError("No valid fields in response")
+        return data
+
+    def read_input_registers(self, sock: Any, address: int, count: int) -> list[int]:
+        """Read a block of input registers."""
+        self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+        request = _HEADER.pack(self._transaction_id, 0, 6, self.address) + struct.pack(
+            ">BHH", FUNCTION_READ_INPUT_REGISTERS, address, count
+        )
+        self.tracer.debug("Sending request: %s", request.hex())
+        try:
+            sock.sendall(request)
+        except OSError as err:
+            raise SolarmaxConnectionError(f"Error sending request: {err}") from err
+        if self.capture is not None:
+            self.capture.record(">", request.hex())
+
+        deadline = time.monotonic() + self.timeout
+        header = self._receive(sock, _HEADER.size, deadline)
+        transaction_id, protocol_id, length, unit_id = _HEADER.unpack(header)
+        if length < 2:
+            raise SolarmaxProtocolError(
+                f"Invalid Modbus length {length}", details="length mismatch"
+            )
+        pdu = self._receive(sock, length - 1, deadline)
+        self.tracer.debug("Received response: %s", (header + pdu).hex())
+        if self.capture is not None:
+            self.capture.record("<", (header + pdu).hex())
+
+        if (transaction_id, protocol_id, unit_id) != (
+            self._transaction_id,
+            0,
+            self.address,
+        ):
+            raise SolarmaxProtocolError(
+                f"Response {transaction_id} from unit {unit_id} does not match "
+                f"request {self._transaction_id} to unit {self.address}",
+                details="unexpected response",
+            )
+        if pdu[0] == FUNCTION_READ_INPUT_REGISTERS | 0x80:
+            raise SolarmaxProtocolError(
+                f"Modbus exception {pdu[1] if len(pdu) > 1 else 0} for "
+                f"registers {address}-{address + count - 1}",
+                details="modbus exception",
+            )
+        if pdu[0] != FUNCTION_READ_INPUT_REGISTERS or len(pdu) != 2 + 2 * count:
+            raise SolarmaxProtocolError(
+                f"Malformed response to a read of {count} registers",
+                details="length mismatch",
+            )
+        return list(struct.unpack(f">{count}H", pdu[2:]))
+
+    def _receive(self, sock: Any, size: int, deadline: float) -> bytes:
+        """Receive exactly size bytes before the deadline."""
+        data = b""
+        while len(data) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SolarmaxTimeoutError("No response received within timeout period")
+            sock.settimeout(remaining)
+            try:
+                chunk = sock.recv(size - len(data))
+            except TimeoutError as err:
+                raise SolarmaxTimeoutError("Request/response timeout") from err
+            except OSError as err:
+                raise SolarmaxConnectionError(f"Error receiving data: {err}") from err
+            if not chunk:
+                raise SolarmaxConnectionError("Connection closed by inverter")
+            data += chunk
+        return data
+
+    def exchange(self, request: str) -> str:
+        """Refuse to forward MaxTalk frames, which the inverter does not speak."""
+        raise SolarmaxProtocolError(
+            "MaxTalk frames cannot be forwarded over Modbus", details="not supported"
+        )
+
+    def get_history(self, codes: list[str]) -> dict[str, Any]:
+        """Refuse to read yield history, which Modbus does not provide."""
+        raise SolarmaxProtocolError(
+            "Yield history is not available over Modbus", details="not supported"
+        )
@@ -0,0 +1,196 @@
+"""On-demand profiling of Solarmax poll cycles."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import SolarmaxCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+NOTIFICATION_ID = f"{DOMAIN}_profile"
+
+# Functions listed in the notification
+TOP_FUNCTIONS = 15
+
+
+def summarize_stats(stats: pstats.Stats, limit: int = TOP_FUNCTIONS) -> list[str]:
+    """Return markdown table rows of the functions with the most own time."""
+    rows = sorted(
+        stats.stats.items(),  # type: ignore[attr-defined]
+        key=lambda item: item[1][2],
+        reverse=True,
+    )[:limit]
+    lines = [
+        "| Function | Calls | Own (ms) | Cumulative (ms) |",
+        "|---|---:|---:|---:|",
+    ]
+    for (filename, line, name), (_, calls, own, cumulative, _) in rows:
+        location = f"{os.path.basename(filename)}:{line}" if line else filename
+        lines.append(
+            f"| `{name}` ({location}) | {calls} | {own * 1000:.2f} | "
+            f"{cumulative * 1000:.2f} |"
+        )
+    return lines
+
+
+class RefreshSession(ABC):
+    """Watch the next refreshes of some inverters.
+
+    Coordinators call enter() and exit() around every refresh, entity
+    updates included, until each has done its share; the session finishes
+    once every inverter is done or unloaded. Subclasses report the outcome
+    in _async_finish().
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: list[SolarmaxCoordinator],
+        refreshes: int,
+    ) -> None:
+        """Initialize the session; nothing is watched before attach()."""
+        self._hass = hass
+        self._coordinators = coordinators
+        self._refreshes = refreshes
+        self._remaining: dict[int, int] = {}
+        self._completed = 0
+        self.finished: asyncio.Future[Any] = hass.loop.create_future()
+
+    def attach(self) -> None:
+        """Attach the session to its inverters."""
+        for coordinator in self._coordinators:
+            self._remaining[id(coordinator)] = self._refreshes
+            coordinator.attach_refresh_session(self)
+
+    def enter(self) -> None:
+        """Handle the start of a refresh."""
+
+    def exit(self, coordinator: SolarmaxCoordinator) -> bool:
+        """Count a finished refresh; return if the inverter is done."""
+        if id(coordinator) not in self._remaining:
+            # Detached while the refresh ran
+            return True
+        self._completed += 1
+        self._remaining[id(coordinator)] -= 1
+        if self._remaining[id(coordinator)] > 0:
+            return False
+        self.detach(coordinator)
+        return True
+
+    def detach(self, coordinator: SolarmaxCoordinator) -> None:
+        """Stop watching an inverter, finishing once all are done."""
+        if self._remaining.pop(id(coordinator), None) is None or self._remaining:
+            return
+        self._hass.async_create_background_task(
+            self._async_finish(), f"{DOMAIN}_{type(self).__name__}_finish"
+        )
+
+    @abstractmethod
+    async def _async_finish(self) -> None:
+        """Report the outcome and resolve finished."""
+
+
+class ProfileSession(RefreshSession):
+    """Profile the next refreshes of some inverters, including entity updates.
+
+    cProfile records the event loop thread while any of the refreshes runs,
+    so work of other integrations interleaving with a poll shows up too.
+    Refreshes overlapping in time share one enabled profiler.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: list[SolarmaxCoordinator],
+        refreshes: int,
+    ) -> None:
+        """Initialize the session; nothing is recorded before attach()."""
+        super().__init__(hass, coordinators, refreshes)
+        self._profile = cProfile.Profile()
+        self._running = 0
+        self._profiled_time = 0.0
+        self._entered_at = 0.0
+        self.path = hass.config.path(
+            f"{DOMAIN}_profile_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.prof"
+        )
+        # Resolves to the stats file, or None if there is none
+        self.finished: asyncio.Future[str | None] = hass.loop.create_future()
+
+    def attach(self) -> None:
+        """Attach the session to its inverters."""
+        super().attach()
+        _LOGGER.info(
+            "Profiling the next %d refreshes of %d inverters",
+            self._refreshes,
+            len(self._coordinators),
+        )
+
+    def enter(self) -> None:
+        """Start recording for a refresh."""
+        if self._running == 0:
+            self._entered_at = time.perf_counter()
+            self._profile.enable()
+        self._running += 1
+
+    def exit(self, coordinator: SolarmaxCoordinator) -> bool:
+        """Stop recording for a refresh; return if the inverter is done."""
+        self._running -= 1
+        if self._running == 0:
+            self._profile.disable()
+            self._profiled_time += time.perf_counter() - self._entered_at
+        return super().exit(coordinator)
+
+    async def _async_finish(self) -> None:
+        """Write the stats file and post the summary."""
+        if not self._completed:
+            # Every inverter was unloaded before its first refresh
+            _LOGGER.info("Profile finished without any refresh")
+            self.finished.set_result(None)
+            return
+
+        try:
+            rows = await self._hass.async_add_executor_job(self._write_stats)
+        except OSError as err:
+            _LOGGER.error("Failed to write profile to %s: %s", self.path, err)
+            self.finished.set_result(None)
+            return
+
+        message = "\n".join(
+            (
+                f"Profiled {self._refreshes} refreshes of "
+                f"{len(self._coordinators)} inverters, "
+                f"{self._profiled_time:.2f} s in total.",
+                "",
+                f"Stats written to `{self.path}`.",
+                "",
+                *rows,
+            )
+        )
+        persistent_notification.async_create(
+            self._hass,
+            message,
+            title="Solarmax profile",
+            notification_id=NOTIFICATION_ID,
+        )
+        _LOGGER.info("Profile written to %s", self.path)
+        self.finished.set_result(self.path)
+
+    def _write_stats(self) -> list[str]:
+        """Dump the stats file and summarize it."""
+        self._profile.dump_stats(self.path)
+        return summarize_stats(pstats.Stats(self._profile))
@@ -0,0 +1,217 @@
+"""MaxTalk proxy sharing one inverter connection between many clients."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import TYPE_CHECKING, Any
+
+from .const import DEFAULT_PROXY_HOST, DEFAULT_PROXY_MAX_AGE
+from .solarmax_api import (
+    MAX_FRAME_LENGTH,
+    SolarmaxConnectionError,
+    SolarmaxProtocolError,
+    SolarmaxTimeoutError,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import SolarmaxCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds the connection for forwarded frames stays open without frames
+UPSTREAM_IDLE_TIMEOUT = 5.0
+
+# Fields the snapshot does not keep in full: SYS answers "status,detail"
+# and only the status code is polled, so these are always forwarded
+_FORWARDED_CODES = frozenset({"SYS"})
+
+# Request frame "{src;dst;length|64:codes|CCCC}"
+_REQUEST = re.compile(
+    r"\{([0-9A-Fa-f]{2});([0-9A-Fa-f]{2});([0-9A-Fa-f]{2})\|64:([^|]*)\|"
+    r"([0-9A-Fa-f]{4})\}"
+)
+
+
+class MaxTalkProxy:
+    """Serve MaxTalk clients such as the vendor's PC tools next to the poller.
+
+    The inverter accepts a single TCP client. Requests for polled fields
+    are answered from the latest values while they are fresh enough; all
+    other requests, and those for the status with its detail code, are
+    forwarded in turn with the integration's own polls
+    through the inverter's I/O queue, over one connection that is kept open
+    while clients keep sending frames. The proxy only listens on the local
+    host unless another address is given.
+    """
+
+    def __init__(
+        self,
+        coordinator: SolarmaxCoordinator,
+        port: int,
+        host: str = DEFAULT_PROXY_HOST,
+        max_age: float = DEFAULT_PROXY_MAX_AGE,
+    ) -> None:
+        """Initialize the proxy; nothing listens before async_start()."""
+        self._coordinator = coordinator
+        self._host = host
+        self._port = port
+        self._max_age = max_age
+        self._server: asyncio.Server | None = None
+        self._clients: dict[asyncio.StreamWriter, asyncio.Task[Any]] = {}
+        self._release_timer: asyncio.TimerHandle | None = None
+        self.answered = 0
+        self.forwarded = 0
+        self.failed = 0
+
+    @property
+    def port(self) -> int:
+        """Return the port the proxy listens on."""
+        if self._server is not None and self._server.sockets:
+            return self._server.sockets[0].getsockname()[1]
+        return self._port
+
+    async def async_start(self) -> None:
+        """Start listening; raises OSError if the port is taken."""
+        self._server = await asyncio.start_server(
+            self._handle_client, self._host, self._port
+        )
+        _LOGGER.info(
+            "MaxTalk proxy for %s listening on %s port %d",
+            self._coordinator.api.endpoint,
+            self._host,
+            self.port,
+        )
+
+    async def async_stop(self) -> None:
+        """Stop listening, disconnect all clients and release the inverter."""
+        if self._server is not None:
+            self._server.close()
+            # Handlers end at the end of the stream, after a forward in progress
+            for writer in list(self._clients):
+                writer.close()
+            await asyncio.gather(*self._clients.values(), return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self._release_timer is not None:
+            self._release_timer.cancel()
+            self._release_timer = None
+            await self._coordinator.async_run_io(self._coordinator.api.close)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the frames of one client until it disconnects."""
+        self._clients[writer] = asyncio.current_task()  # type: ignore[assignment]
+        peer = writer.get_extra_info("peername")
+        _LOGGER.debug("MaxTalk client %s connected", peer)
+        try:
+            while True:
+                frame = await reader.readuntil(b"}")
+                if len(frame) > MAX_FRAME_LENGTH:
+                    _LOGGER.debug("Dropping oversized frame from %s", peer)
+                    continue
+                response = await self.async_answer(
+                    frame.decode("ascii", errors="ignore")
+                )
+                if response is not None:
+                    writer.write(response.encode("ascii"))
+                    await writer.drain()
+        except (
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            ConnectionError,
+        ):
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+            _LOGGER.debug("MaxTalk client %s disconnected", peer)
+
+    async def async_answer(self, frame: str) -> str | None:
+        """Return the response to a request frame, or None if there is none.
+
+        Like the inverter, the proxy does not answer broken frames; clients
+        time out and try again.
+        """
+        request = _REQUEST.fullmatch(frame[frame.rfind("{") :])
+        if request is None:
+            _LOGGER.debug("Ignoring malformed frame %s", frame)
+            return None
+        body = request.group(0)[1:-5]
+        api = self._coordinator.api
+        if int(request.group(3), 16) != len(request.group(0)) or (
+            request.group(5).upper() != api.calculate_checksum(body)
+        ):
+            _LOGGER.debug("Ignoring corrupt frame %s", frame)
+            return None
+
+        if int(request.group(2), 16) == api.address:
+            values = self._cached_values(request.group(4).split(";"))
+            if values is not None:
+                response = api.build_response(values)
+                # The response repeats every code with its value, so the
+                # answer to a long request may not fit into a single frame
+                if len(response) <= MAX_FRAME_LENGTH:
+                    self.answered += 1
+                    return response
+
+        self.forwarded += 1
+        try:
+            response = await self._coordinator.async_run_io(
+                api.exchange, request.group(0)
+            )
+        except (
+            SolarmaxConnectionError,
+            SolarmaxTimeoutError,
+            SolarmaxProtocolError,
+        ) as err:
+            self.failed += 1
+            _LOGGER.debug("Failed to forward %s: %s", request.group(0), err)
+            return None
+        self._schedule_release()
+        return response
+
+    def _schedule_release(self) -> None:
+        """Close the forwarding connection once clients stop sending frames."""
+        if self._release_timer is not None:
+            self._release_timer.cancel()
+        self._release_timer = self._coordinator.hass.loop.call_later(
+            UPSTREAM_IDLE_TIMEOUT, self._release
+        )
+
+    def _release(self) -> None:
+        """Close the forwarding connection in turn with the inverter's I/O."""
+        self._release_timer = None
+        self._coordinator.hass.async_create_task(
+            self._coordinator.async_run_io(self._coordinator.api.close)
+        )
+
+    def _cached_values(self, codes: list[str]) -> dict[str, str] | None:
+        """Return the latest raw values of all codes, if all are fresh."""
+        snapshot = self._coordinator.data
+        if snapshot is None:
+            return None
+        values: dict[str, str] = {}
+        for code in codes:
+            if code in _FORWARDED_CODES:
+                return None
+            raw = snapshot.raw(code)
+            age = self._coordinator.field_age(code)
+            if raw is None or age is None or age > self._max_age:
+                return None
+            # Oversampled measurements are averaged, frames carry integers
+            values[code] = format(round(raw), "X")  # type: ignore[arg-type]
+        return values
+
+    def stats(self) -> dict[str, Any]:
+        """Return the counters for the diagnostics."""
+        return {
+            "host": self._host,
+            "port": self.port,
+            "clients": len(self._clients),
+            "answered": self.answered,
+            "forwarded": self.forwarded,
+            "failed": self.failed,
+        }
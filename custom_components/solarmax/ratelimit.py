@@ -0,0 +1,53 @@
+"""Request rate limiting for Solarmax gateways."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Token bucket enforcing a minimum spacing between requests.
+
+    A bucket with a capacity of one token and a refill rate of
+    ``1 / min_spacing`` tokens per second allows at most one request every
+    ``min_spacing`` seconds, which is what a single-client inverter gateway
+    can handle.
+    """
+
+    def __init__(self, min_spacing: float, capacity: int = 1) -> None:
+        """Initialize the bucket full."""
+        self.min_spacing = min_spacing
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        if self.min_spacing > 0:
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) / self.min_spacing,
+            )
+        else:
+            self._tokens = float(self.capacity)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, without waiting."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def async_acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) * self.min_spacing)
+                self._refill()
+            self._tokens = max(self._tokens - 1, 0.0)
@@ -7,8 +7,11 @@ from typing import Any
 
 from homeassistant import data_entry_flow
 from homeassistant.components.repairs import ConfirmRepairFlow, RepairsFlow
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
 
+from .const import DOMAIN
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -40,6 +43,7 @@ class SolarmaxConnectionRepairFlow(RepairsFlow):
                 "host": self.data.get("host", "unknown"),
                 "port": str(self.data.get("port", "unknown")),
                 "failures": str(self.data.get("failures", 0)),
+                "state": self.data.get("breaker_state", "unknown"),
             },
         )
 
@@ -75,6 +79,18 @@ class SolarmaxConfigurationRepairFlow(RepairsFlow):
         )
 
 
+def _with_breaker_state(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
+    """Add the live circuit breaker state of the affected inverter."""
+    entry = hass.config_entries.async_get_entry(data.get("entry_id", ""))
+    if entry is None or entry.domain != DOMAIN:
+        return data
+    if entry.state is not ConfigEntryState.LOADED:
+        return data
+
+    breaker = entry.runtime_data.breaker.as_dict()
+    return {**data, "failures": breaker["failures"], "breaker_state": breaker["state"]}
+
+
 async def async_create_fix_flow(
     hass: HomeAssistant,
     issue_id: str,
@@ -82,7 +98,7 @@ async def async_create_fix_flow(
 ) -> RepairsFlow:
     """Create flow."""
     if issue_id.startswith("connection_issues"):
-        return SolarmaxConnectionRepairFlow(data or {})
+        return SolarmaxConnectionRepairFlow(_with_breaker_state(hass, data or {}))
     elif issue_id.startswith("configuration_issue"):
         return SolarmaxConfigurationRepairFlow(data or {})
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from datetime import datetime
 from typing import Any
 
@@ -11,20 +12,27 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import generate_entity_id
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util
 
 from .const import (
+    AGGREGATE_SENSOR_TYPES,
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_MAX_AGE,
+    CONF_DEADBAND_RELATIVE,
+    CONF_DEADBANDS,
     CONF_DEVICE_NAME,
     CONF_HOST,
     CONF_PORT,
+    DEADBAND_SENSORS,
+    DEFAULT_DEADBAND_MAX_AGE,
     DOMAIN,
     SENSOR_TYPES,
 )
 from .coordinator import SolarmaxCoordinator
+from .statistics_import import IMPORTED_FIELDS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,8 +51,12 @@ async def async_setup_entry(
     entities = []
     device_name = entry.data.get(CONF_DEVICE_NAME, "Solarmax Inverter")
 
+    sensor_types = dict(SENSOR_TYPES)
+    if coordinator.is_aggregating:
+        sensor_types.update(AGGREGATE_SENSOR_TYPES)
+
     # Create sensors for all available data types
-    for sensor_key, sensor_config in SENSOR_TYPES.items():
+    for sensor_key, sensor_config in sensor_types.items():
         entities.append(
             SolarmaxSensor(
                 coordinator=coordinator,
@@ -61,6 +73,10 @@ async def async_setup_entry(
 class SolarmaxSensor(CoordinatorEntity[SolarmaxCoordinator], SensorEntity):
     """Representation of a Solarmax sensor."""
 
+    # Diagnostic attributes change with nearly every poll; keep them out of
+    # the recorder so they don't produce a new attributes row each time
+    _unrecorded_attributes = frozenset({"raw_value", "age"})
+
     def __init__(
         self,
         coordinator: SolarmaxCoordinator,
@@ -75,6 +91,10 @@ class SolarmaxSensor(CoordinatorEntity[SolarmaxCoordinator], SensorEntity):
         self.sensor_key = sensor_key
         self.sensor_config = sensor_config
 
+        # Aggregate sensors read a statistic of another field
+        self._data_key = sensor_config.get("source", sensor_key)
+        self._statistic = sensor_config.get("statistic", "value")
+
         # Create unique ID following HA guidelines:
         # Since we don't have access to physical device identifiers (serial number, MAC, etc.),
         # we use the Config Entry ID as "last resort" per HA documentation
@@ -137,7 +157,10 @@ class SolarmaxSensor(CoordinatorEntity[SolarmaxCoordinator], SensorEntity):
             self._attr_native_unit_of_measurement = sensor_config["unit"]
         if "device_class" in sensor_config:
             self._attr_device_class = sensor_config["device_class"]
-        if "state_class" in sensor_config:
+        # Imported hourly statistics replace those compiled from the states
+        if "state_class" in sensor_config and not (
+            coordinator.imports_statistics and sensor_key in IMPORTED_FIELDS
+        ):
             self._attr_state_class = sensor_config["state_class"]
         if "icon" in sensor_config:
             self._attr_icon = sensor_config["icon"]
@@ -151,26 +174,56 @@ class SolarmaxSensor(CoordinatorEntity[SolarmaxCoordinator], SensorEntity):
             "sw_version": "1.0.0",
         }
 
-    def _is_night_time(self) -> bool:
-        """Check if it's currently night time (between sunset and sunrise)."""
-        try:
-            now = dt_util.now()
+        # Optional deadband: only publish changes larger than the threshold,
+        # but at least every max_age seconds. Status and alarm codes are
+        # not measurements, every change of them is published.
+        self._deadband: dict[str, float] | None = None
+        if sensor_key in DEADBAND_SENSORS:
+            self._deadband = entry.data.get(CONF_DEADBANDS, {}).get(sensor_key)
+        self._published_value: str | int | float | None = None
+        self._published_at: float | None = None
+        if self._deadband is not None:
+            self._published_value = self._current_value()
+            self._published_at = time.monotonic()
+
+    def _current_value(self) -> str | int | float | None:
+        """Return the latest value reported by the coordinator."""
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.statistic(self._data_key, self._statistic)
 
-            # Get sun component if available
-            sun_component = self.hass.states.get("sun.sun")
-            if sun_component:
-                # If we have the sun component, use its state
-                return sun_component.state == "below_horizon"
+    def _within_deadband(self, value: str | int | float | None) -> bool:
+        """Return True if a new value is too close to the published one."""
+        last = self._published_value
+        if not isinstance(value, (int, float)) or not isinstance(last, (int, float)):
+            return False
 
-            # Fallback: simple time-based check (between 20:00 and 06:00)
-            current_hour = now.hour
-            return current_hour >= 20 or current_hour < 6
+        max_age = self._deadband.get(CONF_DEADBAND_MAX_AGE, DEFAULT_DEADBAND_MAX_AGE)
+        if self._published_at is None or (
+            time.monotonic() - self._published_at >= max_age
+        ):
+            return False
+
+        delta = abs(value - last)
+        absolute = self._deadband.get(CONF_DEADBAND_ABSOLUTE, 0)
+        relative = self._deadband.get(CONF_DEADBAND_RELATIVE, 0)
+        if absolute and delta >= absolute:
+            return False
+        if relative and delta >= abs(last) * relative / 100:
+            return False
+        return bool(absolute or relative)
 
-        except Exception as e:
-            _LOGGER.debug(f"Error checking night time: {e}")
-            # Fallback: simple time-based check
-            current_hour = dt_util.now().hour
-            return current_hour >= 20 or current_hour < 6
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data, holding back changes inside the deadband."""
+        if self._deadband is not None:
+            value = self._current_value()
+            if self.coordinator.last_update_success and self._within_deadband(value):
+                return
+            self._published_value = value
+            self._published_at = time.monotonic()
+
+        super()._handle_coordinator_update()
 
     @property
     def translation_key(self) -> str:
@@ -180,42 +233,13 @@ class SolarmaxSensor(CoordinatorEntity[SolarmaxCoordinator], SensorEntity):
     @property
     def native_value(self) -> str | int | float | None:
         """Return the state of the sensor."""
-        # Special handling for SYS sensor when coordinator update fails
-        if not self.coordinator.last_update_success and self.sensor_key == "SYS":
-            # Check if this is expected offline vs unexpected failure
-            if (
-                hasattr(self.coordinator, "is_expected_offline")
-                and self.coordinator.is_expected_offline
-            ):
-                if self._language == "en":
-                    return "Offline (Night)"
-                else:
-                    return "Offline (Nacht)"
-            else:
-                # Unexpected failure during day
-                if hasattr(self.coordinator, "consecutive_failures"):
-                    failures = self.coordinator.consecutive_failures
-                    if failures > 1:
-                        if self._language == "en":
-                            return f"Connection Failed ({failures})"
-                        else:
-                            return f"Verbindung fehlgeschlagen ({failures})"
-
-                # Single failure or fallback
-                if self._language == "en":
-                    return "Connection Failed"
-                else:
-                    return "Verbindung fehlgeschlagen"
-
-        if not self.coordinator.data:
-            return None
-
-        sensor_data = self.coordinator.data.get(self.sensor_key)
-        if sensor_data is None:
+        if self._deadband is not None:
+            value = self._published_value
+        else:
+            value = self._current_value()
+        if value is None:
             return None
 
-        value = sensor_data.get("value")
-
         # Translate status and alarm codes inline (no file I/O, non-blocking)
         if self.sensor_key == "SYS" and isinstance(value, int):
             status_translations = {
@@ -255,111 +279,32 @@ class SolarmaxSensor(CoordinatorEntity[SolarmaxCoordinator], SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
         """Return additional state attributes."""
-        # Special handling for SYS sensor when coordinator update fails
-        if not self.coordinator.last_update_success and self.sensor_key == "SYS":
-            attributes = {
-                "raw_value": "offline",
-                "code": "offline",
-            }
-
-            # Add diagnostic information
-            if hasattr(self.coordinator, "consecutive_failures"):
-                attributes["consecutive_failures"] = (
-                    self.coordinator.consecutive_failures
-                )
-
-            if hasattr(self.coordinator, "is_expected_offline"):
-                attributes["expected_offline"] = self.coordinator.is_expected_offline
-
-            if (
-                hasattr(self.coordinator, "last_successful_update")
-                and self.coordinator.last_successful_update
-            ):
-                attributes["last_successful_update"] = (
-                    self.coordinator.last_successful_update.isoformat()
-                )
-
-            # Add last API connection time if available
-            if (
-                hasattr(self.coordinator.api, "last_successful_connection")
-                and self.coordinator.api.last_successful_connection
-            ):
-                attributes["last_api_connection"] = (
-                    self.coordinator.api.last_successful_connection.isoformat()
-                )
-
-            return attributes
-
-        if not self.coordinator.data:
+        snapshot = self.coordinator.data
+        if snapshot is None or self._statistic != "value":
             return None
-
-        sensor_data = self.coordinator.data.get(self.sensor_key)
-        if sensor_data is None:
+        if self.sensor_key not in snapshot:
             return None
 
-        attributes = {}
-        if "raw_value" in sensor_data:
-            attributes["raw_value"] = sensor_data["raw_value"]
+        attributes = {"raw_value": snapshot.raw(self.sensor_key)}
 
         # For status and alarm sensors, add the raw numeric code as an attribute
-        value = sensor_data.get("value")
+        value = snapshot.value(self.sensor_key)
         if self.sensor_key in ["SYS", "SAL"] and isinstance(value, int):
             attributes["code"] = value
 
-        # Add connection health information for diagnostic purposes
-        if self.sensor_key == "SYS":
-            if hasattr(self.coordinator, "consecutive_failures"):
-                attributes["consecutive_failures"] = (
-                    self.coordinator.consecutive_failures
-                )
-
-            if (
-                hasattr(self.coordinator, "last_successful_update")
-                and self.coordinator.last_successful_update
-            ):
-                attributes["last_successful_update"] = (
-                    self.coordinator.last_successful_update.isoformat()
-                )
+        # Age of a last good value served while polls fail or miss the field
+        age = self.coordinator.field_age(self.sensor_key)
+        if age is not None and age >= self.coordinator.field_read_interval(
+            self.sensor_key
+        ):
+            attributes["age"] = round(age)
 
         return attributes
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        # Always consider the coordinator's last update success first
-        if self.coordinator.last_update_success:
-            return True
-
-        # Check if the coordinator indicates this is an expected offline state
-        if (
-            hasattr(self.coordinator, "is_expected_offline")
-            and self.coordinator.is_expected_offline
-        ):
-            # For SYS (status) sensor, always remain available to show offline status
-            if self.sensor_key == "SYS":
-                return True
-            # For other sensors during expected offline periods, become unavailable
-            return False
-
-        # Check if it's night time for backward compatibility
-        is_night = self._is_night_time()
-
-        # For SYS (status) sensor, always remain available to show offline status
-        if self.sensor_key == "SYS":
-            return True
-
-        # For all other sensors during night time, become unavailable
-        # when inverter is not reachable (expected behavior)
-        if is_night:
-            return False
-
-        # During day time, check consecutive failures
-        if hasattr(self.coordinator, "consecutive_failures"):
-            # If we have many consecutive failures during day, sensors become unavailable
-            # This helps indicate there's a real problem vs temporary network hiccup
-            if self.coordinator.consecutive_failures > 5:
-                return False
-
-        # During day time, if coordinator update failed, still show as available
-        # but sensors will show their last known values or None
-        return True
+        # Keep serving the last good value until the field's next read is
+        # overdue by more than the staleness window, whether polls fail or
+        # just skip the field, instead of flapping with every missed read
+        return self.coordinator.is_field_fresh(self._data_key)
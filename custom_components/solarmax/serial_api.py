@@ -0,0 +1,135 @@
+"""Direct RS485 transport for Solarmax inverters."""
+
+from __future__ import annotations
+
+import errno
+import os
+import select
+import socket
+import termios
+import time
+from typing import TYPE_CHECKING, Any
+
+from .breaker import CircuitBreaker
+from .const import DEFAULT_ADDRESS, DEFAULT_BAUDRATE, DEFAULT_FRAME_GAP
+from .solarmax_api import SolarmaxAPI, SolarmaxConnectionError
+from .tracing import Tracer
+
+if TYPE_CHECKING:
+    from .capture import FrameCapture
+
+BAUDRATES = (1200, 2400, 4800, 9600, 19200, 38400, 57600, 115200)
+
+# When each serial device may carry the next request; shared by all
+# inverters on a bus, whose requests the I/O worker already serializes
+_bus_idle_at: dict[str, float] = {}
+
+
+class SerialPort:
+    """Socket-like access to a serial device in raw 8N1 mode."""
+
+    def __init__(self, device: str, baudrate: int) -> None:
+        """Open and configure the device."""
+        self._fd = os.open(device, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            speed = getattr(termios, f"B{baudrate}")
+            cc = termios.tcgetattr(self._fd)[6]
+            cc[termios.VMIN] = 0
+            cc[termios.VTIME] = 0
+            # iflag, oflag, cflag, lflag, ispeed, ospeed, cc: no processing
+            cflag = termios.CS8 | termios.CREAD | termios.CLOCAL
+            termios.tcsetattr(
+                self._fd, termios.TCSANOW, [0, 0, cflag, 0, speed, speed, cc]
+            )
+            termios.tcflush(self._fd, termios.TCIOFLUSH)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._timeout: float | None = None
+
+    def settimeout(self, timeout: float | None) -> None:
+        """Set the timeout of recv()."""
+        self._timeout = timeout
+
+    def send(self, data: bytes) -> int:
+        """Write a frame, dropping stale input and waiting until it is sent."""
+        termios.tcflush(self._fd, termios.TCIFLUSH)
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(self._fd, view)
+            except BlockingIOError:
+                select.select([], [self._fd], [], self._timeout)
+                continue
+            view = view[written:]
+        try:
+            # Half-duplex: the answer may only be read once the frame is out
+            termios.tcdrain(self._fd)
+        except termios.error:
+            pass
+        return len(data)
+
+    def recv(self, size: int) -> bytes:
+        """Read what has arrived, waiting up to the timeout for anything."""
+        readable, _, _ = select.select([self._fd], [], [], self._timeout)
+        if not readable:
+            raise socket.timeout("timed out")
+        try:
+            return os.read(self._fd, size)
+        except BlockingIOError:
+            return b""
+        except OSError as err:
+            if err.errno == errno.EIO:
+                # The other end of a pseudo-terminal was closed
+                return b""
+            raise
+
+    def close(self) -> None:
+        """Close the device."""
+        os.close(self._fd)
+
+
+class SerialAPI(SolarmaxAPI):
+    """SolarmaxAPI transport speaking MaxTalk over a local RS485 adapter.
+
+    The host is the serial device and there is no port; several inverters on
+    one bus are told apart by their bus address. Requests keep a quiet gap of
+    ``frame_gap`` seconds on the bus after every response.
+    """
+
+    def __init__(
+        self,
+        device: str,
+        baudrate: int = DEFAULT_BAUDRATE,
+        address: int = DEFAULT_ADDRESS,
+        frame_gap: float = DEFAULT_FRAME_GAP / 1000,
+        timeout: int = 10,
+        capture: FrameCapture | None = None,
+        breaker: CircuitBreaker | None = None,
+        tracer: Tracer | None = None,
+    ):
+        """Initialize the API."""
+        super().__init__(device, None, timeout, capture, breaker, tracer, address)
+        self.baudrate = baudrate
+        self.frame_gap = frame_gap
+
+    def _create_socket_connection(self, retries: int = 3) -> Any:
+        """Open the serial device."""
+        try:
+            port = SerialPort(self.host, self.baudrate)
+        except (OSError, termios.error, AttributeError) as err:
+            self.tracer.error("Failed to open %s: %s", self.host, err)
+            raise SolarmaxConnectionError(
+                f"Failed to open serial device {self.host}: {err}"
+            ) from err
+        self.tracer.debug("Opened %s at %d baud", self.host, self.baudrate)
+        return port
+
+    def _send_request_and_receive_response(self, sock: Any, request: str) -> str:
+        """Exchange a frame, keeping the bus quiet between frames."""
+        if (wait := _bus_idle_at.get(self.host, 0) - time.monotonic()) > 0:
+            time.sleep(wait)
+        try:
+            return super()._send_request_and_receive_response(sock, request)
+        finally:
+            _bus_idle_at[self.host] = time.monotonic() + self.frame_gap
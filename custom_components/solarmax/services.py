@@ -0,0 +1,147 @@
+"""Services for the Solarmax integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_GROUP,
+    ATTR_POLLS,
+    ATTR_REFRESHES,
+    DEFAULT_PROFILE_REFRESHES,
+    DEFAULT_TRACE_MEMORY_POLLS,
+    DOMAIN,
+    MAX_PROFILE_REFRESHES,
+    MAX_TRACE_MEMORY_POLLS,
+    SERVICE_PROFILE,
+    SERVICE_REFRESH,
+    SERVICE_TRACE_MEMORY,
+)
+from .coordinator import SolarmaxCoordinator
+from .memory import MemorySession
+from .profiler import ProfileSession
+from .solarmax_api import FIELD_GROUPS
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_GROUP): vol.In(list(FIELD_GROUPS)),
+    }
+)
+
+SERVICE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_REFRESHES, default=DEFAULT_PROFILE_REFRESHES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PROFILE_REFRESHES)
+        ),
+    }
+)
+
+SERVICE_TRACE_MEMORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_POLLS, default=DEFAULT_TRACE_MEMORY_POLLS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_TRACE_MEMORY_POLLS)
+        ),
+    }
+)
+
+
+def _get_coordinators(
+    hass: HomeAssistant, entry_id: str | None
+) -> list[SolarmaxCoordinator]:
+    """Return the coordinators targeted by a service call."""
+    if entry_id is None:
+        return [
+            entry.runtime_data
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.LOADED
+        ]
+
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(f"Unknown Solarmax config entry: {entry_id}")
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(f"Solarmax config entry {entry_id} is not loaded")
+    return [entry.runtime_data]
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Solarmax services."""
+
+    async def async_handle_refresh(call: ServiceCall) -> None:
+        """Refresh one or all inverters on demand."""
+        coordinators = _get_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        group = call.data.get(ATTR_GROUP)
+
+        results = await asyncio.gather(
+            *(coordinator.async_refresh_fields(group) for coordinator in coordinators),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        for error in errors:
+            _LOGGER.debug("On-demand refresh failed: %s", error)
+        if errors and len(errors) == len(results):
+            raise HomeAssistantError(
+                f"Failed to refresh inverter: {errors[0]}"
+            ) from errors[0]
+
+    async def async_handle_profile(call: ServiceCall) -> None:
+        """Profile the next refreshes of one or all inverters."""
+        coordinators = _get_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        if not coordinators:
+            raise ServiceValidationError("No Solarmax inverter is loaded")
+
+        domain_data = hass.data.setdefault(DOMAIN, {})
+        session: ProfileSession | None = domain_data.get("profile_session")
+        if session is not None and not session.finished.done():
+            raise ServiceValidationError("A Solarmax profile is already running")
+
+        session = ProfileSession(hass, coordinators, call.data[ATTR_REFRESHES])
+        domain_data["profile_session"] = session
+        session.attach()
+
+    async def async_handle_trace_memory(call: ServiceCall) -> None:
+        """Diff memory snapshots around the next polls of one or all inverters."""
+        coordinators = _get_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        if not coordinators:
+            raise ServiceValidationError("No Solarmax inverter is loaded")
+
+        domain_data = hass.data.setdefault(DOMAIN, {})
+        session: MemorySession | None = domain_data.get("memory_session")
+        if session is not None and not session.finished.done():
+            raise ServiceValidationError("A Solarmax memory trace is already running")
+
+        session = MemorySession(hass, coordinators, call.data[ATTR_POLLS])
+        domain_data["memory_session"] = session
+        await session.async_start()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        async_handle_refresh,
+        schema=SERVICE_REFRESH_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_handle_profile,
+        schema=SERVICE_PROFILE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_TRACE_MEMORY,
+        async_handle_trace_memory,
+        schema=SERVICE_TRACE_MEMORY_SCHEMA,
+    )
@@ -0,0 +1,136 @@
+"""Immutable per-poll snapshots of Solarmax inverter data."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any
+
+from .solarmax_api import FIELD_MAP_INVERTER
+
+# Every field has a fixed slot, so lookups are a dict hit plus a tuple index
+FIELD_CODES: tuple[str, ...] = tuple(FIELD_MAP_INVERTER)
+FIELD_INDEX: dict[str, int] = {code: index for index, code in enumerate(FIELD_CODES)}
+
+# Window statistics of aggregated fields, in slot order
+STATISTICS = ("min", "max", "samples")
+
+Value = str | int | float | None
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """Inverter data of one published poll.
+
+    Scaled and raw values live in two tuples indexed by FIELD_INDEX, with
+    None for fields the poll did not return. Snapshots compare equal when
+    their values are equal, regardless of when they were taken, so the
+    coordinator does not notify entities about unchanged data.
+    """
+
+    values: tuple[Value, ...]
+    raw_values: tuple[Value, ...]
+    # Field code -> (min, max, samples) of oversampled measurements
+    statistics: Mapping[str, tuple[float, float, int]] = field(default_factory=dict)
+    sequence: int = field(default=0, compare=False)
+    sampled_at: datetime | None = field(default=None, compare=False)
+    duration: float | None = field(default=None, compare=False)
+
+    @classmethod
+    def from_data(
+        cls,
+        data: Mapping[str, Mapping[str, Any]],
+        sequence: int = 0,
+        sampled_at: datetime | None = None,
+        duration: float | None = None,
+    ) -> Snapshot:
+        """Build a snapshot from the field dicts returned by the API."""
+        values: list[Value] = [None] * len(FIELD_CODES)
+        raw_values: list[Value] = [None] * len(FIELD_CODES)
+        statistics: dict[str, tuple[float, float, int]] = {}
+
+        for code, sample in data.items():
+            index = FIELD_INDEX.get(code)
+            if index is None:
+                continue
+            values[index] = sample.get("value")
+            raw_values[index] = sample.get("raw_value")
+            if "samples" in sample:
+                statistics[code] = (sample["min"], sample["max"], sample["samples"])
+
+        return cls(
+            tuple(values),
+            tuple(raw_values),
+            MappingProxyType(statistics),
+            sequence,
+            sampled_at,
+            duration,
+        )
+
+    def __contains__(self, code: object) -> bool:
+        """Return if the poll returned a field."""
+        index = FIELD_INDEX.get(code)  # type: ignore[arg-type]
+        return index is not None and self.raw_values[index] is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the codes of all returned fields."""
+        return (
+            code
+            for code, raw_value in zip(FIELD_CODES, self.raw_values)
+            if raw_value is not None
+        )
+
+    def __len__(self) -> int:
+        """Return the number of returned fields."""
+        return sum(raw_value is not None for raw_value in self.raw_values)
+
+    def value(self, code: str) -> Value:
+        """Return the scaled value of a field."""
+        index = FIELD_INDEX.get(code)
+        return None if index is None else self.values[index]
+
+    def raw(self, code: str) -> Value:
+        """Return the raw value of a field."""
+        index = FIELD_INDEX.get(code)
+        return None if index is None else self.raw_values[index]
+
+    def statistic(self, code: str, name: str = "value") -> Value:
+        """Return the scaled value or a window statistic of a field."""
+        if name == "value":
+            return self.value(code)
+        if (statistics := self.statistics.get(code)) is None:
+            return None
+        return statistics[STATISTICS.index(name)]
+
+    def diff(self, previous: Snapshot | None) -> dict[str, tuple[Value, Value]]:
+        """Return the fields whose scaled value changed, as (old, new)."""
+        if previous is None:
+            return {
+                code: (None, value)
+                for code, value in zip(FIELD_CODES, self.values)
+                if value is not None
+            }
+        if previous.values == self.values:
+            return {}
+        return {
+            code: (old, new)
+            for code, old, new in zip(FIELD_CODES, previous.values, self.values)
+            if old != new
+        }
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the field dicts in the format returned by the API."""
+        result: dict[str, dict[str, Any]] = {}
+        for index, code in enumerate(FIELD_CODES):
+            if self.raw_values[index] is None:
+                continue
+            sample: dict[str, Any] = {
+                "value": self.values[index],
+                "raw_value": self.raw_values[index],
+            }
+            if (statistics := self.statistics.get(code)) is not None:
+                sample.update(zip(STATISTICS, statistics))
+            result[code] = sample
+        return result
@@ -3,10 +3,18 @@
 from __future__ import annotations
 
 import logging
+import re
 import socket
 import time
-from datetime import datetime
-from typing import Any
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any
+
+from .breaker import STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+from .tracing import Tracer
+
+if TYPE_CHECKING:
+    from .capture import FrameCapture
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,8 +46,106 @@ FIELD_MAP_INVERTER = {
     "SYS": "status_Code",
 }
 
-# Base request template
-REQUEST_TEMPLATE = "{FB;01;!!|64:&&|$$$$}"
+# Field groups that can be requested independently of a full poll
+FIELD_GROUPS: dict[str, tuple[str, ...]] = {
+    "power": ("PAC", "PDC", "PD01", "PD02"),
+    "voltage": ("UL1", "UL2", "UL3", "UD01", "UD02"),
+    "current": ("IDC", "ID01", "ID02", "IL1", "IL2", "IL3"),
+    "energy": ("KDY", "KMT", "KYR", "KT0"),
+    "status": ("SYS", "SAL", "TKK", "KHR", "CAC"),
+}
+
+# Yield history stored in the inverter, newest record first
+HISTORY_DAY_CODES = tuple(f"DD{index:02d}" for index in range(31))
+HISTORY_MONTH_CODES = tuple(f"DM{index:02d}" for index in range(12))
+HISTORY_YEAR_CODES = tuple(f"DY{index:02d}" for index in range(10))
+
+# Base request template, sent from the master address FB to the inverter ##
+REQUEST_TEMPLATE = "{FB;##;!!|64:&&|$$$$}"
+
+# Bus address of the inverter, set on its display
+DEFAULT_ADDRESS = 1
+
+# The frame length is a single hex byte, so a frame holds at most 255 characters
+MAX_FRAME_LENGTH = 0xFF
+
+# Longest value the inverter answers for a code, in hex digits. Most fields
+# are 16 bit wide, the yearly and total energy and the operating hours are
+# 32 bit counters and SYS answers a "status,detail" pair. Unknown codes are
+# assumed to be 32 bit wide. History records are "date,yield" plus peak
+# power and hours for days.
+MAX_VALUE_LENGTH = 8
+VALUE_LENGTHS = {
+    **dict.fromkeys(FIELD_MAP_INVERTER, 4),
+    "KYR": 8,
+    "KT0": 8,
+    "KHR": 8,
+    "SYS": 6,
+}
+HISTORY_VALUE_LENGTHS = {"DD": 22, "DM": 12, "DY": 12}
+
+# Response header "{src;dst;length|" and checksum trailer "|CCCC}"
+_FRAME_HEADER = re.compile(r"^\{([0-9A-Fa-f]+);[0-9A-Fa-f]+;([0-9A-Fa-f]{2})\|")
+_FRAME_TRAILER = re.compile(r"\|([0-9A-Fa-f]{4})\}$")
+
+# Rounds of re-reading field groups with corrupt values within one poll
+MAX_GROUP_RETRIES = 2
+
+
+def group_for_field(field: str) -> str | None:
+    """Return the field group a field code belongs to."""
+    for group, fields in FIELD_GROUPS.items():
+        if field in fields:
+            return group
+    return None
+
+
+def response_length(code: str) -> int:
+    """Return the most characters a code can take up in a response frame."""
+    value_length = VALUE_LENGTHS.get(
+        code, HISTORY_VALUE_LENGTHS.get(code[:2], MAX_VALUE_LENGTH)
+    )
+    return len(code) + 1 + value_length
+
+
+def field_map_for_group(group: str) -> dict[str, str]:
+    """Return the subset of FIELD_MAP_INVERTER belonging to a field group."""
+    return {code: FIELD_MAP_INVERTER[code] for code in FIELD_GROUPS[group]}
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryRecord:
+    """One daily, monthly or yearly yield record from the inverter memory."""
+
+    date: date
+    energy: float  # kWh
+    peak_power: float | None = None  # W
+    hours: float | None = None  # h
+
+
+def parse_history_record(code: str, value_str: str) -> HistoryRecord | None:
+    """Parse a history value such as ``DD00=7DE0714,11,8AE,37``.
+
+    The first item is the packed date (year, month and day in hex), followed
+    by the yield in 0.1 kWh and, for daily records, the peak power in 0.5 W
+    and the feed-in hours in 0.1 h. Empty slots return None.
+    """
+    items = value_str.split(",")
+    packed = int(items[0], 16)
+    if packed == 0:
+        return None
+
+    if code.startswith("DD"):
+        record_date = date(packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF)
+    elif code.startswith("DM"):
+        record_date = date(packed >> 8, packed & 0xFF, 1)
+    else:
+        record_date = date(packed, 1, 1)
+
+    energy = int(items[1], 16) / 10.0 if len(items) > 1 else 0.0
+    peak_power = int(items[2], 16) / 2 if len(items) > 2 else None
+    hours = int(items[3], 16) / 10.0 if len(items) > 3 else None
+    return HistoryRecord(record_date, energy, peak_power, hours)
 
 
 class SolarmaxConnectionError(Exception):
@@ -74,15 +180,48 @@ class SolarmaxProtocolError(Exception):
         self.translation_placeholders = kwargs
 
 
+class SolarmaxCircuitOpenError(SolarmaxConnectionError):
+    """Exception raised when polls are suspended by the circuit breaker."""
+
+    def __init__(self, message: str, translation_key: str = "circuit_open", **kwargs):
+        """Initialize the exception with translation support."""
+        super().__init__(message, translation_key, **kwargs)
+
+
 class SolarmaxAPI:
     """API for communicating with Solarmax inverters."""
 
-    def __init__(self, host: str, port: int = 12345, timeout: int = 10):
+    # Whether get_history() can read the yield history stored in the inverter
+    supports_history = True
+
+    def __init__(
+        self,
+        host: str,
+        port: int | None = 12345,
+        timeout: int = 10,
+        capture: FrameCapture | None = None,
+        breaker: CircuitBreaker | None = None,
+        tracer: Tracer | None = None,
+        address: int = DEFAULT_ADDRESS,
+    ):
         """Initialize the API."""
         self.host = host
         self.port = port
+        self.address = address
         self.timeout = timeout
+        self.capture = capture
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.tracer = tracer if tracer is not None else Tracer(_LOGGER)
         self._last_successful_connection = None
+        # Connection kept open between frames forwarded by exchange()
+        self._exchange_socket: Any = None
+
+    @property
+    def endpoint(self) -> str:
+        """Return where the inverter is reached, for logs and messages."""
+        if self.port is None:
+            return self.host
+        return f"{self.host}:{self.port}"
 
     def _create_socket_connection(self, retries: int = 3) -> socket.socket:
         """Create a socket connection with retry logic."""
@@ -91,8 +230,11 @@ class SolarmaxAPI:
         for attempt in range(retries):
             sock = None
             try:
-                _LOGGER.debug(
-                    f"Attempting connection to {self.host}:{self.port} (attempt {attempt + 1}/{retries})"
+                self.tracer.debug(
+                    "Attempting connection to %s (attempt %d/%d)",
+                    self.endpoint,
+                    attempt + 1,
+                    retries,
                 )
 
                 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -104,28 +246,30 @@ class SolarmaxAPI:
                 # Connect with timeout
                 sock.connect((self.host, self.port))
 
-                _LOGGER.debug(f"Successfully connected to {self.host}:{self.port}")
+                self.tracer.debug("Successfully connected to %s", self.endpoint)
                 return sock
 
             except socket.timeout as e:
                 last_exception = SolarmaxTimeoutError(
-                    f"Connection timeout to {self.host}:{self.port}"
+                    f"Connection timeout to {self.endpoint}"
                 )
-                _LOGGER.debug(f"Connection attempt {attempt + 1} timed out: {e}")
+                self.tracer.debug("Connection attempt %d timed out: %s", attempt + 1, e)
             except ConnectionRefusedError as e:
                 last_exception = SolarmaxConnectionError(
-                    f"Connection refused by {self.host}:{self.port}"
+                    f"Connection refused by {self.endpoint}"
                 )
-                _LOGGER.debug(f"Connection attempt {attempt + 1} refused: {e}")
+                self.tracer.debug("Connection attempt %d refused: %s", attempt + 1, e)
             except socket.error as e:
                 last_exception = SolarmaxConnectionError(f"Socket error: {e}")
-                _LOGGER.debug(
-                    f"Connection attempt {attempt + 1} failed with socket error: {e}"
+                self.tracer.debug(
+                    "Connection attempt %d failed with socket error: %s", attempt + 1, e
                 )
             except Exception as e:
                 last_exception = SolarmaxConnectionError(f"Unexpected error: {e}")
-                _LOGGER.debug(
-                    f"Connection attempt {attempt + 1} failed with unexpected error: {e}"
+                self.tracer.debug(
+                    "Connection attempt %d failed with unexpected error: %s",
+                    attempt + 1,
+                    e,
                 )
 
             # Clean up failed socket
@@ -138,19 +282,37 @@ class SolarmaxAPI:
             # Wait before retry (except on last attempt)
             if attempt < retries - 1:
                 wait_time = 1 + attempt  # Exponential backoff: 1s, 2s, 3s
-                _LOGGER.debug(f"Waiting {wait_time}s before retry...")
+                self.tracer.debug("Waiting %ds before retry...", wait_time)
                 time.sleep(wait_time)
 
         # All attempts failed
-        _LOGGER.error(
-            f"Failed to connect to {self.host}:{self.port} after {retries} attempts"
+        self.tracer.error(
+            "Failed to connect to %s after %d attempts",
+            self.endpoint,
+            retries,
         )
         if last_exception:
             raise last_exception
         else:
-            raise SolarmaxConnectionError(
-                f"Failed to connect to {self.host}:{self.port}"
-            )
+            raise SolarmaxConnectionError(f"Failed to connect to {self.endpoint}")
+
+    def _connect(self, retries: int = 3) -> Any:
+        """Open a connection for a request of the integration itself.
+
+        The inverter serves a single client, so a connection kept open for
+        forwarded frames is closed first.
+        """
+        self.close()
+        return self._create_socket_connection(retries)
+
+    def close(self) -> None:
+        """Close the connection kept open for forwarded frames."""
+        sock, self._exchange_socket = self._exchange_socket, None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
 
     def _send_request_and_receive_response(
         self, sock: socket.socket, request: str
@@ -158,8 +320,10 @@ class SolarmaxAPI:
         """Send request and receive response with proper timeout handling."""
         try:
             # Send request
-            _LOGGER.debug(f"Sending request: {request}")
+            self.tracer.debug("Sending request: %s", request)
             sock.send(bytes(request, "utf-8"))
+            if self.capture is not None:
+                self.capture.record(">", request)
 
             # Receive response with consistent timeout
             response = ""
@@ -174,6 +338,9 @@ class SolarmaxAPI:
                     buf = sock.recv(1024)
                     if len(buf) > 0:
                         response += buf.decode("utf-8", errors="ignore")
+                        # Frames may arrive in several segments
+                        if response.startswith("{") and not response.endswith("}"):
+                            continue
                         break
                 except socket.timeout:
                     # Continue loop to check overall timeout
@@ -184,7 +351,9 @@ class SolarmaxAPI:
             if not response:
                 raise SolarmaxTimeoutError("No response received within timeout period")
 
-            _LOGGER.debug(f"Received response: {response}")
+            self.tracer.debug("Received response: %s", response)
+            if self.capture is not None:
+                self.capture.record("<", response)
             return response
 
         except socket.timeout:
@@ -200,17 +369,68 @@ class SolarmaxAPI:
     def build_request(self, field_map: dict[str, str]) -> str:
         """Build the request message for the inverter."""
         fields = ";".join(field_map.keys())
-        req = REQUEST_TEMPLATE.replace("&&", fields)
+        req = REQUEST_TEMPLATE.replace("##", format(self.address, "02X")).replace(
+            "&&", fields
+        )
+        if len(req) > MAX_FRAME_LENGTH:
+            raise SolarmaxProtocolError(
+                f"Request for {len(field_map)} fields exceeds the frame length limit",
+                details="request too long",
+            )
         # Replace !! with length of string in 2-digit hex
         req = req.replace("!!", format(len(req), "02X"))
         # Replace $$$$ with checksum
         req = req.replace("$$$$", self.calculate_checksum((req[1:])[:-5]))
         return req
 
+    def build_response(self, values: dict[str, str]) -> str:
+        """Build the response frame the inverter sends for the given values."""
+        payload = ";".join(f"{code}={value}" for code, value in values.items())
+        # The length covers the whole frame, including its own two digits
+        length = len(f"{{{self.address:02X};FB;00|64:{payload}|0000}}")
+        body = f"{self.address:02X};FB;{length:02X}|64:{payload}|"
+        return f"{{{body}{self.calculate_checksum(body)}}}"
+
+    def build_requests(self, field_map: dict[str, str]) -> list[str]:
+        """Pack the requested fields into the fewest valid request frames.
+
+        The response repeats every code with its value, so frames are packed
+        by the worst-case response length of each code; the shorter request
+        then always fits as well. Fields are placed first-fit in order of
+        decreasing length, which for codes of nearly equal length uses the
+        minimum number of frames.
+        """
+        # Responses have the same header and trailer as requests
+        capacity = MAX_FRAME_LENGTH - len(REQUEST_TEMPLATE.replace("&&", ""))
+        frames: list[list[str]] = []
+        free: list[int] = []
+
+        for code in sorted(field_map, key=response_length, reverse=True):
+            length = response_length(code)
+            # Every code after the first in a frame needs a ";" separator
+            for index, remaining in enumerate(free):
+                if length + 1 <= remaining:
+                    frames[index].append(code)
+                    free[index] -= length + 1
+                    break
+            else:
+                if length > capacity:
+                    raise SolarmaxProtocolError(
+                        f"Field code {code} does not fit into a frame",
+                        details="field code too long",
+                    )
+                frames.append([code])
+                free.append(capacity - length)
+
+        return [
+            self.build_request({code: field_map[code] for code in codes})
+            for codes in frames
+        ]
+
     def calculate_checksum(self, data: str) -> str:
         """Calculate the checksum for the message."""
         checksum_value = sum(ord(c) for c in data)
-        _LOGGER.debug(f"Checksum calculation for '{data}': {checksum_value}")
+        self.tracer.debug("Checksum calculation for '%s': %d", data, checksum_value)
         return format(checksum_value, "04X")
 
     def map_data_value(self, field: str, value: int) -> str | float | int:
@@ -233,56 +453,120 @@ class SolarmaxAPI:
     def test_connection(self) -> bool:
         """Test if we can connect to the inverter."""
         try:
-            sock = self._create_socket_connection(retries=1)
+            sock = self._connect(retries=1)
             try:
                 # Try to send a minimal request
-                request = self.build_request({"PAC": "AC_Power (W)"})
-                response = self._send_request_and_receive_response(sock, request)
-                return len(response) > 0
+                return self._ping(sock, "PAC")
             finally:
                 sock.close()
 
         except Exception as e:
-            _LOGGER.debug(f"Connection test failed: {e}")
+            _LOGGER.debug("Connection test failed: %s", e)
             return False
 
-    def get_data(self) -> dict[str, Any]:
-        """Get data from the inverter with retry logic."""
+    def get_data(self, field_map: dict[str, str] | None = None) -> dict[str, Any]:
+        """Get data from the inverter with retry logic.
+
+        Only the fields in ``field_map`` are requested if it is given,
+        otherwise all fields of FIELD_MAP_INVERTER are read. While the circuit
+        breaker is open polls fail immediately without any I/O.
+        """
+        if field_map is None:
+            field_map = FIELD_MAP_INVERTER
+
+        state = self.breaker.state
+        if state == STATE_OPEN:
+            raise SolarmaxCircuitOpenError(
+                f"Polling {self.endpoint} suspended after "
+                f"{self.breaker.failures} failures",
+                host=self.host,
+                port=self.port,
+            )
+
+        self.tracer.begin()
+        failed = True
+        try:
+            if state == STATE_HALF_OPEN:
+                # Half-open: a cheap probe decides whether full polls resume
+                self._probe()
+
+            try:
+                data = self._get_data(field_map)
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            failed = False
+        finally:
+            self.tracer.end(failed)
+        self.breaker.record_success()
+        return data
+
+    def _probe(self) -> None:
+        """Read a single field once, updating the breaker with the result."""
+        sock = None
+        try:
+            sock = self._connect(retries=1)
+            if not self._ping(sock, "SYS"):
+                raise SolarmaxTimeoutError("Empty response received")
+        except (SolarmaxConnectionError, SolarmaxTimeoutError) as err:
+            self.breaker.record_failure()
+            self.tracer.debug(
+                "Probe of %s failed, next in %.0fs: %s",
+                self.endpoint,
+                self.breaker.next_probe_in or 0,
+                err,
+            )
+            raise
+        finally:
+            if sock is not None:
+                sock.close()
+
+        _LOGGER.info("Inverter at %s answers again", self.endpoint)
+        self.breaker.record_success()
+
+    def _ping(self, sock: Any, code: str) -> bool:
+        """Request a single field and return if the inverter answered."""
+        request = self.build_request({code: ""})
+        return len(self._send_request_and_receive_response(sock, request)) > 0
+
+    def _get_data(self, field_map: dict[str, str]) -> dict[str, Any]:
+        """Poll the requested fields with retries."""
         retries = 3
         last_exception = None
+        deadline = time.monotonic() + self.timeout
 
         for attempt in range(retries):
             sock = None
             try:
-                _LOGGER.debug(
-                    f"Getting data from inverter (attempt {attempt + 1}/{retries})"
+                self.tracer.debug(
+                    "Getting data from inverter (attempt %d/%d)", attempt + 1, retries
                 )
 
                 # Create connection with retry logic
-                sock = self._create_socket_connection(
-                    retries=2
-                )  # 2 retries per attempt
+                sock = self._connect(retries=2)  # 2 retries per attempt
 
-                # Build and send request, receive response
-                request = self.build_request(FIELD_MAP_INVERTER)
-                response = self._send_request_and_receive_response(sock, request)
+                data = self._read_fields(sock, field_map, deadline)
 
-                if response:
-                    # Mark successful connection
-                    self._last_successful_connection = datetime.now()
-                    data = self.convert_to_json(FIELD_MAP_INVERTER, response)
-                    _LOGGER.debug(f"Successfully retrieved data from inverter")
-                    return data
-                else:
-                    raise SolarmaxTimeoutError("Empty response received")
+                # Mark successful connection
+                self._last_successful_connection = datetime.now()
+                self.tracer.debug("Successfully retrieved data from inverter")
+                return data
 
-            except (SolarmaxConnectionError, SolarmaxTimeoutError) as e:
+            except (
+                SolarmaxConnectionError,
+                SolarmaxTimeoutError,
+                SolarmaxProtocolError,
+            ) as e:
                 last_exception = e
-                _LOGGER.debug(f"Data retrieval attempt {attempt + 1} failed: {e}")
+                self.tracer.debug(
+                    "Data retrieval attempt %d failed: %s", attempt + 1, e
+                )
             except Exception as e:
                 last_exception = SolarmaxConnectionError(f"Unexpected error: {e}")
-                _LOGGER.debug(
-                    f"Data retrieval attempt {attempt + 1} failed with unexpected error: {e}"
+                self.tracer.debug(
+                    "Data retrieval attempt %d failed with unexpected error: %s",
+                    attempt + 1,
+                    e,
                 )
             finally:
                 # Always clean up socket
@@ -295,42 +579,209 @@ class SolarmaxAPI:
             # Wait before retry (except on last attempt)
             if attempt < retries - 1:
                 wait_time = 2 + attempt  # 2s, 3s wait between attempts
-                _LOGGER.debug(f"Waiting {wait_time}s before retrying data retrieval...")
+                self.tracer.debug(
+                    "Waiting %ds before retrying data retrieval...", wait_time
+                )
                 time.sleep(wait_time)
 
         # All attempts failed
-        _LOGGER.error(f"Failed to get data from inverter after {retries} attempts")
+        self.tracer.error("Failed to get data from inverter after %d attempts", retries)
         if last_exception:
             raise last_exception
         else:
             raise SolarmaxConnectionError("Failed to get data from inverter")
 
-    def convert_to_json(self, field_map: dict[str, str], data: str) -> dict[str, Any]:
-        """Convert inverter response to JSON format."""
-        try:
-            data_split = data.split(":")[1].split("|")[0].split(";")
-            result_dict = {}
-
-            for item in data_split:
-                if "=" not in item:
+    def _read_fields(
+        self, sock: Any, field_map: dict[str, str], deadline: float
+    ) -> dict[str, Any]:
+        """Read the requested fields, re-reading groups with corrupt values.
+
+        Frames failing the checksum and values that cannot be decoded mark
+        their fields as failed; everything else is kept. The field groups of
+        failed fields are requested again while the poll deadline allows.
+        Fields the inverter simply does not report are not retried.
+        """
+        data: dict[str, Any] = {}
+        pending = field_map
+
+        for round_ in range(MAX_GROUP_RETRIES + 1):
+            failed: set[str] = set()
+            for request in self.build_requests(pending):
+                response = self._send_request_and_receive_response(sock, request)
+                if not response:
+                    raise SolarmaxTimeoutError("Empty response received")
+                try:
+                    decoded, invalid = self.decode_response(pending, response)
+                except SolarmaxProtocolError as err:
+                    self.tracer.debug("Discarding response frame: %s", err)
+                    failed.update(self._request_codes(request))
                     continue
+                data.update(decoded)
+                failed.update(invalid)
+
+            if not failed:
+                break
+            if round_ == MAX_GROUP_RETRIES or time.monotonic() >= deadline:
+                self.tracer.debug("Giving up on corrupt fields %s", sorted(failed))
+                break
+
+            groups = {group_for_field(code) for code in failed}
+            pending = {
+                code: name
+                for code, name in field_map.items()
+                if code in failed or group_for_field(code) in groups - {None}
+            }
+            self.tracer.debug("Re-reading fields %s", sorted(pending))
+
+        if not data:
+            raise SolarmaxProtocolError("No valid fields in response")
+        return data
+
+    @staticmethod
+    def _request_codes(request: str) -> list[str]:
+        """Return the field codes of a request frame."""
+        return request.split(":", 1)[1].split("|", 1)[0].split(";")
+
+    def verify_frame(self, response: str) -> None:
+        """Check the sender, length and checksum of a response frame.
+
+        They are only checked when present, so bare payloads are accepted.
+        """
+        if header := _FRAME_HEADER.match(response):
+            if int(header.group(1), 16) != self.address:
+                # A late answer of another inverter on the same bus
+                raise SolarmaxProtocolError(
+                    f"Frame from address {header.group(1)} instead of "
+                    f"{self.address:02X}",
+                    details="address mismatch",
+                )
+            length = int(header.group(2), 16)
+            if length != len(response):
+                raise SolarmaxProtocolError(
+                    f"Frame length {length} does not match {len(response)}",
+                    details="length mismatch",
+                )
+
+        if trailer := _FRAME_TRAILER.search(response):
+            checksum = self.calculate_checksum(response[1:-5])
+            if trailer.group(1).upper() != checksum:
+                raise SolarmaxProtocolError(
+                    f"Frame checksum {trailer.group(1)} does not match {checksum}",
+                    details="checksum mismatch",
+                )
+
+    def decode_response(
+        self, field_map: dict[str, str], response: str
+    ) -> tuple[dict[str, Any], set[str]]:
+        """Decode a verified response field by field.
 
-                field, value_str = item.split("=", 1)
+        Returns the decoded fields and the codes of values that could not
+        be decoded. Raises SolarmaxProtocolError if the frame is corrupt.
+        """
+        self.verify_frame(response)
+        try:
+            items = response.split(":", 1)[1].split("|", 1)[0].split(";")
+        except IndexError as err:
+            raise SolarmaxProtocolError(f"Malformed response: {err}") from err
 
+        result: dict[str, Any] = {}
+        invalid: set[str] = set()
+        for item in items:
+            if "=" not in item:
+                continue
+
+            field, value_str = item.split("=", 1)
+            try:
                 if field == "SYS":
                     # Cut off the ",0" in SYS status
                     value = int(value_str.split(",")[0], 16)
                 else:
                     value = int(value_str, 16)
+            except ValueError:
+                _LOGGER.debug("Invalid value for %s: %s", field, value_str)
+                invalid.add(field)
+                continue
+
+            result[field] = {
+                "value": self.map_data_value(field, value),
+                "raw_value": value,
+            }
+
+        return result, invalid
+
+    def exchange(self, request: str) -> str:
+        """Send a raw request frame and return the raw response frame.
+
+        Used to forward the requests of other MaxTalk clients, so there are
+        no retries and the frames are passed through unchanged. The
+        connection stays open for the next frame until it fails, the
+        integration needs the inverter for its own requests or close() is
+        called.
+        """
+        if self.breaker.state == STATE_OPEN:
+            raise SolarmaxCircuitOpenError(
+                f"Polling {self.endpoint} suspended after "
+                f"{self.breaker.failures} failures",
+                host=self.host,
+                port=self.port,
+            )
+        if self._exchange_socket is None:
+            self._exchange_socket = self._create_socket_connection(retries=1)
+        try:
+            return self._send_request_and_receive_response(
+                self._exchange_socket, request
+            )
+        except Exception:
+            self.close()
+            raise
 
-                result_dict[field] = {
-                    "value": self.map_data_value(field, value),
-                    "raw_value": value,
-                }
+    def get_history(self, codes: list[str]) -> dict[str, HistoryRecord | None]:
+        """Read yield history records in a single request without retries.
 
-            _LOGGER.debug(f"Converted data: {result_dict}")
-            return result_dict
+        History is read in the background between live polls, so a failed
+        batch is simply tried again later instead of blocking the inverter.
+        """
+        sock = self._connect(retries=1)
+        try:
+            responses = [
+                self._send_request_and_receive_response(sock, request)
+                for request in self.build_requests(dict.fromkeys(codes, ""))
+            ]
+        finally:
+            sock.close()
 
-        except Exception as e:
-            _LOGGER.error(f"Error converting data to JSON: {e}")
+        for response in responses:
+            self.verify_frame(response)
+
+        try:
+            items = [
+                item
+                for response in responses
+                for item in response.split(":")[1].split("|")[0].split(";")
+            ]
+        except IndexError as err:
+            raise SolarmaxProtocolError(f"Malformed history response: {err}") from err
+
+        records: dict[str, HistoryRecord | None] = {}
+        for item in items:
+            if "=" not in item:
+                continue
+            code, value_str = item.split("=", 1)
+            try:
+                records[code] = parse_history_record(code, value_str)
+            except (ValueError, IndexError) as err:
+                _LOGGER.debug("Skipping invalid history record %s: %s", item, err)
+        return records
+
+    def convert_to_json(self, field_map: dict[str, str], data: str) -> dict[str, Any]:
+        """Convert inverter response to JSON format."""
+        try:
+            result_dict, invalid = self.decode_response(field_map, data)
+        except SolarmaxProtocolError as e:
+            _LOGGER.error("Error converting data to JSON: %s", e)
             return {}
+
+        if invalid:
+            _LOGGER.debug("Skipped invalid fields: %s", sorted(invalid))
+        self.tracer.debug("Converted data: %s", result_dict)
+        return result_dict
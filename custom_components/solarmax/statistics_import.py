@@ -0,0 +1,213 @@
+"""Long-term statistics import for the Solarmax integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util
+
+from .aggregation import FieldAccumulator
+from .const import DOMAIN, SENSOR_TYPES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Energy counters imported as sums; KDY resets every day
+ENERGY_FIELDS = ("KDY", "KT0")
+
+# Measurements imported as hourly mean/min/max
+MEAN_FIELDS = tuple(
+    key
+    for key, config in SENSOR_TYPES.items()
+    if config.get("state_class") == "measurement"
+)
+
+# Sensors of these fields drop their state class while the import is
+# enabled, so the recorder does not compile a second set of statistics
+IMPORTED_FIELDS = frozenset(ENERGY_FIELDS + MEAN_FIELDS)
+
+
+def statistic_id(entry_id: str, field: str) -> str:
+    """Return the external statistic ID of a field."""
+    return f"{DOMAIN}:{entry_id.lower()}_{field.lower()}"
+
+
+class HourlyStatistics:
+    """Compute hourly statistics from polled samples and import them.
+
+    Each poll updates running accumulators in O(1); at the top of every hour,
+    or when a poll already falls into the new hour, the completed hour is
+    pushed to the recorder as external statistics. These replace the statistics the recorder would otherwise
+    compile from the sensor states, see IMPORTED_FIELDS.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, device_name: str) -> None:
+        """Initialize the statistics."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self.device_name = device_name
+
+        self._hour_start: datetime | None = None
+        self._sampled = False
+        # Closes the hour on time, also when no poll follows before morning
+        self._unsub_hour: CALLBACK_TYPE | None = None
+        self._accumulators = {field: FieldAccumulator() for field in MEAN_FIELDS}
+
+        # Energy counters: last polled state, growth within the current hour
+        # and the running sum of all imported hours (loaded from the recorder)
+        self._energy_state: dict[str, float] = {}
+        self._energy_growth: dict[str, float] = dict.fromkeys(ENERGY_FIELDS, 0.0)
+        self._energy_sum: dict[str, float] | None = None
+        # Imports of consecutive hours must not interleave around the sums
+        self._import_lock = asyncio.Lock()
+
+    def add(self, data: dict[str, dict[str, Any]], now: datetime) -> None:
+        """Add one poll result."""
+        if self._hour_start is None:
+            self._hour_start = self._start_of_hour(now)
+            self._unsub_hour = async_track_utc_time_change(
+                self.hass, self._handle_hour, minute=0, second=0
+            )
+        else:
+            self._roll_over(now)
+        self._sampled = True
+
+        for field, accumulator in self._accumulators.items():
+            value = data.get(field, {}).get("value")
+            if isinstance(value, (int, float)):
+                accumulator.add(value)
+
+        for field in ENERGY_FIELDS:
+            value = data.get(field, {}).get("value")
+            if not isinstance(value, (int, float)):
+                continue
+
+            last = self._energy_state.get(field)
+            if last is not None:
+                # A drop means the counter was reset (new day for KDY)
+                self._energy_growth[field] += value - last if value >= last else value
+            self._energy_state[field] = value
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop closing hours on time."""
+        if self._unsub_hour is not None:
+            self._unsub_hour()
+            self._unsub_hour = None
+
+    @staticmethod
+    def _start_of_hour(now: datetime) -> datetime:
+        """Return the start of the UTC hour a time falls into."""
+        return dt_util.as_utc(now).replace(minute=0, second=0, microsecond=0)
+
+    @callback
+    def _handle_hour(self, now: datetime) -> None:
+        """Close the completed hour at the top of the hour."""
+        self._roll_over(now)
+
+    def _roll_over(self, now: datetime) -> None:
+        """Close the current hour if a time falls into a later one."""
+        hour_start = self._start_of_hour(now)
+        if self._hour_start is not None and hour_start > self._hour_start:
+            self._close_hour()
+            self._hour_start = hour_start
+
+    def _close_hour(self) -> None:
+        """Hand the completed hour to the recorder and reset the accumulators."""
+        start = self._hour_start
+        means = {
+            field: (accumulator.mean, accumulator.minimum, accumulator.maximum)
+            for field, accumulator in self._accumulators.items()
+            if accumulator.count
+        }
+        energy = {
+            field: (self._energy_state[field], self._energy_growth[field])
+            for field in ENERGY_FIELDS
+            if field in self._energy_state
+        }
+
+        for accumulator in self._accumulators.values():
+            accumulator.reset()
+        self._energy_growth = dict.fromkeys(ENERGY_FIELDS, 0.0)
+
+        # Hours without polls, such as the night, have nothing to import
+        sampled, self._sampled = self._sampled, False
+        if sampled and (means or energy):
+            self.hass.async_create_task(self._async_import(start, means, energy))
+
+    async def _async_load_sums(self) -> dict[str, float]:
+        """Return the last imported sum of every energy counter."""
+        sums: dict[str, float] = {}
+        for field in ENERGY_FIELDS:
+            stat_id = statistic_id(self.entry_id, field)
+            last = await get_instance(self.hass).async_add_executor_job(
+                get_last_statistics, self.hass, 1, stat_id, True, {"sum"}
+            )
+            rows = last.get(stat_id)
+            sums[field] = (rows[0].get("sum") or 0.0) if rows else 0.0
+        return sums
+
+    async def _async_import(
+        self,
+        start: datetime,
+        means: dict[str, tuple[float, float, float]],
+        energy: dict[str, tuple[float, float]],
+    ) -> None:
+        """Import one hour of statistics."""
+        async with self._import_lock:
+            if self._energy_sum is None:
+                self._energy_sum = await self._async_load_sums()
+            self._add_statistics(start, means, energy)
+
+        _LOGGER.debug("Imported statistics for %s starting %s", self.device_name, start)
+
+    def _add_statistics(
+        self,
+        start: datetime,
+        means: dict[str, tuple[float, float, float]],
+        energy: dict[str, tuple[float, float]],
+    ) -> None:
+        """Hand the statistics of one hour to the recorder."""
+        for field, (mean, minimum, maximum) in means.items():
+            async_add_external_statistics(
+                self.hass,
+                self._metadata(field, has_mean=True, has_sum=False),
+                [StatisticData(start=start, mean=mean, min=minimum, max=maximum)],
+            )
+
+        for field, (state, growth) in energy.items():
+            self._energy_sum[field] += growth
+            statistic = StatisticData(
+                start=start, state=state, sum=self._energy_sum[field]
+            )
+            if field == "KDY":
+                statistic["last_reset"] = dt_util.as_utc(
+                    dt_util.start_of_local_day(dt_util.as_local(start))
+                )
+            async_add_external_statistics(
+                self.hass,
+                self._metadata(field, has_mean=False, has_sum=True),
+                [statistic],
+            )
+
+    def _metadata(self, field: str, has_mean: bool, has_sum: bool) -> StatisticMetaData:
+        """Return the statistic metadata of a field."""
+        config = SENSOR_TYPES[field]
+        return StatisticMetaData(
+            has_mean=has_mean,
+            has_sum=has_sum,
+            name=f"{self.device_name} {config['name']}",
+            source=DOMAIN,
+            statistic_id=statistic_id(self.entry_id, field),
+            unit_of_measurement=config.get("unit"),
+        )
@@ -0,0 +1,125 @@
+"""Lazy, sampled trace records of Solarmax inverter traffic."""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any, NamedTuple
+
+# Records kept per inverter
+DEFAULT_TRACE_BUFFER = 200
+
+# Arguments that cannot change after the call and pin no other objects
+_IMMUTABLE = (str, bytes, int, float, bool, type(None))
+
+
+class _Captured(str):
+    """An argument's text at the time of the call; formats like the object."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        """Return the captured text unquoted, as %r would show the object."""
+        return str(self)
+
+
+def _capture(arg: Any) -> Any:
+    """Return an argument as it may be kept until the ring is dumped."""
+    return arg if isinstance(arg, _IMMUTABLE) else _Captured(arg)
+
+
+class TraceRecord(NamedTuple):
+    """An unformatted debug message."""
+
+    timestamp: float
+    level: int
+    msg: str
+    args: tuple[Any, ...]
+
+    def format(self) -> str:
+        """Return the message with its arguments."""
+        try:
+            return self.msg % self.args if self.args else self.msg
+        except (TypeError, ValueError):
+            return f"{self.msg} {self.args!r}"
+
+
+class Tracer:
+    """Keep the debug messages of recent polls of one inverter in a ring.
+
+    Messages go to the logger as usual and are stored with their arguments,
+    so messages are not assembled unless debug logging is on or the ring is
+    dumped; only arguments other than strings and numbers are turned into
+    text right away. The messages of a poll are kept if the poll was sampled or
+    failed; failures therefore always come with their full detail.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        sample_rate: float = 1.0,
+        size: int = DEFAULT_TRACE_BUFFER,
+    ) -> None:
+        """Initialize the tracer; sample_rate is the share of polls kept."""
+        self.sample_rate = sample_rate
+        self._logger = logger
+        self._records: deque[TraceRecord] = deque(maxlen=size)
+        self._pending: list[TraceRecord] | None = None
+        self.polls = 0
+        self.kept = 0
+
+    def debug(self, msg: str, *args: Any) -> None:
+        """Log and record a debug message."""
+        self._logger.debug(msg, *args)
+        self._record(logging.DEBUG, msg, args)
+
+    def error(self, msg: str, *args: Any) -> None:
+        """Log and record an error message."""
+        self._logger.error(msg, *args)
+        self._record(logging.ERROR, msg, args)
+
+    def _record(self, level: int, msg: str, args: tuple[Any, ...]) -> None:
+        """Store a message with the poll in progress, or right away."""
+        # Objects such as the data dict would be pinned in the ring and show
+        # their later state, so only immutable arguments are kept as they are
+        record = TraceRecord(time.time(), level, msg, tuple(map(_capture, args)))
+        if self._pending is not None:
+            self._pending.append(record)
+        else:
+            self._records.append(record)
+
+    def begin(self) -> None:
+        """Start collecting the messages of a poll."""
+        self._pending = []
+
+    def end(self, failed: bool) -> None:
+        """Keep the messages of the poll if it was sampled or failed."""
+        pending, self._pending = self._pending, None
+        self.polls += 1
+        if pending is None or not (failed or random.random() < self.sample_rate):
+            return
+        self.kept += 1
+        self._records.extend(pending)
+
+    def as_list(self, redact: Iterable[str] = ()) -> list[dict[str, str]]:
+        """Return the kept messages, oldest first, with secrets replaced."""
+        secrets = [secret for secret in redact if secret]
+        result = []
+        for record in list(self._records):
+            message = record.format()
+            for secret in secrets:
+                message = message.replace(secret, "**REDACTED**")
+            result.append(
+                {
+                    "time": datetime.fromtimestamp(
+                        record.timestamp, timezone.utc
+                    ).isoformat(),
+                    "level": logging.getLevelName(record.level),
+                    "message": message,
+                }
+            )
+        return result
@@ -0,0 +1,104 @@
+"""Websocket API for live Solarmax samples."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    DEFAULT_LIVE_INTERVAL,
+    DOMAIN,
+    MIN_LIVE_INTERVAL,
+)
+from .coordinator import SolarmaxCoordinator
+from .solarmax_api import FIELD_MAP_INVERTER
+
+
+def _send_backlog(connection: websocket_api.ActiveConnection) -> int:
+    """Return the messages not yet written to the client, 0 if unknown."""
+    handler = getattr(connection.send_message, "__self__", None)
+    queue = getattr(handler, "_message_queue", None)
+    return len(queue) if queue is not None else 0
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the Solarmax websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional("fields"): vol.All(
+            cv.ensure_list, [vol.In(list(FIELD_MAP_INVERTER))]
+        ),
+        vol.Optional("interval", default=DEFAULT_LIVE_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=MIN_LIVE_INTERVAL)
+        ),
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream samples of an inverter straight from its polls.
+
+    Every message carries the latest value of each selected field; values
+    superseded before the subscriber's interval passed, or while earlier
+    messages still wait to be written to the client, are only counted in
+    ``dropped``.
+    """
+    entry = hass.config_entries.async_get_entry(msg[ATTR_CONFIG_ENTRY_ID])
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            f"Solarmax config entry {msg[ATTR_CONFIG_ENTRY_ID]} is not loaded",
+        )
+        return
+
+    coordinator: SolarmaxCoordinator = entry.runtime_data
+    fields = frozenset(msg["fields"]) if "fields" in msg else None
+
+    @callback
+    def forward(
+        data: dict[str, dict[str, Any]], sampled_at: datetime, dropped: int
+    ) -> None:
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"],
+                {
+                    "sampled_at": sampled_at.isoformat(),
+                    "data": data,
+                    "dropped": dropped,
+                },
+            )
+        )
+
+    connection.subscriptions[msg["id"]] = coordinator.async_subscribe_live(
+        forward, fields, msg["interval"], busy=lambda: _send_backlog(connection) > 0
+    )
+    connection.send_result(msg["id"])
+
+    # Start with the current values instead of waiting for the next poll
+    if (snapshot := coordinator.data) is not None and snapshot.sampled_at:
+        current = snapshot.as_dict()
+        if fields is not None:
+            current = {code: current[code] for code in fields if code in current}
+        if current:
+            forward(current, snapshot.sampled_at, 0)
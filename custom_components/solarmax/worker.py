@@ -0,0 +1,193 @@
+"""Dedicated I/O worker for Solarmax inverter requests."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+# Threads shared by all gateways; more hanging gateways than this delay
+# the others until a timeout frees a thread
+MAX_IO_THREADS = 4
+
+
+class IOJob:
+    """A blocking call queued for a gateway; await it for the result."""
+
+    __slots__ = ("fn", "args", "future", "queued_at", "started_at", "finished_at")
+
+    def __init__(
+        self, fn: Callable[..., Any], args: tuple[Any, ...], future: asyncio.Future
+    ) -> None:
+        """Initialize the job as queued now."""
+        self.fn = fn
+        self.args = args
+        self.future = future
+        self.queued_at = time.monotonic()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        """Wait for the result of the call."""
+        return self.future.__await__()
+
+    @property
+    def wait(self) -> float:
+        """Return the seconds the job waited in the queue."""
+        started_at = (
+            self.started_at if self.started_at is not None else time.monotonic()
+        )
+        return started_at - self.queued_at
+
+    @property
+    def duration(self) -> float | None:
+        """Return the seconds the call ran, excluding the queue wait."""
+        if self.started_at is None:
+            return None
+        finished_at = (
+            self.finished_at if self.finished_at is not None else time.monotonic()
+        )
+        return finished_at - self.started_at
+
+
+class GatewayQueue:
+    """The jobs of one gateway, run one at a time in submission order."""
+
+    __slots__ = ("jobs", "released", "running", "started", "wait_total")
+
+    def __init__(self) -> None:
+        """Initialize an empty queue."""
+        self.jobs: deque[IOJob] = deque()
+        # Dropped by the worker once idle, after its inverters were unloaded
+        self.released = False
+        self.running: IOJob | None = None
+        self.started = 0
+        self.wait_total = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of jobs waiting to start."""
+        return len(self.jobs)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the queue state for diagnostics."""
+        return {
+            "depth": self.depth,
+            "busy": self.running is not None,
+            "started": self.started,
+            "mean_wait": (
+                round(self.wait_total / self.started, 3) if self.started else None
+            ),
+        }
+
+
+class IOWorker:
+    """Run inverter I/O on threads of its own instead of the shared executor.
+
+    Every gateway has a FIFO queue with at most one job running, on a small
+    pool of threads shared by all gateways. A gateway hanging in timeouts
+    holds at most one of the threads and never blocks Home Assistant's
+    executor.
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, max_threads: int = MAX_IO_THREADS
+    ) -> None:
+        """Initialize the worker; threads are started on demand."""
+        self._loop = loop
+        self._executor = ThreadPoolExecutor(
+            max_threads, thread_name_prefix="solarmax_io"
+        )
+        self._queues: dict[str, GatewayQueue] = {}
+        # Bumped on every queue change, so cached metrics know when to render
+        self.version = 0
+
+    @property
+    def queues(self) -> dict[str, GatewayQueue]:
+        """Return the queues by gateway."""
+        return self._queues
+
+    def stats(self, gateway: str) -> dict[str, Any]:
+        """Return the queue state of a gateway."""
+        return self._queues.get(gateway, GatewayQueue()).as_dict()
+
+    def submit(self, gateway: str, fn: Callable[..., Any], *args: Any) -> IOJob:
+        """Queue a blocking call for a gateway."""
+        job = IOJob(fn, args, self._loop.create_future())
+        if (queue := self._queues.get(gateway)) is None:
+            queue = self._queues[gateway] = GatewayQueue()
+        queue.released = False
+        queue.jobs.append(job)
+        job.future.add_done_callback(partial(self._drop_cancelled, queue, job))
+        self.version += 1
+        if queue.running is None:
+            self._start_next(queue)
+        return job
+
+    def _start_next(self, queue: GatewayQueue) -> None:
+        """Start the oldest job still awaited by its caller."""
+        queue.running = None
+        while queue.jobs:
+            job = queue.jobs.popleft()
+            if job.future.done():
+                # The caller stopped waiting while the job was queued
+                continue
+            job.started_at = time.monotonic()
+            queue.running = job
+            queue.started += 1
+            queue.wait_total += job.wait
+            future = self._loop.run_in_executor(self._executor, job.fn, *job.args)
+            future.add_done_callback(partial(self._finish, queue, job))
+            break
+        else:
+            if queue.released:
+                self._drop(queue)
+        self.version += 1
+
+    def _drop_cancelled(
+        self, queue: GatewayQueue, job: IOJob, future: asyncio.Future
+    ) -> None:
+        """Remove a job from its queue as soon as its caller cancels it."""
+        if future.cancelled() and job in queue.jobs:
+            queue.jobs.remove(job)
+            self.version += 1
+
+    def _finish(self, queue: GatewayQueue, job: IOJob, future: asyncio.Future) -> None:
+        """Hand the result to the caller and start the next job."""
+        job.finished_at = time.monotonic()
+        # Always retrieve the outcome, so asyncio does not log an exception
+        # of a call whose caller was cancelled while it ran
+        if future.cancelled():
+            job.future.cancel()
+        elif (err := future.exception()) is not None:
+            if not job.future.done():
+                job.future.set_exception(err)
+        elif not job.future.done():
+            job.future.set_result(future.result())
+        self._start_next(queue)
+
+    def release(self, gateway: str) -> None:
+        """Forget a gateway's queue once its last job has finished."""
+        if (queue := self._queues.get(gateway)) is None:
+            return
+        queue.released = True
+        if queue.running is None and not queue.jobs:
+            self._drop(queue)
+            self.version += 1
+
+    def _drop(self, queue: GatewayQueue) -> None:
+        """Remove an idle queue, unless it was replaced in the meantime."""
+        for gateway, known in list(self._queues.items()):
+            if known is queue:
+                del self._queues[gateway]
+
+    def shutdown(self) -> None:
+        """Drop queued jobs and stop the threads once their call returns."""
+        for queue in self._queues.values():
+            while queue.jobs:
+                queue.jobs.popleft().future.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
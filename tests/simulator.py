@@ -0,0 +1,197 @@
+"""Simulated MaxTalk inverters for load tests.
+
+Every inverter listens on its own port of 127.0.0.1 and answers requests
+with valid frames. The servers run on an event loop in a thread of their
+own, so they do not compete with Home Assistant's loop, and the CPU time
+of that thread can be read to subtract it from process totals.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+
+from custom_components.solarmax.solarmax_api import SolarmaxAPI
+
+# Raw start values; fields in _JITTER drift on every request, energy
+# counters grow, everything else stays put
+_START_VALUES = {
+    "KDY": 12,
+    "KMT": 210,
+    "KYR": 1850,
+    "KT0": 24500,
+    "PDC": 6200,
+    "PD01": 3100,
+    "PD02": 3100,
+    "UD01": 3800,
+    "UD02": 3800,
+    "IDC": 1600,
+    "ID01": 800,
+    "ID02": 800,
+    "PAC": 6000,
+    "UL1": 2300,
+    "UL2": 2300,
+    "UL3": 2300,
+    "IL1": 430,
+    "IL2": 430,
+    "IL3": 430,
+    "CAC": 1520,
+    "KHR": 21000,
+    "TKK": 41,
+    "SAL": 0,
+}
+_JITTER = {
+    "PDC": 200,
+    "PD01": 100,
+    "PD02": 100,
+    "UD01": 20,
+    "UD02": 20,
+    "IDC": 50,
+    "ID01": 25,
+    "ID02": 25,
+    "PAC": 200,
+    "UL1": 10,
+    "UL2": 10,
+    "UL3": 10,
+    "IL1": 15,
+    "IL2": 15,
+    "IL3": 15,
+}
+# Feed-in operation
+_STATUS_FEED_IN = "4E33,0"
+
+
+class SimulatedInverter:
+    """The state of one simulated inverter."""
+
+    def __init__(self, seed: int) -> None:
+        """Initialize the inverter with slightly individual values."""
+        self._random = random.Random(seed)
+        self._values = {
+            code: value + self._random.randint(0, _JITTER.get(code, 0))
+            for code, value in _START_VALUES.items()
+        }
+        self.requests = 0
+        self.connections = 0
+        # Frames the inverter answers, by the address they were sent to
+        self._framers: dict[int, SolarmaxAPI] = {}
+
+    def answer(self, request: str) -> str:
+        """Return the response frame to a request frame."""
+        self.requests += 1
+        self._values["KDY"] += 1
+        codes = request.split(":", 1)[1].split("|", 1)[0].split(";")
+        values: dict[str, str] = {}
+        for code in codes:
+            if code == "SYS":
+                values[code] = _STATUS_FEED_IN
+            elif code in self._values:
+                value = self._values[code]
+                if jitter := _JITTER.get(code):
+                    value = max(0, value + self._random.randint(-jitter, jitter))
+                values[code] = format(value, "X")
+        # Answer from the address the request was sent to
+        address = int(request.split(";", 2)[1], 16)
+        if (framer := self._framers.get(address)) is None:
+            framer = self._framers[address] = SolarmaxAPI("simulator", address=address)
+        return framer.build_response(values)
+
+
+class InverterSimulator:
+    """Serve a number of simulated inverters from a background thread."""
+
+    def __init__(self, count: int, seed: int = 0) -> None:
+        """Initialize the simulator; nothing listens before start()."""
+        self.inverters = [SimulatedInverter(seed + index) for index in range(count)]
+        self.ports: list[int] = []
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, name="maxtalk_simulator", daemon=True
+        )
+        self._servers: list[asyncio.base_events.Server] = []
+        self._started = threading.Event()
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests answered by all inverters."""
+        return sum(inverter.requests for inverter in self.inverters)
+
+    @property
+    def connections(self) -> int:
+        """Return the number of connections accepted by all inverters."""
+        return sum(inverter.connections for inverter in self.inverters)
+
+    def cpu_time(self) -> float:
+        """Return the CPU seconds the simulator thread has used so far."""
+        return asyncio.run_coroutine_threadsafe(
+            self._thread_time(), self._loop
+        ).result()
+
+    @staticmethod
+    async def _thread_time() -> float:
+        """Return the CPU time of the calling thread."""
+        return time.thread_time()
+
+    def start(self) -> None:
+        """Start listening on one ephemeral port per inverter."""
+        self._thread.start()
+        self._started.wait()
+
+    def stop(self) -> None:
+        """Close all listeners and wait for the thread to end."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Run the servers until stopped."""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._listen())
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            for server in self._servers:
+                server.close()
+            self._loop.run_until_complete(self._close())
+            self._loop.close()
+
+    async def _listen(self) -> None:
+        """Open the listeners."""
+        for inverter in self.inverters:
+            server = await asyncio.start_server(
+                lambda reader, writer, inverter=inverter: self._serve(
+                    inverter, reader, writer
+                ),
+                "127.0.0.1",
+                0,
+            )
+            self._servers.append(server)
+            self.ports.append(server.sockets[0].getsockname()[1])
+
+    async def _close(self) -> None:
+        """Wait for the listeners and open connections to close."""
+        for server in self._servers:
+            await server.wait_closed()
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _serve(
+        self,
+        inverter: SimulatedInverter,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Answer request frames until the client disconnects."""
+        inverter.connections += 1
+        try:
+            while request := await reader.readuntil(b"}"):
+                writer.write(inverter.answer(request.decode()).encode())
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
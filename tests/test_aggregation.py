@@ -0,0 +1,69 @@
+"""Test the Solarmax oversampling aggregation."""
+
+from custom_components.solarmax.aggregation import FieldAccumulator, WindowAggregator
+
+
+def test_field_accumulator():
+    """Test running mean/min/max."""
+    accumulator = FieldAccumulator()
+    assert accumulator.mean is None
+
+    for value in (100, 300, 200):
+        accumulator.add(value)
+
+    assert accumulator.count == 3
+    assert accumulator.mean == 200
+    assert accumulator.minimum == 100
+    assert accumulator.maximum == 300
+
+    accumulator.reset()
+    assert accumulator.count == 0
+    assert accumulator.mean is None
+
+
+def test_window_aggregator_publishes_after_window():
+    """Test samples are aggregated until the window is complete."""
+    aggregator = WindowAggregator(60, ["PAC"])
+
+    assert (
+        aggregator.add(
+            {
+                "PAC": {"value": 1000.0, "raw_value": 2000},
+                "KDY": {"value": 500, "raw_value": 500},
+            },
+            0,
+        )
+        is False
+    )
+    assert (
+        aggregator.add(
+            {
+                "PAC": {"value": 2000.0, "raw_value": 4000},
+                "KDY": {"value": 510, "raw_value": 510},
+            },
+            30,
+        )
+        is False
+    )
+    assert (
+        aggregator.add(
+            {
+                "PAC": {"value": 1500.0, "raw_value": 3000},
+                "KDY": {"value": 520, "raw_value": 520},
+            },
+            60,
+        )
+        is True
+    )
+
+    result = aggregator.flush()
+    assert result["PAC"]["value"] == 1500.0
+    assert result["PAC"]["min"] == 1000.0
+    assert result["PAC"]["max"] == 2000.0
+    assert result["PAC"]["samples"] == 3
+    # Counters publish their latest sample
+    assert result["KDY"] == {"value": 520, "raw_value": 520}
+
+    # A new window starts after flushing
+    assert aggregator.add({"PAC": {"value": 10.0, "raw_value": 20}}, 61) is False
+    assert aggregator.flush()["PAC"]["samples"] == 1
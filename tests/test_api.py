@@ -3,12 +3,17 @@
 import pytest
 from unittest.mock import patch, MagicMock
 import socket
+from datetime import date
 
 from custom_components.solarmax.solarmax_api import (
     SolarmaxAPI,
     SolarmaxConnectionError,
     SolarmaxTimeoutError,
     FIELD_MAP_INVERTER,
+    MAX_FRAME_LENGTH,
+    SolarmaxProtocolError,
+    parse_history_record,
+    response_length,
 )
 
 
@@ -28,6 +33,79 @@ def test_build_request(api):
     assert request.endswith("}")
 
 
+def test_build_request_bus_address():
+    """Test requests are sent to the configured bus address."""
+    api = SolarmaxAPI("192.168.1.100", 12345, address=10)
+
+    assert api.build_request({"PAC": "AC_Power (W)"}).startswith("{FB;0A;")
+
+
+def test_build_requests_splits_long_field_lists(api):
+    """Test that field lists beyond the one-byte length are split."""
+    field_map = {f"DD{index:02d}": "" for index in range(31)}
+    field_map.update({f"DM{index:02d}": "" for index in range(12)})
+    field_map.update({f"DY{index:02d}": "" for index in range(10)})
+
+    requests = api.build_requests(field_map)
+
+    # 31 daily records of up to 28 characters and 22 monthly and yearly
+    # ones of up to 18 characters fill 6 frames of 236 characters
+    assert len(requests) == 6
+    codes = []
+    for request in requests:
+        assert len(request) <= MAX_FRAME_LENGTH
+        assert int(request[7:9], 16) == len(request)
+        assert request[-5:-1] == api.calculate_checksum(request[1:-5])
+        codes.extend(request.split(":")[1].split("|")[0].split(";"))
+    assert sorted(codes) == sorted(field_map)
+
+
+def test_build_requests_worst_case_response(api):
+    """Test that even the longest possible responses fit into a frame."""
+    requests = api.build_requests({**FIELD_MAP_INVERTER, "DD00": "", "DM00": ""})
+
+    # A full poll plus history records takes two frames
+    assert len(requests) == 2
+    for request in requests:
+        codes = request.split(":")[1].split("|")[0].split(";")
+        response = api.build_response(
+            {code: "F" * (response_length(code) - len(code) - 1) for code in codes}
+        )
+        assert len(response) <= MAX_FRAME_LENGTH
+
+
+def test_build_requests_full_poll_single_frame(api):
+    """Test the standard field set is read with a single request."""
+    requests = api.build_requests(FIELD_MAP_INVERTER)
+
+    assert len(requests) == 1
+    codes = requests[0].split(":")[1].split("|")[0].split(";")
+    assert sorted(codes) == sorted(FIELD_MAP_INVERTER)
+    response = api.build_response(
+        {code: "F" * (response_length(code) - len(code) - 1) for code in codes}
+    )
+    assert len(response) <= MAX_FRAME_LENGTH
+
+
+def test_build_request_too_long(api):
+    """Test that an oversized frame is refused instead of truncated."""
+    with pytest.raises(SolarmaxProtocolError):
+        api.build_request({f"X{index:03d}": "" for index in range(60)})
+
+
+def test_build_response(api):
+    """Test responses carry a valid length and checksum."""
+    frame = api.build_response({"PAC": "BB8", "SYS": "4E33,0"})
+
+    assert frame.startswith("{01;FB;25|64:PAC=BB8;SYS=4E33,0|")
+    assert int(frame[7:9], 16) == len(frame)
+    assert frame[-5:-1] == api.calculate_checksum(frame[1:-5])
+    api.verify_frame(frame)
+    assert (
+        SolarmaxAPI("x", address=12).build_response({"PAC": "0"}).startswith("{0C;FB;")
+    )
+
+
 def test_calculate_checksum(api):
     """Test checksum calculation."""
     data = "FB;01;3A|64:PAC|"
@@ -74,6 +152,26 @@ def test_test_connection_success(mock_socket, api):
     mock_sock.close.assert_called_once()
 
 
+@patch("socket.socket")
+def test_exchange_keeps_connection(mock_socket, api):
+    """Test forwarded frames share a connection the own requests close."""
+    forwarding = MagicMock()
+    forwarding.recv.return_value = b"{01;FB;18|64:DD00=0|0502}"
+    own = MagicMock()
+    own.recv.return_value = b"{01;FB;18|64:PAC=0|04E3}"
+    mock_socket.side_effect = [forwarding, own]
+    request = api.build_request({"DD00": ""})
+
+    api.exchange(request)
+    api.exchange(request)
+    assert forwarding.connect.call_count == 1
+    assert forwarding.send.call_count == 2
+    forwarding.close.assert_not_called()
+
+    assert api.test_connection() is True
+    forwarding.close.assert_called_once()
+
+
 @patch("socket.socket")
 def test_test_connection_failure(mock_socket, api):
     """Test failed connection test."""
@@ -101,6 +199,98 @@ def test_get_data_success(mock_socket, api):
     mock_sock.close.assert_called()
 
 
+def _frame(api, payload):
+    """Return a response frame with a valid length and checksum."""
+    body = f"01;FB;00|64:{payload}|"
+    frame = "{" + body + "0000}"
+    frame = frame.replace(";00|", f";{len(frame):02X}|", 1)
+    return frame[:-5] + api.calculate_checksum(frame[1:-5]) + "}"
+
+
+@patch("socket.socket")
+def test_get_data_merges_split_requests(mock_socket, api):
+    """Test that responses to split requests are merged."""
+    mock_sock = MagicMock()
+    mock_socket.return_value = mock_sock
+    mock_sock.recv.side_effect = [
+        _frame(api, "PAC=BB8").encode(),
+        _frame(api, "KDY=11").encode(),
+    ]
+    field_map = {"PAC": "AC_Power (W)", "KDY": "Energy_Day (Wh)"}
+
+    with patch.object(
+        api,
+        "build_requests",
+        return_value=[api.build_request({"PAC": ""}), api.build_request({"KDY": ""})],
+    ):
+        result = api.get_data(field_map)
+
+    assert set(result) == {"PAC", "KDY"}
+    assert mock_sock.send.call_count == 2
+    mock_sock.connect.assert_called_once()
+
+
+def test_verify_frame(api):
+    """Test length and checksum verification of response frames."""
+    frame = _frame(api, "PAC=BB8;SYS=4E33,0")
+    api.verify_frame(frame)
+
+    with pytest.raises(SolarmaxProtocolError):
+        api.verify_frame(frame.replace("BB8", "BB9"))
+    with pytest.raises(SolarmaxProtocolError):
+        api.verify_frame(frame[:-5] + "0000}")
+    # Frames without header and trailer are accepted unchecked
+    api.verify_frame("{01|64:PAC=BB8|}")
+
+
+def test_convert_to_json_keeps_valid_fields(api):
+    """Test that one malformed value does not discard the whole response."""
+    result = api.convert_to_json(
+        FIELD_MAP_INVERTER, _frame(api, "PAC=BB8;UL1=ZZ;KDY=11")
+    )
+
+    assert set(result) == {"PAC", "KDY"}
+
+
+@patch("socket.socket")
+def test_get_data_retries_corrupt_group(mock_socket, api):
+    """Test that only the field group with corrupt values is read again."""
+    mock_sock = MagicMock()
+    mock_socket.return_value = mock_sock
+    mock_sock.recv.side_effect = [
+        _frame(api, "PAC=BB8;PDC=C80;UL1=ZZ;KDY=11").encode(),
+        _frame(api, "UL1=906;UL2=8FC").encode(),
+    ]
+    field_map = {
+        code: FIELD_MAP_INVERTER[code] for code in ("PAC", "PDC", "UL1", "UL2", "KDY")
+    }
+
+    result = api.get_data(field_map)
+
+    assert result["UL1"]["value"] == 231.0
+    assert result["PAC"]["value"] == 1500
+    assert mock_sock.send.call_count == 2
+    retry = mock_sock.send.call_args_list[1][0][0].decode()
+    assert sorted(api._request_codes(retry)) == ["UL1", "UL2"]
+
+
+@patch("socket.socket")
+def test_get_data_retries_failed_checksum(mock_socket, api):
+    """Test that a frame failing the checksum is requested again."""
+    mock_sock = MagicMock()
+    mock_socket.return_value = mock_sock
+    good = _frame(api, "PAC=BB8")
+    mock_sock.recv.side_effect = [
+        (good[:-5] + "0000}").encode(),
+        good.encode(),
+    ]
+
+    result = api.get_data({"PAC": "AC_Power (W)"})
+
+    assert result["PAC"]["raw_value"] == 0xBB8
+    assert mock_sock.send.call_count == 2
+
+
 @patch("socket.socket")
 def test_get_data_connection_error(mock_socket, api):
     """Test data retrieval with connection error."""
@@ -157,3 +347,37 @@ def test_last_successful_connection_tracking(api):
         api.get_data()
 
         assert api.last_successful_connection is not None
+
+
+def test_parse_history_record():
+    """Test decoding daily, monthly and yearly history records."""
+    day = parse_history_record("DD00", "7DE0714,11,8AE,37")
+    assert day.date == date(2014, 7, 20)
+    assert day.energy == 1.7
+    assert day.peak_power == 1111.0
+    assert day.hours == 5.5
+
+    month = parse_history_record("DM01", "7DE07,9C4")
+    assert month.date == date(2014, 7, 1)
+    assert month.energy == 250.0
+
+    year = parse_history_record("DY00", "7DE,1D4C")
+    assert year.date == date(2014, 1, 1)
+
+    # Unused history slots are empty
+    assert parse_history_record("DD30", "0,0,0,0") is None
+
+
+@patch("socket.socket")
+def test_get_history(mock_socket, api):
+    """Test reading a batch of history records."""
+    mock_sock = MagicMock()
+    mock_socket.return_value = mock_sock
+    mock_sock.recv.return_value = b"{01|64:DD00=7DE0714,11,8AE,37;DD01=0,0,0,0|}"
+
+    records = api.get_history(["DD00", "DD01"])
+
+    assert records["DD00"].energy == 1.7
+    assert records["DD01"] is None
+    request = mock_sock.send.call_args[0][0].decode()
+    assert "DD00;DD01" in request
@@ -0,0 +1,139 @@
+"""Test the Solarmax history backfill."""
+
+import asyncio
+import time
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.solarmax.backfill import HISTORY_CODES, HistoryBackfill
+from custom_components.solarmax.ratelimit import TokenBucket
+from custom_components.solarmax.solarmax_api import (
+    HistoryRecord,
+    SolarmaxTimeoutError,
+)
+
+
+@pytest.fixture
+def coordinator():
+    """Return a mock coordinator with an idle gateway."""
+    coordinator = MagicMock()
+    coordinator.last_update_success = True
+    coordinator.gateway_bucket = TokenBucket(0)
+    coordinator.async_run_io = AsyncMock(side_effect=lambda fn, *args: fn(*args))
+    return coordinator
+
+
+def _history(codes):
+    """Return one record per day code, empty slots for everything else."""
+    return {
+        code: (
+            HistoryRecord(date(2024, 6, 30) - timedelta(days=int(code[2:])), 10.0)
+            if code.startswith("DD")
+            else None
+        )
+        for code in codes
+    }
+
+
+async def test_backfill_reads_batches_and_imports(
+    hass: HomeAssistant, mock_config_entry, coordinator
+):
+    """Test history is read batch by batch after live polls and imported."""
+    coordinator.api.get_history.side_effect = _history
+    backfill = HistoryBackfill(hass, mock_config_entry, coordinator)
+
+    with patch(
+        "custom_components.solarmax.backfill.async_add_external_statistics"
+    ) as mock_add:
+        await backfill.async_start()
+        for _ in range(len(HISTORY_CODES)):
+            backfill._handle_coordinator_update()
+            await hass.async_block_till_done()
+
+    batches = [call[0][0] for call in coordinator.api.get_history.call_args_list]
+    assert [code for batch in batches for code in batch] == list(HISTORY_CODES)
+    assert max(len(batch) for batch in batches) <= 8
+
+    mock_add.assert_called_once()
+    metadata, statistics = mock_add.call_args[0][1], mock_add.call_args[0][2]
+    assert metadata["statistic_id"].endswith("_daily_yield")
+    assert len(statistics) == 31
+    assert statistics[-1]["sum"] == 310.0
+
+
+async def test_backfill_waits_for_gateway_budget(
+    hass: HomeAssistant, mock_config_entry, coordinator
+):
+    """Test a batch is read once the poll's request spacing has passed."""
+    coordinator.api.get_history.side_effect = _history
+    coordinator.gateway_bucket = TokenBucket(0.2)
+    backfill = HistoryBackfill(hass, mock_config_entry, coordinator)
+    await backfill.async_start()
+
+    # The live poll takes the gateway's only token
+    assert coordinator.gateway_bucket.try_acquire()
+    polled = time.monotonic()
+    backfill._handle_coordinator_update()
+    await hass.async_block_till_done()
+
+    coordinator.api.get_history.assert_called_once()
+    assert time.monotonic() - polled >= 0.15
+    assert not coordinator.gateway_bucket.try_acquire()
+
+
+async def test_backfill_stop_cancels_waiting_batch(
+    hass: HomeAssistant, mock_config_entry, coordinator
+):
+    """Test a batch still waiting for the gateway is dropped on stop."""
+    coordinator.gateway_bucket = TokenBucket(60)
+    coordinator.gateway_bucket.try_acquire()
+    backfill = HistoryBackfill(hass, mock_config_entry, coordinator)
+    await backfill.async_start()
+
+    backfill._handle_coordinator_update()
+    await asyncio.sleep(0)
+    backfill.async_stop()
+    await hass.async_block_till_done()
+
+    coordinator.api.get_history.assert_not_called()
+
+
+async def test_backfill_retries_failed_batch(
+    hass: HomeAssistant, mock_config_entry, coordinator
+):
+    """Test a failed batch is retried instead of skipped."""
+    coordinator.api.get_history.side_effect = SolarmaxTimeoutError("Timeout")
+    backfill = HistoryBackfill(hass, mock_config_entry, coordinator)
+    await backfill.async_start()
+
+    backfill._handle_coordinator_update()
+    await hass.async_block_till_done()
+    backfill._handle_coordinator_update()
+    await hass.async_block_till_done()
+
+    assert coordinator.api.get_history.call_count == 2
+    assert coordinator.api.get_history.call_args[0][0][0] == "DD00"
+
+
+async def test_backfill_resumes_from_checkpoint(
+    hass: HomeAssistant, mock_config_entry, coordinator
+):
+    """Test an interrupted backfill continues at the stored position."""
+    coordinator.api.get_history.side_effect = _history
+    backfill = HistoryBackfill(hass, mock_config_entry, coordinator)
+
+    with patch.object(
+        backfill._store,
+        "async_load",
+        return_value={"next_index": 16, "records": {"DD": {"2024-06-01": 5.0}}},
+    ):
+        await backfill.async_start()
+
+    backfill._handle_coordinator_update()
+    await hass.async_block_till_done()
+
+    assert coordinator.api.get_history.call_args[0][0][0] == HISTORY_CODES[16]
+    assert backfill._records["DD"]["2024-06-01"] == 5.0
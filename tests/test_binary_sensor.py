@@ -0,0 +1,85 @@
+"""Test the Solarmax binary sensors."""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.solarmax.binary_sensor import SolarmaxBinarySensor
+from custom_components.solarmax.const import BINARY_SENSOR_TYPES
+from custom_components.solarmax.coordinator import SolarmaxCoordinator
+from custom_components.solarmax.snapshot import Snapshot
+
+
+@pytest.fixture
+def mock_coordinator():
+    """Create a mock coordinator."""
+    coordinator = Mock(spec=SolarmaxCoordinator)
+    coordinator.data = Snapshot.from_data({"SAL": {"value": 0, "raw_value": 0}})
+    coordinator.last_update_success = True
+    coordinator.is_expected_offline = False
+    coordinator.consecutive_failures = 0
+    coordinator.last_successful_update = datetime(2024, 6, 1, 12, 0, 0)
+    coordinator.api = Mock(last_successful_connection=None)
+    coordinator.is_field_fresh.return_value = True
+    coordinator.hass = Mock(spec=HomeAssistant)
+    coordinator.hass.states = Mock()
+    return coordinator
+
+
+@pytest.fixture
+def mock_config_entry():
+    """Create a mock config entry."""
+    entry = Mock(spec=ConfigEntry)
+    entry.entry_id = "test_entry_id"
+    entry.data = {"host": "192.168.1.100", "port": 12345}
+    return entry
+
+
+def _binary_sensor(coordinator, entry, key):
+    """Create a binary sensor of the given type."""
+    return SolarmaxBinarySensor(
+        coordinator, entry, key, BINARY_SENSOR_TYPES[key], "Test Inverter"
+    )
+
+
+def test_connectivity(mock_coordinator, mock_config_entry):
+    """Test the connectivity sensor follows the coordinator."""
+    sensor = _binary_sensor(mock_coordinator, mock_config_entry, "connectivity")
+
+    assert sensor.unique_id == "test_entry_id-connectivity"
+    assert sensor.is_on is True
+    assert sensor.extra_state_attributes == {
+        "consecutive_failures": 0,
+        "last_successful_update": "2024-06-01T12:00:00",
+    }
+
+    mock_coordinator.last_update_success = False
+    mock_coordinator.consecutive_failures = 3
+    assert sensor.is_on is False
+    assert sensor.available is True
+    assert sensor.extra_state_attributes["consecutive_failures"] == 3
+
+
+def test_expected_offline(mock_coordinator, mock_config_entry):
+    """Test the expected offline sensor."""
+    sensor = _binary_sensor(mock_coordinator, mock_config_entry, "expected_offline")
+    assert sensor.is_on is False
+
+    mock_coordinator.is_expected_offline = True
+    assert sensor.is_on is True
+
+
+def test_alarm_active(mock_coordinator, mock_config_entry):
+    """Test the alarm sensor reads the SAL code."""
+    sensor = _binary_sensor(mock_coordinator, mock_config_entry, "alarm_active")
+    assert sensor.is_on is False
+
+    mock_coordinator.data = Snapshot.from_data({"SAL": {"value": 4, "raw_value": 4}})
+    assert sensor.is_on is True
+    assert sensor.extra_state_attributes == {"code": 4}
+
+    mock_coordinator.data = Snapshot.from_data({})
+    assert sensor.is_on is None
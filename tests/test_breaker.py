@@ -0,0 +1,94 @@
+"""Test the Solarmax circuit breaker."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.solarmax.breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+from custom_components.solarmax.solarmax_api import (
+    SolarmaxAPI,
+    SolarmaxCircuitOpenError,
+    SolarmaxConnectionError,
+)
+
+
+def test_breaker_opens_after_threshold():
+    """Test the breaker opens after the configured number of failures."""
+    breaker = CircuitBreaker(failure_threshold=3, probe_delay=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.as_dict() == {
+        "state": STATE_OPEN,
+        "failures": 3,
+        "next_probe_in": 30,
+    }
+
+
+def test_breaker_probe_schedule_backs_off():
+    """Test failed probes double the delay up to the maximum."""
+    with patch("custom_components.solarmax.breaker.time.monotonic") as mock_time:
+        mock_time.return_value = 0.0
+        breaker = CircuitBreaker(
+            failure_threshold=1, probe_delay=30, max_probe_delay=100
+        )
+        breaker.record_failure()
+        assert breaker.state == STATE_OPEN
+
+        mock_time.return_value = 30.0
+        assert breaker.state == STATE_HALF_OPEN
+        breaker.record_failure()
+        assert breaker.next_probe_in == 60
+
+        mock_time.return_value = 90.0
+        breaker.record_failure()
+        assert breaker.next_probe_in == 100
+
+        breaker.record_success()
+        assert breaker.state == STATE_CLOSED
+        assert breaker.failures == 0
+
+
+@patch("socket.socket")
+def test_api_suspends_polls_while_open(mock_socket):
+    """Test an open breaker refuses polls without connecting."""
+    api = SolarmaxAPI("192.168.1.100", 12345, breaker=CircuitBreaker(1))
+    mock_socket.side_effect = OSError("Connection failed")
+
+    with patch("custom_components.solarmax.solarmax_api.time.sleep"):
+        with pytest.raises(SolarmaxConnectionError):
+            api.get_data()
+    assert api.breaker.state == STATE_OPEN
+
+    mock_socket.reset_mock()
+    with pytest.raises(SolarmaxCircuitOpenError):
+        api.get_data()
+    mock_socket.assert_not_called()
+
+
+@patch("socket.socket")
+def test_api_probe_closes_breaker(mock_socket):
+    """Test a successful half-open probe resumes full polls."""
+    breaker = CircuitBreaker(1, probe_delay=0)
+    breaker.record_failure()
+    api = SolarmaxAPI("192.168.1.100", 12345, breaker=breaker)
+    mock_sock = MagicMock()
+    mock_socket.return_value = mock_sock
+    mock_sock.recv.return_value = b"{01|64:PAC=BB8;SYS=4E33,0|}"
+
+    assert breaker.state == STATE_HALF_OPEN
+    data = api.get_data()
+
+    assert data["PAC"]["value"] == 1500
+    assert breaker.state == STATE_CLOSED
+    probe = mock_sock.send.call_args_list[0][0][0].decode()
+    assert "|64:SYS|" in probe
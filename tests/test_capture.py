@@ -0,0 +1,123 @@
+"""Test the Solarmax frame capture and replay."""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.solarmax.capture import FrameCapture, ReplayAPI, read_capture
+from custom_components.solarmax.coordinator import SolarmaxCoordinator
+from custom_components.solarmax.solarmax_api import (
+    FIELD_MAP_INVERTER,
+    SolarmaxAPI,
+    SolarmaxConnectionError,
+)
+
+CAPTURE_DAY = os.path.join(os.path.dirname(__file__), "fixtures", "capture_day.log")
+
+
+def test_capture_roundtrip(tmp_path):
+    """Test frames are written and read back unchanged."""
+    path = str(tmp_path / "capture.log")
+    capture = FrameCapture(path)
+    capture.record(">", "{FB;01;1A|64:PAC|0560}")
+    capture.record("<", "{01;FB;1E|64:PAC=BB8|\n0646}")
+    capture.close()
+
+    frames = read_capture(path)
+    assert [frame.direction for frame in frames] == [">", "<"]
+    assert frames[1].frame == "{01;FB;1E|64:PAC=BB8|\n0646}"
+    assert frames[0].timestamp <= frames[1].timestamp
+
+
+def test_capture_rotation(tmp_path):
+    """Test the capture file is size capped and rotated."""
+    path = str(tmp_path / "capture.log")
+    capture = FrameCapture(path, max_bytes=200, backup_count=2)
+    for _ in range(20):
+        capture.record("<", "{01;FB;1E|64:PAC=BB8|0646}")
+    capture.close()
+
+    assert os.path.getsize(path) <= 200
+    assert os.path.exists(f"{path}.1")
+    assert os.path.exists(f"{path}.2")
+    assert not os.path.exists(f"{path}.3")
+
+
+@patch("socket.socket")
+def test_api_records_frames(mock_socket, tmp_path):
+    """Test the API writes request and response frames to the capture."""
+    mock_sock = MagicMock()
+    mock_socket.return_value = mock_sock
+    mock_sock.recv.return_value = b"{01|64:PAC=BB8|}"
+    path = str(tmp_path / "capture.log")
+    api = SolarmaxAPI("192.168.1.100", 12345, capture=FrameCapture(path))
+
+    api.get_data()
+    api.capture.close()
+
+    frames = read_capture(path)
+    assert frames[0].direction == ">"
+    assert frames[0].frame.startswith("{FB;01;")
+    assert frames[1].frame == "{01|64:PAC=BB8|}"
+
+
+def test_replay_parser_regression():
+    """Test a captured day decodes to the expected values."""
+    samples = list(ReplayAPI(CAPTURE_DAY).replay_all())
+
+    assert len(samples) == 10
+    assert [sample["SYS"]["value"] for sample in samples[:3]] == [
+        20000,
+        20018,
+        20019,
+    ]
+    assert max(sample["PAC"]["value"] for sample in samples) == 4620.0
+    assert samples[-1]["KDY"]["value"] == 18300
+    assert samples[5]["UL1"]["value"] == 230.0
+    assert samples[5]["IL1"]["value"] == 6.69
+
+
+def test_replay_speed():
+    """Test replay reproduces captured timing scaled by speed."""
+    api = ReplayAPI(CAPTURE_DAY, speed=10.0)
+    with patch("custom_components.solarmax.capture.time.sleep") as mock_sleep:
+        list(api.replay_all())
+
+    delays = [call[0][0] for call in mock_sleep.call_args_list]
+    # One latency per response plus the gap before every following poll
+    assert len(delays) == 19
+    assert delays[0] == pytest.approx(0.018)
+    assert sum(delays) == pytest.approx(27.0, abs=0.1)
+
+
+def test_replay_keeps_captured_framing():
+    """Test requests are sent in the frames they were captured in."""
+    api = ReplayAPI(CAPTURE_DAY)
+    captured = read_capture(CAPTURE_DAY)[0].frame
+
+    assert api.build_requests(FIELD_MAP_INVERTER) == [captured]
+    # Packed as usual, the fields come in another order
+    assert SolarmaxAPI("replay").build_requests(FIELD_MAP_INVERTER) != [captured]
+    # Requests the capture has no frames for are packed as usual
+    assert api.build_requests({"PAC": ""}) == SolarmaxAPI("replay").build_requests(
+        {"PAC": ""}
+    )
+
+
+async def test_replay_through_coordinator(hass: HomeAssistant, mock_config_entry):
+    """Test captured frames feed the coordinator like a live inverter."""
+    mock_config_entry.add_to_hass(hass)
+    coordinator = SolarmaxCoordinator(hass, mock_config_entry)
+    coordinator.api = ReplayAPI(CAPTURE_DAY)
+
+    values = []
+    for _ in range(10):
+        data = await coordinator._async_update_data()
+        values.append(data.value("PAC"))
+
+    assert values[4] == 4150.0
+    with patch("custom_components.solarmax.solarmax_api.time.sleep"):
+        with pytest.raises(SolarmaxConnectionError):
+            coordinator.api.get_data()
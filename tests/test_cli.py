@@ -0,0 +1,196 @@
+"""Test the headless Solarmax poller."""
+
+import argparse
+import csv
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.solarmax import cli
+from custom_components.solarmax.solarmax_api import (
+    FIELD_GROUPS,
+    FIELD_MAP_INVERTER,
+    SolarmaxCircuitOpenError,
+    SolarmaxTimeoutError,
+)
+
+CLI_PATH = Path(cli.__file__)
+
+
+def _fake_get_data(field_map=None):
+    """Return a sample for every requested field."""
+    return {code: {"value": 1.5, "raw_value": 3} for code in field_map}
+
+
+def test_parse_target():
+    """Test parsing inverter addresses."""
+    assert cli.parse_target("192.168.1.100") == ("192.168.1.100", 12345)
+    assert cli.parse_target("inverter.local:12346") == ("inverter.local", 12346)
+
+    with pytest.raises(argparse.ArgumentTypeError):
+        cli.parse_target("inverter.local:port")
+
+
+def test_parse_tier():
+    """Test parsing tier arguments."""
+    assert cli.parse_tier("power=2.5") == ("power", 2.5)
+
+    for value in ("power", "unknown=5", "power=0", "power=fast"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            cli.parse_tier(value)
+
+
+def test_build_tiers():
+    """Test that untiered fields share the base interval."""
+    tiers = cli.build_tiers(10, [("power", 2), ("energy", 300)])
+
+    assert [(tier.name, tier.interval) for tier in tiers] == [
+        ("power", 2),
+        ("energy", 300),
+        ("default", 10),
+    ]
+    assert set(tiers[0].field_map) == set(FIELD_GROUPS["power"])
+    assert not set(tiers[2].field_map) & set(FIELD_GROUPS["power"])
+    assert sum(len(tier.field_map) for tier in tiers) == len(FIELD_MAP_INVERTER)
+
+    # Without tiers everything is polled together
+    (tier,) = cli.build_tiers(10, [])
+    assert tier.field_map == FIELD_MAP_INVERTER
+
+
+def test_latency_stats():
+    """Test the latency summary."""
+    stats = cli.LatencyStats()
+    for latency in range(1, 21):
+        stats.add_success(latency / 1000)
+    stats.add_failure()
+    stats.add_failure(suspended=True)
+
+    summary = stats.summary()
+
+    assert summary["polls"] == 22
+    assert summary["failures"] == 1
+    assert summary["suspended"] == 1
+    assert summary["min_ms"] == 1.0
+    assert summary["mean_ms"] == 10.5
+    assert summary["p50_ms"] == 10.0
+    assert summary["p95_ms"] == 19.0
+    assert summary["max_ms"] == 20.0
+
+    assert cli.LatencyStats().summary() == {"polls": 0, "failures": 0, "suspended": 0}
+
+
+async def _run(argv):
+    """Run the poller with a fake API and return the output."""
+    args = cli.build_parser().parse_args(argv)
+    pollers = cli.build_pollers(args)
+    stream = io.StringIO()
+    await cli.run(args, stream, pollers)
+    return stream.getvalue(), pollers
+
+
+async def test_run_ndjson():
+    """Test streaming samples of several inverters and tiers as NDJSON."""
+    with patch(
+        "custom_components.solarmax.cli.SolarmaxAPI.get_data",
+        side_effect=_fake_get_data,
+    ):
+        output, pollers = await _run(
+            ["inv1", "inv2:12346", "-t", "power=0.01", "-i", "0.01", "-n", "2"]
+        )
+
+    records = [json.loads(line) for line in output.splitlines()]
+    # Two inverters, two tiers, two polls each
+    assert len(records) == 8
+    power = [r for r in records if r["host"] == "inv2" and r["tier"] == "power"]
+    assert len(power) == 2
+    assert power[0]["port"] == 12346
+    assert set(power[0]["data"]) == set(FIELD_GROUPS["power"])
+    assert power[0]["data"]["PAC"] == {"value": 1.5, "raw_value": 3}
+    assert power[0]["timestamp"].endswith("+00:00")
+
+    assert pollers["inv1:12345"].stats.polls == 4
+    assert len(pollers["inv1:12345"].stats.latencies) == 4
+
+
+async def test_run_csv_with_errors():
+    """Test streaming CSV rows, including failed polls."""
+    results = [
+        {"PAC": {"value": 1500.0, "raw_value": 3000}},
+        SolarmaxTimeoutError("No response received within timeout period"),
+        SolarmaxCircuitOpenError("Polling suspended"),
+    ]
+    with patch(
+        "custom_components.solarmax.cli.SolarmaxAPI.get_data", side_effect=results
+    ):
+        output, pollers = await _run(["inv1", "-f", "csv", "-i", "0", "-n", "3"])
+
+    rows = list(csv.DictReader(io.StringIO(output)))
+    assert list(rows[0]) == list(cli.CSV_COLUMNS)
+    assert len(rows) == 3
+    assert rows[0]["field"] == "PAC"
+    assert rows[0]["value"] == "1500.0"
+    assert rows[0]["raw_value"] == "3000"
+    assert rows[0]["error"] == ""
+    assert rows[1]["error"].startswith("SolarmaxTimeoutError")
+    assert rows[2]["error"].startswith("SolarmaxCircuitOpenError")
+
+    stats = pollers["inv1:12345"].stats
+    assert (stats.polls, stats.failures, stats.suspended) == (3, 1, 1)
+    assert "inv1:12345" in cli.format_stats(pollers)
+
+
+async def test_run_duration():
+    """Test that an open-ended run stops after the duration."""
+    with patch(
+        "custom_components.solarmax.cli.SolarmaxAPI.get_data",
+        side_effect=_fake_get_data,
+    ):
+        output, pollers = await _run(["inv1", "-i", "0.01", "-d", "0.1"])
+
+    assert pollers["inv1:12345"].stats.polls >= 2
+    assert len(output.splitlines()) == pollers["inv1:12345"].stats.polls
+
+
+def test_main_writes_file(tmp_path, capsys):
+    """Test writing samples to a file and the report to stderr."""
+    output = tmp_path / "samples.ndjson"
+    with patch(
+        "custom_components.solarmax.cli.SolarmaxAPI.get_data",
+        side_effect=_fake_get_data,
+    ):
+        assert cli.main(["inv1", "-n", "1", "-o", str(output)]) == 0
+
+    assert json.loads(output.read_text())["host"] == "inv1"
+    report = capsys.readouterr().err
+    assert "p95_ms" in report
+    assert "inv1:12345" in report
+
+
+def test_script_runs_without_package_import():
+    """Test that the file runs standalone, without the integration package."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import runpy, sys\n"
+            "sys.argv = ['cli', '--help']\n"
+            "try:\n"
+            f"    runpy.run_path({str(CLI_PATH)!r}, run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('homeassistant' in sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "HOST[:PORT]" in result.stdout
+    assert result.stdout.splitlines()[-1] == "False"
@@ -7,13 +7,20 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
-from custom_components.solarmax.config_flow import CannotConnect, InvalidAuth
+from custom_components.solarmax.config_flow import (
+    CannotConnect,
+    ConfigFlow,
+    InvalidAuth,
+    OptionsFlow,
+)
 from custom_components.solarmax.const import (
     DOMAIN,
     CONF_HOST,
     CONF_PORT,
     CONF_DEVICE_NAME,
     CONF_UPDATE_INTERVAL,
+    CONF_PROTOCOL,
+    PROTOCOL_MODBUS,
 )
 
 
@@ -220,3 +227,75 @@ async def test_options_flow_connection_error(mock_api, hass: HomeAssistant) -> N
     # This will likely fail in tests since we don't have a real inverter
     # In real tests, you would mock the connection
     assert result2["type"] in [FlowResultType.CREATE_ENTRY, FlowResultType.FORM]
+
+
+async def test_options_flow_deadband(hass: HomeAssistant, mock_config_entry) -> None:
+    """Test configuring a sensor deadband through the options flow."""
+    mock_config_entry.add_to_hass(hass)
+    flow = OptionsFlow(mock_config_entry)
+    flow.hass = hass
+
+    with (
+        patch(
+            "custom_components.solarmax.config_flow.validate_input",
+            AsyncMock(return_value={"title": "Test Inverter"}),
+        ),
+        patch.object(hass.config_entries, "async_reload", AsyncMock()),
+    ):
+        result = await flow.async_step_init(
+            {
+                CONF_HOST: "192.168.1.100",
+                CONF_PORT: 12345,
+                CONF_DEVICE_NAME: "Test Inverter",
+                CONF_UPDATE_INTERVAL: 30,
+                "configure_deadband": True,
+            }
+        )
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "deadband"
+
+        result = await flow.async_step_deadband(
+            {
+                "deadband_sensor": "PAC",
+                "deadband_absolute": 25.0,
+                "deadband_relative": 0,
+                "deadband_max_age": 300,
+            }
+        )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.data["deadbands"] == {
+        "PAC": {
+            "deadband_absolute": 25.0,
+            "deadband_relative": 0,
+            "deadband_max_age": 300,
+        }
+    }
+    assert "configure_deadband" not in mock_config_entry.data
+
+
+@pytest.mark.parametrize(
+    ("protocol", "port"), [("maxtalk", 12345), (PROTOCOL_MODBUS, 502)]
+)
+async def test_user_step_defaults_port(hass: HomeAssistant, protocol, port) -> None:
+    """Test an empty port is set to the standard port of the protocol."""
+    flow = ConfigFlow()
+    flow.hass = hass
+    flow.context = {"source": config_entries.SOURCE_USER}
+
+    with patch(
+        "custom_components.solarmax.config_flow.validate_input",
+        AsyncMock(return_value={"title": "Test Inverter"}),
+    ) as mock_validate:
+        result = await flow.async_step_user(
+            {
+                CONF_HOST: "192.168.1.100",
+                CONF_PROTOCOL: protocol,
+                CONF_DEVICE_NAME: "Test Inverter",
+            }
+        )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_PORT] == port
+    assert mock_validate.call_args[0][1][CONF_PORT] == port
+    assert flow.unique_id == f"192.168.1.100:{port}"
@@ -1,14 +1,19 @@
 """Test the Solarmax coordinator."""
 
+import asyncio
+
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, AsyncMock, MagicMock
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.update_coordinator import UpdateFailed
 
 from custom_components.solarmax.coordinator import SolarmaxCoordinator
+from custom_components.solarmax.snapshot import Snapshot
 from custom_components.solarmax.solarmax_api import (
     SolarmaxConnectionError,
     SolarmaxTimeoutError,
@@ -17,7 +22,9 @@ from custom_components.solarmax.const import (
     DOMAIN,
     CONF_HOST,
     CONF_PORT,
+    CONF_PUBLISH_INTERVAL,
     CONF_UPDATE_INTERVAL,
+    HEALTH_WINDOW_SIZE,
 )
 
 
@@ -181,3 +188,349 @@ async def test_coordinator_recovery_after_failures(mock_api_class, coordinator):
     assert result is not None
     assert coordinator.consecutive_failures == 0
     assert coordinator.last_successful_update is not None
+
+
+async def test_refresh_fields_coalesces_concurrent_calls(coordinator):
+    """Test concurrent on-demand refreshes share one poll."""
+    mock_api = MagicMock()
+    mock_api.get_data.return_value = {"PAC": {"value": 1500.0, "raw_value": 3000}}
+    coordinator.api = mock_api
+    coordinator.data = Snapshot.from_data({"KDY": {"value": 1234, "raw_value": 1234}})
+
+    await asyncio.gather(
+        coordinator.async_refresh_fields("power"),
+        coordinator.async_refresh_fields("power"),
+        coordinator.async_refresh_fields("power"),
+    )
+
+    assert mock_api.get_data.call_count == 1
+    requested = mock_api.get_data.call_args[0][0]
+    assert set(requested) == {"PAC", "PDC", "PD01", "PD02"}
+    # Fields outside the group are kept
+    assert coordinator.data.value("KDY") == 1234
+    assert coordinator.data.value("PAC") == 1500.0
+
+
+async def test_refresh_fields_waits_for_gateway_spacing(coordinator):
+    """Test on-demand refreshes are spaced by the gateway token bucket."""
+    mock_api = MagicMock()
+    mock_api.get_data.return_value = {"PAC": {"value": 1500.0, "raw_value": 3000}}
+    coordinator.api = mock_api
+
+    with patch.object(
+        coordinator._gateway_bucket, "async_acquire", AsyncMock()
+    ) as mock_acquire:
+        await coordinator.async_refresh_fields("power")
+        await coordinator.async_refresh_fields("energy")
+
+    assert mock_acquire.await_count == 2
+    assert mock_api.get_data.call_count == 2
+
+
+async def test_refresh_fields_no_data(coordinator):
+    """Test an empty group response is reported as a failure."""
+    mock_api = MagicMock()
+    mock_api.get_data.return_value = {}
+    coordinator.api = mock_api
+
+    with pytest.raises(UpdateFailed):
+        await coordinator.async_refresh_fields("power")
+
+
+async def test_refresh_all_fields_failure(coordinator):
+    """Test a failed full on-demand refresh is raised to the caller."""
+    mock_api = MagicMock()
+    mock_api.get_data.side_effect = SolarmaxConnectionError("Connection failed")
+    coordinator.api = mock_api
+
+    with pytest.raises(HomeAssistantError):
+        await coordinator.async_refresh_fields()
+    assert coordinator.last_update_success is False
+
+
+async def test_refresh_fields_aggregated(hass: HomeAssistant):
+    """Test on-demand group results go through the window aggregator."""
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Test Inverter",
+        data={
+            CONF_HOST: "192.168.1.100",
+            CONF_PORT: 12345,
+            CONF_UPDATE_INTERVAL: 5,
+            CONF_PUBLISH_INTERVAL: 60,
+        },
+        source="user",
+        entry_id="test_entry",
+        unique_id="192.168.1.100:12345",
+    )
+    coordinator = SolarmaxCoordinator(hass, entry)
+    mock_api = MagicMock()
+    coordinator.api = mock_api
+
+    with (
+        patch("custom_components.solarmax.coordinator.time.monotonic") as mock_time,
+        patch.object(coordinator._gateway_bucket, "async_acquire", AsyncMock()),
+    ):
+        mock_time.return_value = 0
+        mock_api.get_data.return_value = {"PAC": {"value": 1000.0, "raw_value": 2000}}
+        coordinator.data = await coordinator._async_update_data()
+
+        # Inside the window the sample only joins the aggregate
+        mock_time.return_value = 30
+        mock_api.get_data.return_value = {"PAC": {"value": 3000.0, "raw_value": 6000}}
+        published = coordinator.data
+        await coordinator.async_refresh_fields("power")
+        assert coordinator.data is published
+
+        mock_time.return_value = 90
+        mock_api.get_data.return_value = {"PAC": {"value": 2000.0, "raw_value": 4000}}
+        await coordinator.async_refresh_fields("power")
+
+    assert coordinator.data.value("PAC") == 2500.0
+    assert coordinator.data.statistic("PAC", "min") == 2000.0
+    assert coordinator.data.statistic("PAC", "max") == 3000.0
+
+
+async def test_coordinator_oversampling(hass: HomeAssistant):
+    """Test polled samples are published as window averages."""
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Test Inverter",
+        data={
+            CONF_HOST: "192.168.1.100",
+            CONF_PORT: 12345,
+            CONF_UPDATE_INTERVAL: 5,
+            CONF_PUBLISH_INTERVAL: 60,
+        },
+        source="user",
+        entry_id="test_entry",
+        unique_id="192.168.1.100:12345",
+    )
+    coordinator = SolarmaxCoordinator(hass, entry)
+    assert coordinator.is_aggregating is True
+    mock_api = MagicMock()
+    coordinator.api = mock_api
+
+    with patch("custom_components.solarmax.coordinator.time.monotonic") as mock_time:
+        # The first poll is published right away
+        mock_time.return_value = 0
+        mock_api.get_data.return_value = {"PAC": {"value": 1000.0, "raw_value": 2000}}
+        coordinator.data = await coordinator._async_update_data()
+        assert coordinator.data.value("PAC") == 1000.0
+
+        # Polls inside the window keep the published data
+        mock_time.return_value = 30
+        mock_api.get_data.return_value = {"PAC": {"value": 3000.0, "raw_value": 6000}}
+        published = coordinator.data
+        assert await coordinator._async_update_data() is published
+
+        mock_time.return_value = 90
+        mock_api.get_data.return_value = {"PAC": {"value": 2000.0, "raw_value": 4000}}
+        result = await coordinator._async_update_data()
+
+    assert result.value("PAC") == 2500.0
+    assert result.statistic("PAC", "min") == 2000.0
+    assert result.statistic("PAC", "max") == 3000.0
+
+
+async def test_last_good_values_within_stale_window(coordinator):
+    """Test fields missing from a poll keep their last good value until stale."""
+    mock_api = MagicMock()
+    coordinator.api = mock_api
+    start = datetime(2024, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+    with patch("custom_components.solarmax.coordinator.dt_util.utcnow") as mock_now:
+        mock_now.return_value = start
+        mock_api.get_data.return_value = {
+            "PAC": {"value": 1500.0, "raw_value": 3000},
+            "UL1": {"value": 230.1, "raw_value": 2301},
+        }
+        coordinator.data = await coordinator._async_update_data()
+
+        mock_now.return_value = start + timedelta(seconds=60)
+        mock_api.get_data.return_value = {"PAC": {"value": 1600.0, "raw_value": 3200}}
+        coordinator.data = await coordinator._async_update_data()
+
+        assert coordinator.data.value("UL1") == 230.1
+        assert coordinator.field_age("UL1") == 60
+        assert coordinator.field_age("PAC") == 0
+        assert coordinator.is_field_fresh("UL1") is True
+
+        # The window starts once the next read of the field is due
+        overdue = coordinator.update_interval.total_seconds() + coordinator.stale_window
+        mock_now.return_value = start + timedelta(seconds=overdue)
+        assert coordinator.is_field_fresh("UL1") is True
+
+        mock_now.return_value = start + timedelta(seconds=overdue + 1)
+        result = await coordinator._async_update_data()
+
+    assert "UL1" not in result
+    assert coordinator.is_field_fresh("UL1") is False
+    assert coordinator.field_age("KDY") is None
+
+
+async def test_field_freshness_follows_read_interval(coordinator):
+    """Test a field skipped by one poll stays fresh for its own interval."""
+    mock_api = MagicMock()
+    coordinator.api = mock_api
+    start = datetime(2024, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+    full = {
+        "PAC": {"value": 1500.0, "raw_value": 3000},
+        "KDY": {"value": 12.3, "raw_value": 123},
+    }
+    window = coordinator.stale_window
+
+    with patch("custom_components.solarmax.coordinator.dt_util.utcnow") as mock_now:
+        # KDY is read every 10 minutes, PAC every 30 seconds
+        for offset, data in ((0, full), (600, full), (630, {"PAC": full["PAC"]})):
+            mock_now.return_value = start + timedelta(seconds=offset)
+            mock_api.get_data.return_value = data
+            coordinator.data = await coordinator._async_update_data()
+
+        assert coordinator.field_read_interval("KDY") == 600
+        assert coordinator.field_read_interval("PAC") == 30
+        assert coordinator.data.value("KDY") == 12.3
+
+        # Past the window, but not overdue by more than it
+        mock_now.return_value = start + timedelta(seconds=630 + 30 + window + 1)
+        assert coordinator.is_field_fresh("KDY") is True
+        assert coordinator.is_field_fresh("PAC") is False
+
+        mock_now.return_value = start + timedelta(seconds=600 + 600 + window + 1)
+        assert coordinator.is_field_fresh("KDY") is False
+
+
+async def test_health_issue_raised_and_cleared(hass: HomeAssistant, coordinator):
+    """Test a repair issue follows the rolling daytime connection health."""
+    issue_registry = ir.async_get(hass)
+    issue_id = "connection_issues_test_entry"
+    mock_api = MagicMock(host="192.168.1.100", port=12345)
+    coordinator.api = mock_api
+
+    with patch.object(coordinator, "_is_night_time", return_value=False):
+        mock_api.get_data.side_effect = SolarmaxConnectionError("Connection failed")
+        for _ in range(HEALTH_WINDOW_SIZE):
+            with pytest.raises(UpdateFailed):
+                await coordinator._async_update_data()
+
+        issue = issue_registry.async_get_issue(DOMAIN, issue_id)
+        assert issue is not None
+        assert issue.translation_placeholders == {
+            "host": "192.168.1.100",
+            "port": "12345",
+            "failures": str(HEALTH_WINDOW_SIZE),
+        }
+        assert issue.data["entry_id"] == "test_entry"
+
+        mock_api.get_data.side_effect = None
+        mock_api.get_data.return_value = {"PAC": {"value": 1500.0, "raw_value": 3000}}
+        for _ in range(HEALTH_WINDOW_SIZE):
+            await coordinator._async_update_data()
+
+    assert issue_registry.async_get_issue(DOMAIN, issue_id) is None
+
+
+async def test_health_ignores_night_polls(hass: HomeAssistant, coordinator):
+    """Test failed polls at night do not count against the health."""
+    mock_api = MagicMock()
+    mock_api.get_data.side_effect = SolarmaxConnectionError("Connection failed")
+    coordinator.api = mock_api
+
+    with patch.object(coordinator, "_is_night_time", return_value=True):
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+    assert coordinator.health.count == 0
+
+
+async def test_request_counters(coordinator):
+    """Test every request is counted, by error kind when it fails."""
+    mock_api = MagicMock()
+    mock_api.get_data.return_value = {"PAC": {"value": 1500.0, "raw_value": 3000}}
+    coordinator.api = mock_api
+
+    with patch.object(coordinator, "_is_night_time", return_value=True):
+        await coordinator._async_update_data()
+        await coordinator.async_refresh_fields("power")
+
+        mock_api.get_data.side_effect = SolarmaxTimeoutError("Timeout")
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+    counters = coordinator.request_counters
+    assert counters.requests == 3
+    assert counters.errors == {"timeout": 1}
+    assert counters.latency_total >= 0
+
+
+async def test_live_poll_runs_only_while_subscribed(hass: HomeAssistant, coordinator):
+    """Test the fast poll feeds subscribers without publishing snapshots."""
+    mock_api = MagicMock()
+    mock_api.host = "192.168.1.100"
+    mock_api.get_data.return_value = {"PAC": {"value": 1500.0, "raw_value": 3000}}
+    coordinator.api = mock_api
+    received = []
+
+    unsubscribe = coordinator.async_subscribe_live(
+        lambda data, sampled_at, dropped: received.append(data),
+        frozenset({"PAC"}),
+        0.01,
+    )
+    assert coordinator.live_subscribers is True
+    await asyncio.sleep(0.1)
+
+    assert len(received) >= 2
+    assert received[0] == {"PAC": {"value": 1500.0, "raw_value": 3000}}
+    assert mock_api.get_data.call_args[0][0] == {"PAC": "AC_Power (W)"}
+    # Live samples bypass the entities
+    assert coordinator.data is None
+
+    unsubscribe()
+    await asyncio.sleep(0)
+    assert coordinator.live_subscribers is False
+    calls = mock_api.get_data.call_count
+    await asyncio.sleep(0.05)
+    assert mock_api.get_data.call_count == calls
+
+
+async def test_live_poll_pauses_while_expected_offline(
+    hass: HomeAssistant, coordinator
+):
+    """Test the fast poll does not ask an inverter that is off for the night."""
+    mock_api = MagicMock()
+    mock_api.host = "192.168.1.100"
+    mock_api.get_data.return_value = {"PAC": {"value": 1500.0, "raw_value": 3000}}
+    coordinator.api = mock_api
+    coordinator._is_expected_offline = True
+
+    unsubscribe = coordinator.async_subscribe_live(lambda *args: None, None, 0.01)
+    await asyncio.sleep(0.05)
+    mock_api.get_data.assert_not_called()
+
+    # Polling resumes once the scheduled polls reach the inverter again
+    coordinator._is_expected_offline = False
+    await asyncio.sleep(0.05)
+    assert mock_api.get_data.call_count >= 1
+
+    unsubscribe()
+    await asyncio.sleep(0)
+
+
+async def test_live_poll_stops_on_shutdown(hass: HomeAssistant, coordinator):
+    """Test unloading the entry stops the fast poll."""
+    mock_api = MagicMock()
+    mock_api.get_data.side_effect = SolarmaxTimeoutError("Timeout")
+    coordinator.api = mock_api
+
+    coordinator.async_subscribe_live(lambda *args: None, None, 0.01)
+    await asyncio.sleep(0.05)
+    await coordinator.async_shutdown()
+    calls = mock_api.get_data.call_count
+    await asyncio.sleep(0.05)
+
+    assert calls >= 1
+    assert mock_api.get_data.call_count == calls
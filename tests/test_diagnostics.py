@@ -1,11 +1,17 @@
 """Test diagnostics functionality."""
 
-from unittest.mock import AsyncMock, patch
+import logging
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from homeassistant.core import HomeAssistant
 
+from custom_components.solarmax.breaker import CircuitBreaker
+from custom_components.solarmax.const import DOMAIN
 from custom_components.solarmax.diagnostics import async_get_config_entry_diagnostics
-from homeassistant.core import HomeAssistant
+from custom_components.solarmax.snapshot import Snapshot
+from custom_components.solarmax.tracing import Tracer
 
 
 @pytest.mark.asyncio
@@ -16,10 +22,15 @@ async def test_config_entry_diagnostics(hass: HomeAssistant, mock_config_entry):
     mock_coordinator.last_update_success = True
     mock_coordinator.last_exception = None
     mock_coordinator.update_interval.total_seconds.return_value = 30
-    mock_coordinator.data = {
-        "PAC": {"value": 1000, "raw_value": "1000", "timestamp": "2025-09-11T10:00:00"},
-        "PDC": {"value": 1050, "raw_value": "1050", "timestamp": "2025-09-11T10:00:00"},
-    }
+    mock_coordinator.data = Snapshot.from_data(
+        {
+            "PAC": {"value": 1000, "raw_value": 2000},
+            "PDC": {"value": 1050, "raw_value": 2100},
+        },
+        sequence=7,
+        sampled_at=datetime(2025, 9, 11, 10, 0, 0),
+        duration=0.4,
+    )
     mock_coordinator.consecutive_failures = 0
     mock_coordinator.last_successful_update = None
     mock_coordinator.is_expected_offline = False
@@ -27,9 +38,12 @@ async def test_config_entry_diagnostics(hass: HomeAssistant, mock_config_entry):
     # Mock API
     mock_api = AsyncMock()
     mock_api.last_successful_connection = None
-    mock_api.connection_attempts = 5
-    mock_api.timeout_errors = 0
+    mock_api.breaker = CircuitBreaker()
+    mock_api.tracer = Tracer(logging.getLogger(__name__))
     mock_coordinator.api = mock_api
+    mock_coordinator.io_worker.stats = MagicMock(
+        return_value={"depth": 0, "busy": False, "started": 3, "mean_wait": 0.01}
+    )
 
     # Set up config entry
     mock_config_entry.runtime_data = mock_coordinator
@@ -66,6 +80,16 @@ async def test_config_entry_diagnostics(hass: HomeAssistant, mock_config_entry):
     assert sensor_data["PAC"]["value"] == 1000
     assert "PDC" in sensor_data
     assert sensor_data["PDC"]["value"] == 1050
+    assert sensor_data["PAC"]["timestamp"] == "2025-09-11T10:00:00"
+
+    # Verify snapshot metadata
+    assert diagnostics["snapshot"] == {
+        "sequence": 7,
+        "sampled_at": "2025-09-11T10:00:00",
+        "poll_duration": 0.4,
+    }
+    assert diagnostics["api_connection"]["circuit_breaker"]["state"] == "closed"
+    assert diagnostics["api_connection"]["io_queue"]["started"] == 3
 
     # Verify system info
     system_info = diagnostics["system_info"]
@@ -85,7 +109,12 @@ async def test_diagnostics_with_no_data(hass: HomeAssistant, mock_config_entry):
 
     # Mock API
     mock_api = AsyncMock()
+    mock_api.breaker = CircuitBreaker()
+    mock_api.tracer = Tracer(logging.getLogger(__name__))
     mock_coordinator.api = mock_api
+    mock_coordinator.io_worker.stats = MagicMock(
+        return_value={"depth": 0, "busy": False, "started": 3, "mean_wait": 0.01}
+    )
 
     # Set up config entry
     mock_config_entry.runtime_data = mock_coordinator
@@ -117,8 +146,11 @@ async def test_diagnostics_redacts_sensitive_data(
     """Test that sensitive data is properly redacted."""
     # Mock coordinator
     mock_coordinator = AsyncMock()
-    mock_coordinator.data = {}
+    mock_coordinator.data = None
     mock_coordinator.api = AsyncMock()
+    mock_coordinator.api.breaker = CircuitBreaker()
+    mock_coordinator.api.tracer = Tracer(logging.getLogger(__name__))
+    mock_coordinator.io_worker = MagicMock()
 
     # Set up config entry with host data
     mock_config_entry.runtime_data = mock_coordinator
@@ -127,6 +159,9 @@ async def test_diagnostics_redacts_sensitive_data(
         "port": 12345,  # Should not be redacted
         "device_name": "Test Inverter",
     }
+    mock_coordinator.api.tracer.debug(
+        "Successfully connected to %s:%s", "192.168.1.100", 12345
+    )
 
     # Mock hass version
     with patch.object(hass.config, "as_dict", return_value={"version": "2024.1.0"}):
@@ -135,5 +170,62 @@ async def test_diagnostics_redacts_sensitive_data(
     # Verify sensitive data is redacted
     config_data = diagnostics["config_entry"]["data"]
     assert config_data["host"] == "**REDACTED**"
+    assert diagnostics["trace"]["records"][0]["message"] == (
+        "Successfully connected to **REDACTED**:12345"
+    )
     assert config_data["port"] == 12345
     assert config_data["device_name"] == "Test Inverter"
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_memory_report(hass: HomeAssistant, mock_config_entry):
+    """Test the last memory trace is included."""
+    mock_coordinator = AsyncMock()
+    mock_coordinator.data = None
+    mock_coordinator.api = AsyncMock()
+    mock_coordinator.api.breaker = CircuitBreaker()
+    mock_coordinator.api.tracer = Tracer(logging.getLogger(__name__))
+    mock_coordinator.io_worker = MagicMock()
+    mock_config_entry.runtime_data = mock_coordinator
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+    assert diagnostics["memory_report"] is None
+
+    report = {"polls": 5, "size_diff": 1024, "count_diff": 8, "sites": []}
+    hass.data[DOMAIN] = {"memory_report": report}
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+    assert diagnostics["memory_report"] == report
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_field_timestamps(hass: HomeAssistant, mock_config_entry):
+    """Test each field reports when it was read, not the snapshot time."""
+    mock_coordinator = AsyncMock()
+    mock_coordinator.data = Snapshot.from_data(
+        {
+            "PAC": {"value": 1000, "raw_value": 2000},
+            "PDC": {"value": 1050, "raw_value": 2100},
+        },
+        sequence=7,
+        sampled_at=datetime(2025, 9, 11, 10, 0, 0),
+    )
+    # PDC is carried over from an earlier poll
+    sampled_at = {
+        "PAC": datetime(2025, 9, 11, 10, 0, 0),
+        "PDC": datetime(2025, 9, 11, 9, 55, 0),
+    }
+    mock_coordinator.field_sampled_at = MagicMock(side_effect=sampled_at.get)
+    mock_coordinator.field_age = MagicMock(side_effect={"PAC": 10.0, "PDC": 310.0}.get)
+    mock_coordinator.api = AsyncMock()
+    mock_coordinator.api.breaker = CircuitBreaker()
+    mock_coordinator.api.tracer = Tracer(logging.getLogger(__name__))
+    mock_coordinator.io_worker = MagicMock()
+    mock_config_entry.runtime_data = mock_coordinator
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+    sensor_data = diagnostics["sensor_data"]
+    assert sensor_data["PAC"]["timestamp"] == "2025-09-11T10:00:00"
+    assert sensor_data["PDC"]["timestamp"] == "2025-09-11T09:55:00"
+    assert sensor_data["PDC"]["age"] == 310.0
+    assert diagnostics["snapshot"]["sampled_at"] == "2025-09-11T10:00:00"
@@ -0,0 +1,75 @@
+"""Test the Solarmax transition events."""
+
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.solarmax.const import EVENT_ALARM, EVENT_STATUS_CHANGED
+from custom_components.solarmax.events import CodeDebouncer, TransitionEvents
+
+START = datetime(2024, 6, 1, 6, 0, 0, tzinfo=timezone.utc)
+
+
+def _at(seconds):
+    """Return a time relative to the start."""
+    return START + timedelta(seconds=seconds)
+
+
+def test_debouncer_confirms_persistent_change():
+    """Test a change is reported once it persisted for the debounce time."""
+    debouncer = CodeDebouncer(60)
+
+    assert debouncer.update(20000, _at(0)) is None
+    assert debouncer.update(20019, _at(30)) is None
+    transition = debouncer.update(20019, _at(90))
+
+    assert transition.previous_code == 20000
+    assert transition.previous_since == _at(0)
+    assert transition.code == 20019
+    assert transition.since == _at(30)
+    assert debouncer.update(20019, _at(120)) is None
+
+
+def test_debouncer_ignores_flapping():
+    """Test a change reverted within the debounce time is dropped."""
+    debouncer = CodeDebouncer(60)
+
+    debouncer.update(20019, _at(0))
+    assert debouncer.update(20018, _at(30)) is None
+    assert debouncer.update(20019, _at(60)) is None
+    assert debouncer.update(20019, _at(120)) is None
+    assert debouncer.code == 20019
+
+
+def test_debouncer_without_debounce():
+    """Test a debounce of 0 reports changes on the first poll."""
+    debouncer = CodeDebouncer(0)
+
+    debouncer.update(0, _at(0))
+    assert debouncer.update(4, _at(30)).code == 4
+
+
+async def test_transition_events_fired(hass: HomeAssistant):
+    """Test status and alarm events carry the codes and timestamps."""
+    status_events = async_capture_events(hass, EVENT_STATUS_CHANGED)
+    alarm_events = async_capture_events(hass, EVENT_ALARM)
+    events = TransitionEvents(hass, "entry_id", "Test Inverter", 0)
+
+    events.process({"SYS": {"raw_value": 20000}, "SAL": {"raw_value": 0}}, _at(0))
+    events.process({"SYS": {"raw_value": 20019}, "SAL": {"raw_value": 0}}, _at(30))
+    events.process({"SYS": {"raw_value": 20019}, "SAL": {"raw_value": 4}}, _at(60))
+    await hass.async_block_till_done()
+
+    assert len(status_events) == 1
+    assert status_events[0].data == {
+        "config_entry_id": "entry_id",
+        "device_name": "Test Inverter",
+        "previous_code": 20000,
+        "previous_since": _at(0).isoformat(),
+        "code": 20019,
+        "since": _at(30).isoformat(),
+    }
+    assert len(alarm_events) == 1
+    assert alarm_events[0].data["code"] == 4
+    assert alarm_events[0].data["active"] is True
@@ -0,0 +1,49 @@
+"""Test the Solarmax connection health window."""
+
+from custom_components.solarmax.health import HealthWindow, RequestCounters
+
+
+def test_health_window_rolls():
+    """Test old polls leave the window and the rates follow."""
+    window = HealthWindow(4)
+
+    for success, latency in ((True, 1.0), (False, 10.0), (True, 3.0), (True, 2.0)):
+        window.add(success, latency)
+
+    assert window.is_full is True
+    assert window.success_rate == 75
+    assert window.mean_latency == 2.0
+    assert window.failures == 1
+
+    # The oldest (successful) poll is evicted
+    window.add(False, 10.0)
+    assert window.success_rate == 50
+    assert window.mean_latency == 2.5
+    assert window.failures == 2
+
+
+def test_health_window_empty():
+    """Test an empty window has no rates."""
+    window = HealthWindow(3)
+
+    assert window.success_rate is None
+    assert window.mean_latency is None
+    window.add(False, 1.0)
+    assert window.mean_latency is None
+
+    window.reset()
+    assert window.count == 0
+
+
+def test_request_counters():
+    """Test request counters only ever grow."""
+    counters = RequestCounters()
+
+    counters.add(0.5)
+    counters.add(1.0, "timeout")
+    counters.add(2.0, "timeout")
+    counters.add(0.5, "protocol")
+
+    assert counters.requests == 4
+    assert counters.errors == {"timeout": 2, "protocol": 1}
+    assert counters.latency_total == 4.0
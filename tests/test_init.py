@@ -9,6 +9,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 
 from custom_components.solarmax import async_setup_entry, async_unload_entry
+from custom_components.solarmax.coordinator import SolarmaxCoordinator
 from custom_components.solarmax.const import (
     DOMAIN,
     CONF_HOST,
@@ -55,7 +56,9 @@ async def test_setup_entry_success(
         assert result is True
         assert mock_config_entry.runtime_data == mock_coordinator
         mock_coordinator.async_config_entry_first_refresh.assert_called_once()
-        mock_forward.assert_called_once_with(mock_config_entry, [Platform.SENSOR])
+        mock_forward.assert_called_once_with(
+            mock_config_entry, [Platform.BINARY_SENSOR, Platform.SENSOR]
+        )
 
 
 @patch("custom_components.solarmax.SolarmaxCoordinator")
@@ -75,13 +78,16 @@ async def test_setup_entry_connection_failed(
 
 async def test_unload_entry_success(hass: HomeAssistant, mock_config_entry):
     """Test successful unload of config entry."""
+    mock_config_entry.runtime_data = MagicMock()
     with patch.object(
         hass.config_entries, "async_unload_platforms", return_value=True
     ) as mock_unload:
         result = await async_unload_entry(hass, mock_config_entry)
 
         assert result is True
-        mock_unload.assert_called_once_with(mock_config_entry, [Platform.SENSOR])
+        mock_unload.assert_called_once_with(
+            mock_config_entry, [Platform.BINARY_SENSOR, Platform.SENSOR]
+        )
 
 
 async def test_unload_entry_failed(hass: HomeAssistant, mock_config_entry):
@@ -92,4 +98,20 @@ async def test_unload_entry_failed(hass: HomeAssistant, mock_config_entry):
         result = await async_unload_entry(hass, mock_config_entry)
 
         assert result is False
-        mock_unload.assert_called_once_with(mock_config_entry, [Platform.SENSOR])
+        mock_unload.assert_called_once_with(
+            mock_config_entry, [Platform.BINARY_SENSOR, Platform.SENSOR]
+        )
+
+
+async def test_unload_entry_frees_io_queue(hass: HomeAssistant, mock_config_entry):
+    """Test unloading an entry frees its gateway's queue on the I/O worker."""
+    coordinator = SolarmaxCoordinator(hass, mock_config_entry)
+    coordinator.api = MagicMock(host="192.168.1.100")
+    mock_config_entry.runtime_data = coordinator
+    assert await coordinator.async_run_io(lambda: 42) == 42
+    assert "192.168.1.100" in coordinator.io_worker.queues
+
+    with patch.object(hass.config_entries, "async_unload_platforms", return_value=True):
+        assert await async_unload_entry(hass, mock_config_entry) is True
+
+    assert "192.168.1.100" not in coordinator.io_worker.queues
@@ -0,0 +1,119 @@
+"""Test the Solarmax live sample feed."""
+
+import asyncio
+from datetime import datetime, timezone
+
+from custom_components.solarmax.live import LiveFeed, LiveSubscription
+
+SAMPLED_AT = datetime(2025, 9, 11, 10, 0, tzinfo=timezone.utc)
+
+
+def _sample(value):
+    """Return a poll result with AC and DC power."""
+    return {
+        "PAC": {"value": value, "raw_value": value * 2},
+        "PDC": {"value": value + 50, "raw_value": (value + 50) * 2},
+    }
+
+
+async def test_subscription_filters_fields():
+    """Test only the selected fields are delivered."""
+    received = []
+    subscription = LiveSubscription(
+        lambda *args: received.append(args),
+        frozenset({"PAC"}),
+        0,
+        asyncio.get_running_loop(),
+    )
+
+    subscription.push(_sample(1000), SAMPLED_AT)
+    subscription.push({"SYS": {"value": 20019, "raw_value": 20019}}, SAMPLED_AT)
+
+    assert received == [({"PAC": {"value": 1000, "raw_value": 2000}}, SAMPLED_AT, 0)]
+
+
+async def test_subscription_drops_intermediate_samples():
+    """Test samples within the interval are merged into the next delivery."""
+    received = []
+    subscription = LiveSubscription(
+        lambda *args: received.append(args), None, 0.05, asyncio.get_running_loop()
+    )
+
+    # The first sample goes out at once, the next ones wait for the interval
+    subscription.push(_sample(1000), SAMPLED_AT)
+    subscription.push(_sample(1100), SAMPLED_AT)
+    subscription.push({"PAC": {"value": 1200, "raw_value": 2400}}, SAMPLED_AT)
+    assert len(received) == 1
+
+    await asyncio.sleep(0.1)
+
+    assert len(received) == 2
+    data, _, dropped = received[1]
+    assert data["PAC"]["value"] == 1200
+    assert data["PDC"]["value"] == 1150
+    assert dropped == 1
+
+
+async def test_subscription_waits_while_busy():
+    """Test samples are merged while the subscriber has a backlog."""
+    received = []
+    busy = [True]
+    subscription = LiveSubscription(
+        lambda *args: received.append(args),
+        None,
+        0.02,
+        asyncio.get_running_loop(),
+        lambda: busy[0],
+    )
+
+    subscription.push(_sample(1000), SAMPLED_AT)
+    subscription.push(_sample(1100), SAMPLED_AT)
+    await asyncio.sleep(0.1)
+    assert received == []
+
+    busy[0] = False
+    await asyncio.sleep(0.05)
+
+    assert len(received) == 1
+    data, _, dropped = received[0]
+    assert data["PAC"]["value"] == 1100
+    assert dropped == 2
+
+
+async def test_subscription_cancel():
+    """Test a cancelled subscription delivers nothing more."""
+    received = []
+    subscription = LiveSubscription(
+        lambda *args: received.append(args), None, 0.05, asyncio.get_running_loop()
+    )
+    subscription.push(_sample(1000), SAMPLED_AT)
+    subscription.push(_sample(1100), SAMPLED_AT)
+
+    subscription.cancel()
+    await asyncio.sleep(0.1)
+
+    assert len(received) == 1
+
+
+async def test_feed_union_of_subscriptions():
+    """Test the feed polls the union of fields at the shortest interval."""
+    loop = asyncio.get_running_loop()
+    feed = LiveFeed()
+    assert not feed
+
+    power = LiveSubscription(lambda *args: None, frozenset({"PAC"}), 5, loop)
+    status = LiveSubscription(lambda *args: None, frozenset({"SYS"}), 2, loop)
+    feed.add(power)
+    feed.add(status)
+
+    assert feed
+    assert feed.fields == {"PAC", "SYS"}
+    assert feed.interval == 2
+
+    everything = LiveSubscription(lambda *args: None, None, 10, loop)
+    feed.add(everything)
+    assert feed.fields is None
+
+    for subscription in (power, status, everything):
+        feed.remove(subscription)
+    assert not feed
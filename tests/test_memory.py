@@ -0,0 +1,98 @@
+"""Test memory tracing of Solarmax poll cycles."""
+
+import tracemalloc
+from unittest.mock import MagicMock
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.solarmax.const import CONF_HOST, CONF_PORT, DOMAIN
+from custom_components.solarmax.coordinator import SolarmaxCoordinator
+from custom_components.solarmax.memory import MemorySession, diff_snapshots
+from custom_components.solarmax.snapshot import Snapshot
+
+
+def _coordinator(hass: HomeAssistant, host: str) -> SolarmaxCoordinator:
+    """Return a coordinator whose inverter answers instantly."""
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=host,
+        data={CONF_HOST: host, CONF_PORT: 12345},
+        source="user",
+        entry_id=host,
+    )
+    coordinator = SolarmaxCoordinator(hass, entry)
+    coordinator.api = MagicMock()
+    coordinator.api.host = host
+    coordinator.api.get_data.side_effect = lambda *args: {
+        "PAC": {"value": 1500.0, "raw_value": 3000}
+    }
+    return coordinator
+
+
+def test_diff_snapshots():
+    """Test growth is attributed to the integration code that caused it."""
+    tracemalloc.start(10)
+    try:
+        before = tracemalloc.take_snapshot()
+        retained = [
+            Snapshot.from_data({"PAC": {"value": 1500.0, "raw_value": 3000}})
+            for _ in range(200)
+        ]
+        unrelated = [bytearray(64) for _ in range(200)]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    report = diff_snapshots(before, after, limit=5)
+
+    assert report["size_diff"] > 0
+    assert report["count_diff"] >= len(retained)
+    assert 0 < len(report["sites"]) <= 5
+    site = report["sites"][0]
+    assert site["site"].startswith("solarmax/snapshot.py:")
+    assert site["size_diff"] > 0
+    # Allocations made outside the integration are left out
+    assert not any("test_memory.py" in s["site"] for s in report["sites"])
+    del unrelated
+
+
+async def test_memory_session(hass: HomeAssistant):
+    """Test snapshots are diffed after every inverter polled N times."""
+    coordinators = [_coordinator(hass, "10.0.0.1"), _coordinator(hass, "10.0.0.2")]
+    session = MemorySession(hass, coordinators, polls=2)
+    await session.async_start()
+    assert tracemalloc.is_tracing()
+
+    for coordinator in coordinators:
+        await coordinator.async_refresh()
+        assert not session.finished.done()
+    for coordinator in coordinators:
+        await coordinator.async_refresh()
+    report = await session.finished
+
+    assert not tracemalloc.is_tracing()
+    assert report is hass.data[DOMAIN]["memory_report"]
+    assert report["polls"] == 2
+    assert report["inverters"] == 2
+    assert report["trace_frames"] == 25
+    assert report["sites"]
+    assert all(site["site"].startswith("solarmax/") for site in report["sites"])
+
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+
+
+async def test_memory_session_without_polls(hass: HomeAssistant):
+    """Test detaching every inverter before a poll stops tracing."""
+    coordinator = _coordinator(hass, "10.0.0.1")
+    session = MemorySession(hass, [coordinator], polls=3)
+    await session.async_start()
+
+    session.detach(coordinator)
+
+    assert await session.finished is None
+    assert not tracemalloc.is_tracing()
+    assert "memory_report" not in hass.data.get(DOMAIN, {})
@@ -0,0 +1,189 @@
+"""Test the Solarmax OpenMetrics endpoint."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from homeassistant.components.http import KEY_HASS
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.solarmax.breaker import CircuitBreaker
+from custom_components.solarmax.const import (
+    CONF_DEVICE_NAME,
+    CONF_EXPOSE_METRICS,
+    DOMAIN,
+    METRICS_URL,
+)
+from custom_components.solarmax.health import RequestCounters
+from custom_components.solarmax.metrics import (
+    CONTENT_TYPE,
+    FAMILIES,
+    MetricsRenderer,
+    SolarmaxMetricsView,
+    async_register_metrics_view,
+    render_entry,
+)
+from custom_components.solarmax.snapshot import Snapshot
+from custom_components.solarmax.worker import IOWorker
+
+
+def _entry(entry_id, device_name, expose=True, sequence=1):
+    """Return a loaded entry with a coordinator stand-in."""
+    coordinator = MagicMock()
+    coordinator.data = Snapshot.from_data(
+        {
+            "PAC": {"value": 1500.0, "raw_value": 3000},
+            "SYS": {"value": 20019, "raw_value": 20019},
+        },
+        sequence=sequence,
+        sampled_at=datetime(2025, 9, 11, 10, 0, tzinfo=timezone.utc),
+        duration=0.25,
+    )
+    coordinator.request_counters = RequestCounters()
+    coordinator.request_counters.add(0.25)
+    coordinator.request_counters.add(1.0, "timeout")
+    coordinator.consecutive_failures = 0
+    coordinator.breaker = CircuitBreaker()
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id=entry_id,
+        data={CONF_DEVICE_NAME: device_name, CONF_EXPOSE_METRICS: expose},
+        state=ConfigEntryState.LOADED,
+    )
+    entry.runtime_data = coordinator
+    return entry
+
+
+def _families(text):
+    """Return the family names in order of their TYPE lines."""
+    return [line.split()[2] for line in text.splitlines() if line.startswith("# TYPE")]
+
+
+def test_render_exposition():
+    """Test the exposition of two inverters."""
+    renderer = MetricsRenderer()
+    entries = [_entry("entry1", "Roof"), _entry("entry2", 'Garage "East"')]
+
+    text = renderer.render(entries, None).decode()
+    lines = text.splitlines()
+
+    assert lines[-1] == "# EOF"
+    assert _families(text) == [family.name for family in FAMILIES]
+    assert 'solarmax_value{entry_id="entry1",device="Roof",field="PAC"} 1500.0' in lines
+    assert (
+        'solarmax_raw_value{entry_id="entry1",device="Roof",field="PAC"} 3000' in lines
+    )
+    assert 'solarmax_value{entry_id="entry1",device="Roof",field="SYS"} 20019' in lines
+    assert (
+        'solarmax_sample_timestamp_seconds{entry_id="entry1",device="Roof"} '
+        "1757584800.0" in lines
+    )
+    assert 'solarmax_api_requests_total{entry_id="entry1",device="Roof"} 2' in lines
+    assert (
+        'solarmax_api_errors_total{entry_id="entry1",device="Roof",error="timeout"} 1'
+        in lines
+    )
+    assert (
+        'solarmax_api_request_duration_seconds_sum{entry_id="entry1",device="Roof"} '
+        "1.25" in lines
+    )
+    assert 'solarmax_circuit_breaker_open{entry_id="entry1",device="Roof"} 0' in lines
+    # Label values are escaped
+    assert 'device="Garage \\"East\\""' in text
+
+    # The samples of each family are contiguous
+    names = [line.split("{")[0] for line in lines if line and not line.startswith("#")]
+    assert names.index("solarmax_raw_value") > max(
+        index for index, name in enumerate(names) if name == "solarmax_value"
+    )
+
+
+def test_render_is_cached_per_poll():
+    """Test only inverters that polled since the last scrape are re-rendered."""
+    renderer = MetricsRenderer()
+    entries = [_entry("entry1", "Roof"), _entry("entry2", "Garage")]
+
+    with patch(
+        "custom_components.solarmax.metrics.render_entry",
+        wraps=render_entry,
+    ) as render_spy:
+        body = renderer.render(entries, None)
+        assert render_spy.call_count == 2
+
+        # Nothing polled: the same body is served without rendering
+        assert renderer.render(entries, None) is body
+        assert render_spy.call_count == 2
+
+        # A failed request changes the counters of one inverter
+        entries[1].runtime_data.request_counters.add(1.0, "connection")
+        body = renderer.render(entries, None).decode()
+        assert render_spy.call_count == 3
+        assert 'device="Garage",error="connection"} 1' in body
+
+        # A new snapshot is rendered as well
+        entries[0].runtime_data.data = Snapshot.from_data(
+            {"PAC": {"value": 2000.0, "raw_value": 4000}}, sequence=2
+        )
+        body = renderer.render(entries, None).decode()
+        assert render_spy.call_count == 4
+        assert 'device="Roof",field="PAC"} 2000.0' in body
+
+        # Removed entries are dropped
+        body = renderer.render(entries[1:], None).decode()
+        assert 'device="Roof"' not in body
+
+
+async def test_metrics_view(hass: HomeAssistant):
+    """Test the scrape endpoint serves entries with metrics enabled."""
+    for entry in (_entry("entry1", "Roof"), _entry("entry2", "Hidden", expose=False)):
+        entry.add_to_hass(hass)
+
+    view = SolarmaxMetricsView()
+    request = MagicMock()
+    request.app = {KEY_HASS: hass}
+    response = await view.get(request)
+
+    assert view.url == METRICS_URL
+    assert view.requires_auth is True
+    assert response.headers["Content-Type"] == CONTENT_TYPE
+    text = response.body.decode()
+    assert 'device="Roof"' in text
+    assert 'device="Hidden"' not in text
+    assert text.endswith("# EOF\n")
+
+
+async def test_register_metrics_view_once(hass: HomeAssistant):
+    """Test the view is registered when the first entry enables metrics."""
+    hass.http = MagicMock()
+
+    async_register_metrics_view(hass)
+    async_register_metrics_view(hass)
+
+    hass.http.register_view.assert_called_once()
+    assert isinstance(hass.http.register_view.call_args[0][0], SolarmaxMetricsView)
+
+
+async def test_render_gateway_queues(hass: HomeAssistant):
+    """Test the I/O queues are exported per gateway."""
+    worker = IOWorker(hass.loop)
+    renderer = MetricsRenderer()
+    try:
+        await worker.submit("192.168.1.100", lambda: None)
+        body = renderer.render([], worker)
+
+        text = body.decode()
+        assert 'solarmax_io_queue_depth{gateway="192.168.1.100"} 0' in text
+        assert 'solarmax_io_busy{gateway="192.168.1.100"} 0' in text
+        assert 'solarmax_io_queue_wait_seconds_count{gateway="192.168.1.100"} 1' in text
+        assert text.endswith("# EOF\n")
+        assert renderer.render([], worker) is body
+
+        # A queue change renders the body again
+        await worker.submit("192.168.1.100", lambda: None)
+        assert 'seconds_count{gateway="192.168.1.100"} 2' in (
+            renderer.render([], worker).decode()
+        )
+    finally:
+        worker.shutdown()
@@ -0,0 +1,185 @@
+"""Test the Solarmax Modbus TCP transport."""
+
+import socketserver
+import struct
+import threading
+from unittest.mock import patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.solarmax.const import (
+    CONF_HOST,
+    CONF_PORT,
+    CONF_PROTOCOL,
+    DOMAIN,
+    PROTOCOL_MODBUS,
+)
+from custom_components.solarmax.coordinator import SolarmaxCoordinator
+from custom_components.solarmax.modbus_api import (
+    REGISTER_MAP,
+    ModbusAPI,
+    plan_reads,
+)
+from custom_components.solarmax.solarmax_api import (
+    FIELD_MAP_INVERTER,
+    SolarmaxProtocolError,
+)
+
+RAW_VALUES = {
+    "KDY": 12,
+    "KT0": 0x12345,
+    "PAC": 3000,
+    "UL1": 2305,
+    "IL1": 435,
+    "SAL": 0x10000,
+    "SYS": 20004,
+}
+
+
+class _ModbusHandler(socketserver.BaseRequestHandler):
+    """Answer input register reads from the server's registers."""
+
+    def handle(self) -> None:
+        """Serve requests until the client disconnects."""
+        while header := self.request.recv(7):
+            transaction_id, _, length, unit_id = struct.unpack(">HHHB", header)
+            function, address, count = struct.unpack(
+                ">BHH", self.request.recv(length - 1)
+            )
+            self.server.requests.append((address, count))
+            if any(
+                register not in self.server.registers
+                for register in range(address, address + count)
+            ):
+                pdu = struct.pack(">BB", function | 0x80, 2)
+            else:
+                words = [
+                    self.server.registers[r] for r in range(address, address + count)
+                ]
+                pdu = struct.pack(f">BB{count}H", function, 2 * count, *words)
+            self.request.sendall(
+                struct.pack(">HHHB", transaction_id, 0, len(pdu) + 1, unit_id) + pdu
+            )
+
+
+class ModbusServer(socketserver.ThreadingTCPServer):
+    """Local stand-in for an inverter speaking Modbus TCP."""
+
+    daemon_threads = True
+
+    def __init__(self, values: dict[str, int], missing: tuple[str, ...] = ()) -> None:
+        """Lay out the values in the registers, leaving out missing fields."""
+        super().__init__(("127.0.0.1", 0), _ModbusHandler)
+        self.requests: list[tuple[int, int]] = []
+        self.registers = {register: 0 for register in range(0x38)}
+        for code, (address, words) in REGISTER_MAP.items():
+            for index in range(words):
+                if code in missing:
+                    self.registers.pop(address + index)
+                    continue
+                shift = 16 * (words - index - 1)
+                self.registers[address + index] = (
+                    values.get(code, 0) >> shift
+                ) & 0xFFFF
+        self._thread = threading.Thread(target=self.serve_forever)
+
+    @property
+    def port(self) -> int:
+        """Return the port the server listens on."""
+        return self.server_address[1]
+
+    def __enter__(self) -> "ModbusServer":
+        """Start serving."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop serving and wait for the threads."""
+        self.shutdown()
+        self._thread.join()
+        super().__exit__(*args)
+
+
+def test_plan_reads():
+    """Test fields are read in the fewest contiguous blocks."""
+    assert plan_reads(list(REGISTER_MAP)) == [(0x00, 0x38, list(REGISTER_MAP))]
+    assert plan_reads(["SYS", "KDY"], max_gap=8) == [
+        (0x00, 2, ["KDY"]),
+        (0x37, 1, ["SYS"]),
+    ]
+    assert plan_reads(["PAC", "UL1", "TKK", "KDY"], max_gap=32, max_count=0x22) == [
+        (0x00, 0x22, ["KDY", "PAC", "UL1"]),
+        (0x34, 1, ["TKK"]),
+    ]
+    assert plan_reads(["PAC", "DD00"]) == [(0x20, 1, ["PAC"])]
+
+
+def test_get_data_single_block(socket_enabled):
+    """Test every field is read with one block read."""
+    with ModbusServer(RAW_VALUES) as server:
+        api = ModbusAPI("127.0.0.1", server.port, timeout=2)
+        data = api.get_data()
+
+    assert server.requests == [(0x00, 0x38)]
+    assert set(data) == set(FIELD_MAP_INVERTER)
+    assert data["PAC"] == {"value": 1500.0, "raw_value": 3000}
+    assert data["UL1"]["value"] == 230.5
+    assert data["IL1"]["value"] == 4.35
+    assert data["KT0"]["raw_value"] == 0x12345
+    assert data["SAL"]["raw_value"] == 0x10000
+    assert data["SYS"]["raw_value"] == 20004
+    assert api.last_successful_connection is not None
+
+
+def test_get_data_skips_unsupported_block(socket_enabled):
+    """Test a block refused by the inverter does not fail the others."""
+    registers = {"KDY": (0x00, 2), "PAC": (0x20, 1)}
+    with ModbusServer(RAW_VALUES, missing=("KDY",)) as server:
+        api = ModbusAPI("127.0.0.1", server.port, timeout=2, registers=registers)
+        data = api.get_data({"KDY": "", "PAC": ""})
+
+        assert server.requests == [(0x00, 2), (0x20, 1)]
+        assert set(data) == {"PAC"}
+
+        with patch("custom_components.solarmax.solarmax_api.time.sleep"):
+            with pytest.raises(SolarmaxProtocolError):
+                api.get_data({"KDY": ""})
+        assert api.breaker.failures == 1
+
+
+def test_test_connection(socket_enabled):
+    """Test the connection test reads a single register."""
+    with ModbusServer(RAW_VALUES) as server:
+        assert ModbusAPI("127.0.0.1", server.port, timeout=2).test_connection()
+    assert server.requests == [(0x20, 1)]
+
+
+def test_history_not_supported():
+    """Test yield history is refused without any I/O."""
+    api = ModbusAPI("127.0.0.1")
+    assert not api.supports_history
+    with pytest.raises(SolarmaxProtocolError):
+        api.get_history(["DD00"])
+
+
+async def test_coordinator_uses_modbus(hass: HomeAssistant):
+    """Test the protocol option selects the Modbus transport."""
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Modbus",
+        data={
+            CONF_HOST: "192.168.1.100",
+            CONF_PORT: 502,
+            CONF_PROTOCOL: PROTOCOL_MODBUS,
+        },
+        source="user",
+        entry_id="modbus",
+    )
+    coordinator = SolarmaxCoordinator(hass, entry)
+
+    assert isinstance(coordinator.api, ModbusAPI)
+    assert coordinator.api.port == 502
@@ -0,0 +1,120 @@
+"""Test profiling of Solarmax poll cycles."""
+
+import pstats
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.solarmax.const import CONF_HOST, CONF_PORT, DOMAIN
+from custom_components.solarmax.coordinator import SolarmaxCoordinator
+from custom_components.solarmax.profiler import (
+    ProfileSession,
+    RefreshSession,
+    summarize_stats,
+)
+
+
+def _coordinator(hass: HomeAssistant, host: str) -> SolarmaxCoordinator:
+    """Return a coordinator whose inverter answers instantly."""
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=host,
+        data={CONF_HOST: host, CONF_PORT: 12345},
+        source="user",
+        entry_id=host,
+    )
+    coordinator = SolarmaxCoordinator(hass, entry)
+    coordinator.api = MagicMock()
+    coordinator.api.host = host
+    coordinator.api.get_data.return_value = {
+        "PAC": {"value": 1500.0, "raw_value": 3000}
+    }
+    return coordinator
+
+
+def _busy_listener() -> None:
+    """Stand in for an entity update."""
+    sum(range(1000))
+
+
+async def test_profile_session(hass: HomeAssistant, tmp_path):
+    """Test the next refreshes and entity updates are recorded."""
+    hass.config.config_dir = str(tmp_path)
+    coordinators = [_coordinator(hass, "10.0.0.1"), _coordinator(hass, "10.0.0.2")]
+    for coordinator in coordinators:
+        coordinator.async_add_listener(_busy_listener)
+
+    session = ProfileSession(hass, coordinators, refreshes=2)
+    session.attach()
+
+    with patch(
+        "custom_components.solarmax.profiler.persistent_notification.async_create"
+    ) as notify:
+        for _ in range(2):
+            await coordinators[0].async_refresh()
+        assert not session.finished.done()
+        await coordinators[1].async_refresh()
+        await coordinators[1].async_refresh()
+        path = await session.finished
+
+    assert path.startswith(str(tmp_path))
+    stats = pstats.Stats(path)
+    functions = {name for _, _, name in stats.stats}
+    assert "_async_update_data" in functions
+    assert "_busy_listener" in functions
+
+    message = notify.call_args[0][1]
+    assert "Profiled 2 refreshes of 2 inverters" in message
+    assert path in message
+    assert "| Function | Calls |" in message
+
+    # Nothing is recorded after the last refresh
+    assert all(not c._refresh_sessions for c in coordinators)
+    await coordinators[0].async_refresh()
+    assert len(pstats.Stats(path).stats) == len(stats.stats)
+
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+
+
+async def test_profile_session_detached_on_shutdown(hass: HomeAssistant, tmp_path):
+    """Test unloading an inverter does not leave the profile unfinished."""
+    hass.config.config_dir = str(tmp_path)
+    coordinators = [_coordinator(hass, "10.0.0.1"), _coordinator(hass, "10.0.0.2")]
+    session = ProfileSession(hass, coordinators, refreshes=1)
+    session.attach()
+
+    with patch(
+        "custom_components.solarmax.profiler.persistent_notification.async_create"
+    ):
+        await coordinators[0].async_refresh()
+        await coordinators[1].async_shutdown()
+        assert await session.finished is not None
+
+    await coordinators[0].async_shutdown()
+
+
+def test_summarize_stats():
+    """Test the summary lists the functions with the most own time first."""
+    stats = MagicMock()
+    stats.stats = {
+        ("/srv/sensor.py", 10, "native_value"): (5, 5, 0.001, 0.002, {}),
+        ("/srv/coordinator.py", 20, "_publish"): (2, 2, 0.004, 0.010, {}),
+        ("~", 0, "<built-in method time.monotonic>"): (9, 9, 0.0001, 0.0001, {}),
+    }
+
+    rows = summarize_stats(stats, limit=2)
+
+    assert rows[2] == "| `_publish` (coordinator.py:20) | 2 | 4.00 | 10.00 |"
+    assert rows[3] == "| `native_value` (sensor.py:10) | 5 | 1.00 | 2.00 |"
+    assert len(rows) == 4
+
+
+def test_refresh_session_is_abstract(hass: HomeAssistant):
+    """Test sessions must say how they report their outcome."""
+    with pytest.raises(TypeError):
+        RefreshSession(hass, [], 1)
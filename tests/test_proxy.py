@@ -0,0 +1,132 @@
+"""Test the Solarmax MaxTalk proxy."""
+
+import asyncio
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.solarmax.const import CONF_HOST, CONF_PORT, DOMAIN
+from custom_components.solarmax.coordinator import SolarmaxCoordinator
+from custom_components.solarmax.proxy import MaxTalkProxy
+from custom_components.solarmax.solarmax_api import SolarmaxAPI
+
+from .simulator import InverterSimulator
+
+
+def _coordinator(hass: HomeAssistant, port: int) -> SolarmaxCoordinator:
+    """Return a coordinator polling a simulated inverter."""
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Proxied",
+        data={CONF_HOST: "127.0.0.1", CONF_PORT: port},
+        source="user",
+        entry_id="proxied",
+    )
+    return SolarmaxCoordinator(hass, entry)
+
+
+async def _exchange(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: str
+) -> str:
+    """Send a request frame and return the response frame."""
+    writer.write(request.encode())
+    return (await asyncio.wait_for(reader.readuntil(b"}"), 5)).decode()
+
+
+async def test_proxy(hass: HomeAssistant, socket_enabled):
+    """Test clients are answered from the last poll or forwarded."""
+    simulator = InverterSimulator(1)
+    simulator.start()
+    try:
+        coordinator = _coordinator(hass, simulator.ports[0])
+        await coordinator.async_refresh()
+        polled = simulator.requests
+
+        proxy = MaxTalkProxy(coordinator, 0)
+        await proxy.async_start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", proxy.port)
+        client = SolarmaxAPI("127.0.0.1")
+
+        # Polled fields come from the snapshot without touching the inverter
+        response = await _exchange(
+            reader, writer, client.build_request({"PAC": "", "KDY": ""})
+        )
+        data, invalid = client.decode_response({}, response)
+        assert not invalid
+        assert data["PAC"]["raw_value"] == coordinator.data.raw("PAC")
+        assert data["KDY"]["raw_value"] == coordinator.data.raw("KDY")
+        assert simulator.requests == polled
+
+        # The status is forwarded to keep its detail code
+        connections = simulator.connections
+        response = await _exchange(reader, writer, client.build_request({"SYS": ""}))
+        assert "SYS=4E33,0" in response
+        assert simulator.requests == polled + 1
+
+        # Anything else is forwarded through the inverter's I/O queue, over
+        # a connection kept open for the following frames
+        for code in ("DD00", "DD01"):
+            response = await _exchange(reader, writer, client.build_request({code: ""}))
+            client.verify_frame(response)
+        assert simulator.requests == polled + 3
+        assert simulator.connections == connections + 1
+
+        # Corrupt frames are not answered
+        writer.write(b"{FB;01;1A|64:PAC|0000}")
+        response = await _exchange(reader, writer, client.build_request({"KDY": ""}))
+        assert "KDY=" in response
+
+        assert proxy.stats() == {
+            "host": "127.0.0.1",
+            "port": proxy.port,
+            "clients": 1,
+            "answered": 2,
+            "forwarded": 3,
+            "failed": 0,
+        }
+
+        # Stopping disconnects the clients
+        await proxy.async_stop()
+        assert await reader.read() == b""
+        assert proxy.stats()["clients"] == 0
+        writer.close()
+        await coordinator.async_shutdown()
+    finally:
+        simulator.stop()
+
+
+async def test_proxy_forwards_stale_fields(hass: HomeAssistant, socket_enabled):
+    """Test fields older than the maximum age are read from the inverter."""
+    simulator = InverterSimulator(1)
+    simulator.start()
+    try:
+        coordinator = _coordinator(hass, simulator.ports[0])
+        await coordinator.async_refresh()
+        polled = simulator.requests
+        await asyncio.sleep(0.01)
+
+        proxy = MaxTalkProxy(coordinator, 0, host="127.0.0.1", max_age=0)
+        client = SolarmaxAPI("127.0.0.1")
+        response = await proxy.async_answer(client.build_request({"PAC": ""}))
+
+        client.verify_frame(response)
+        assert simulator.requests == polled + 1
+        assert proxy.forwarded == 1
+        await proxy.async_stop()
+
+        # Requests to another bus address are always forwarded
+        client.address = 2
+        proxy = MaxTalkProxy(coordinator, 0)
+        await proxy.async_answer(client.build_request({"PAC": ""}))
+        assert simulator.requests == polled + 2
+        await proxy.async_stop()
+
+        await coordinator.async_shutdown()
+    finally:
+        simulator.stop()
+
+    # Without the inverter the client is not answered
+    assert await proxy.async_answer(client.build_request({"PAC": ""})) is None
+    assert proxy.failed == 1
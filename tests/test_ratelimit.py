@@ -0,0 +1,39 @@
+"""Test the Solarmax rate limiting helpers."""
+
+from unittest.mock import patch
+
+from custom_components.solarmax.ratelimit import TokenBucket
+
+
+def test_token_bucket_starts_full():
+    """Test a fresh bucket allows one request immediately."""
+    bucket = TokenBucket(5)
+
+    assert bucket.try_acquire() is True
+    assert bucket.try_acquire() is False
+
+
+def test_token_bucket_refills_after_spacing():
+    """Test tokens come back after the minimum spacing."""
+    with patch("custom_components.solarmax.ratelimit.time.monotonic") as mock_time:
+        mock_time.return_value = 100.0
+        bucket = TokenBucket(5)
+        assert bucket.try_acquire() is True
+
+        mock_time.return_value = 102.0
+        assert bucket.try_acquire() is False
+
+        mock_time.return_value = 107.0
+        assert bucket.try_acquire() is True
+
+
+async def test_token_bucket_async_acquire_waits():
+    """Test async_acquire sleeps until a token is available."""
+    bucket = TokenBucket(0.05)
+    await bucket.async_acquire()
+
+    with patch("custom_components.solarmax.ratelimit.asyncio.sleep") as mock_sleep:
+        await bucket.async_acquire()
+
+    mock_sleep.assert_called_once()
+    assert 0 < mock_sleep.call_args[0][0] <= 0.05
@@ -3,6 +3,8 @@
 import pytest
 from unittest.mock import Mock
 
+from homeassistant.config_entries import ConfigEntryState
+
 from custom_components.solarmax.repairs import (
     SolarmaxConnectionRepairFlow,
     SolarmaxConfigurationRepairFlow,
@@ -75,3 +77,28 @@ async def test_async_create_fix_flow():
     # Test unknown issue (fallback)
     flow = await async_create_fix_flow(hass, "unknown_issue", {})
     assert flow is not None  # Should return ConfirmRepairFlow
+
+
+@pytest.mark.asyncio
+async def test_connection_fix_flow_shows_breaker_state():
+    """Test the connection repair flow reports the live breaker state."""
+    coordinator = Mock()
+    coordinator.breaker.as_dict.return_value = {
+        "state": "open",
+        "failures": 7,
+        "next_probe_in": 120,
+    }
+    entry = Mock(domain="solarmax", runtime_data=coordinator)
+    entry.state = ConfigEntryState.LOADED
+    hass = Mock()
+    hass.config_entries.async_get_entry.return_value = entry
+
+    flow = await async_create_fix_flow(
+        hass,
+        "connection_issues_test",
+        {"host": "192.168.1.100", "port": 12345, "failures": 5, "entry_id": "abc"},
+    )
+    result = await flow.async_step_confirm()
+
+    assert result["description_placeholders"]["failures"] == "7"
+    assert result["description_placeholders"]["state"] == "open"
@@ -0,0 +1,244 @@
+"""Load test Solarmax with many simulated inverters.
+
+The scaling test is skipped unless SOLARMAX_LOADTEST is set:
+
+    SOLARMAX_LOADTEST=1 pytest tests/test_scaling.py
+
+SOLARMAX_LOADTEST_SIZES (default "1,10,100") selects the fleet sizes,
+SOLARMAX_LOADTEST_DURATION (default 60) the seconds measured per size,
+SOLARMAX_LOADTEST_INTERVAL (default 10) the update interval of every entry
+and SOLARMAX_LOADTEST_REPORT (default "solarmax-loadtest.md") the report
+file; a ".json" suffix writes the raw results instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.solarmax.const import (
+    CONF_DEVICE_NAME,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_UPDATE_INTERVAL,
+    DOMAIN,
+)
+from custom_components.solarmax.solarmax_api import FIELD_MAP_INVERTER, SolarmaxAPI
+
+from .simulator import InverterSimulator
+
+LOADTEST = bool(os.environ.get("SOLARMAX_LOADTEST"))
+SIZES = [
+    int(size)
+    for size in os.environ.get("SOLARMAX_LOADTEST_SIZES", "1,10,100").split(",")
+]
+DURATION = float(os.environ.get("SOLARMAX_LOADTEST_DURATION", "60"))
+INTERVAL = int(os.environ.get("SOLARMAX_LOADTEST_INTERVAL", "10"))
+REPORT = Path(os.environ.get("SOLARMAX_LOADTEST_REPORT", "solarmax-loadtest.md"))
+
+# Seconds between loop lag samples
+LAG_PROBE_INTERVAL = 0.05
+
+REPORT_COLUMNS = (
+    ("inverters", "Inverters"),
+    ("entities", "Entities"),
+    ("setup_s", "Setup (s)"),
+    ("memory_per_entry_kib", "Memory/entry (KiB)"),
+    ("polls", "Polls"),
+    ("failed_polls", "Failed"),
+    ("cpu_per_poll_ms", "CPU/poll (ms)"),
+    ("state_writes_per_s", "State writes/s"),
+    ("loop_lag_p50_ms", "Lag p50 (ms)"),
+    ("loop_lag_p99_ms", "Lag p99 (ms)"),
+    ("loop_lag_max_ms", "Lag max (ms)"),
+    ("io_queue_wait_ms", "Queue wait (ms)"),
+)
+
+_results: list[dict[str, float | int]] = []
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Return the nearest-rank percentile of non-empty values."""
+    ordered = sorted(values)
+    index = max(0, int(len(ordered) * percent / 100 + 0.5) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def render_report(results: list[dict[str, float | int]]) -> str:
+    """Return the results as a markdown table."""
+    lines = [
+        "# Solarmax scaling report",
+        "",
+        f"Update interval {INTERVAL} s, measured for {DURATION:g} s per size.",
+        "",
+        "| " + " | ".join(title for _, title in REPORT_COLUMNS) + " |",
+        "|" + "---:|" * len(REPORT_COLUMNS),
+    ]
+    for result in results:
+        lines.append(
+            "| " + " | ".join(str(result[key]) for key, _ in REPORT_COLUMNS) + " |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture(scope="module")
+def scaling_report():
+    """Collect the results of all sizes and write the report."""
+    yield _results
+    if not _results:
+        return
+    if REPORT.suffix == ".json":
+        REPORT.write_text(json.dumps(_results, indent=2) + "\n")
+    else:
+        REPORT.write_text(render_report(_results))
+
+
+async def _probe_loop_lag(lags: list[float]) -> None:
+    """Record how late the loop wakes up a sleeping task."""
+    while True:
+        start = time.monotonic()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lags.append(time.monotonic() - start - LAG_PROBE_INTERVAL)
+
+
+async def test_simulator_answers_api(hass: HomeAssistant, socket_enabled):
+    """Test the API polls every field from a simulated inverter."""
+    simulator = InverterSimulator(2)
+    simulator.start()
+    try:
+        api = SolarmaxAPI("127.0.0.1", simulator.ports[1], timeout=5)
+        data = await hass.async_add_executor_job(api.get_data)
+    finally:
+        simulator.stop()
+
+    assert set(data) == set(FIELD_MAP_INVERTER)
+    assert data["SYS"]["value"] == 20019
+    assert simulator.inverters[1].requests == len(
+        api.build_requests(FIELD_MAP_INVERTER)
+    )
+    assert simulator.inverters[0].requests == 0
+
+
+@pytest.mark.skipif(not LOADTEST, reason="set SOLARMAX_LOADTEST=1 to run")
+@pytest.mark.parametrize("inverters", SIZES)
+async def test_scaling(
+    hass: HomeAssistant,
+    enable_custom_integrations,
+    socket_enabled,
+    scaling_report,
+    inverters: int,
+):
+    """Poll a fleet of simulated inverters and record the costs."""
+    # The test harness runs the loop in debug mode, which slows every callback
+    hass.loop.set_debug(False)
+    simulator = InverterSimulator(inverters)
+    simulator.start()
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            title=f"Inverter {index}",
+            unique_id=f"127.0.0.1:{port}",
+            data={
+                CONF_HOST: "127.0.0.1",
+                CONF_PORT: port,
+                CONF_DEVICE_NAME: f"Inverter {index}",
+                CONF_UPDATE_INTERVAL: INTERVAL,
+            },
+        )
+        for index, port in enumerate(simulator.ports)
+    ]
+
+    try:
+        # Load the integration and its platforms first, so the memory per
+        # entry leaves out one-time imports
+        for domain in (DOMAIN, "binary_sensor", "sensor"):
+            assert await async_setup_component(hass, domain, {})
+
+        # Memory is traced during setup only; tracing slows everything down
+        tracemalloc.start()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        setup_start = time.monotonic()
+        for entry in entries:
+            entry.add_to_hass(hass)
+        await asyncio.gather(
+            *(hass.config_entries.async_setup(entry.entry_id) for entry in entries)
+        )
+        await hass.async_block_till_done()
+        setup_time = time.monotonic() - setup_start
+        memory_per_entry = (tracemalloc.get_traced_memory()[0] - memory_before) / (
+            inverters
+        )
+        tracemalloc.stop()
+        assert all(entry.state is ConfigEntryState.LOADED for entry in entries)
+
+        state_writes = 0
+
+        @callback
+        def _count_state_write(_event: Event) -> None:
+            nonlocal state_writes
+            state_writes += 1
+
+        coordinators = [entry.runtime_data for entry in entries]
+        requests_before = sum(c.request_counters.requests for c in coordinators)
+        errors_before = sum(
+            sum(c.request_counters.errors.values()) for c in coordinators
+        )
+        cpu_before = time.process_time() - simulator.cpu_time()
+        lags: list[float] = []
+        remove_listener = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_write)
+        probe = hass.async_create_task(_probe_loop_lag(lags))
+
+        await asyncio.sleep(DURATION)
+
+        probe.cancel()
+        remove_listener()
+        cpu = time.process_time() - simulator.cpu_time() - cpu_before
+        polls = sum(c.request_counters.requests for c in coordinators) - (
+            requests_before
+        )
+        failed_polls = (
+            sum(sum(c.request_counters.errors.values()) for c in coordinators)
+            - errors_before
+        )
+        queue = coordinators[0].io_worker.stats("127.0.0.1")
+
+        for entry in entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        simulator.stop()
+
+    assert polls > 0
+    entities = len(
+        er.async_entries_for_config_entry(er.async_get(hass), entries[0].entry_id)
+    )
+    scaling_report.append(
+        {
+            "inverters": inverters,
+            "entities": entities * inverters,
+            "setup_s": round(setup_time, 2),
+            "memory_per_entry_kib": round(memory_per_entry / 1024, 1),
+            "polls": polls,
+            "failed_polls": failed_polls,
+            "cpu_per_poll_ms": round(cpu / polls * 1000, 2),
+            "state_writes_per_s": round(state_writes / DURATION, 1),
+            "loop_lag_p50_ms": round(_percentile(lags, 50) * 1000, 2),
+            "loop_lag_p99_ms": round(_percentile(lags, 99) * 1000, 2),
+            "loop_lag_max_ms": round(max(lags) * 1000, 2),
+            "io_queue_wait_ms": round((queue["mean_wait"] or 0) * 1000, 1),
+        }
+    )
@@ -1,29 +1,52 @@
 """Test the Solarmax sensor functionality."""
 
 import pytest
-from unittest.mock import Mock, patch
-from datetime import datetime
+from unittest.mock import MagicMock, Mock, patch
+from datetime import datetime, timedelta
 
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
+from custom_components.solarmax.binary_sensor import SolarmaxBinarySensor
 from custom_components.solarmax.sensor import SolarmaxSensor
 from custom_components.solarmax.coordinator import SolarmaxCoordinator
-from custom_components.solarmax.const import SENSOR_TYPES
+from custom_components.solarmax.snapshot import Snapshot
+from custom_components.solarmax.solarmax_api import SolarmaxConnectionError
+from custom_components.solarmax.const import (
+    AGGREGATE_SENSOR_TYPES,
+    BINARY_SENSOR_TYPES,
+    CONF_HOST,
+    CONF_PORT,
+    DOMAIN,
+    SENSOR_TYPES,
+)
 
 
 @pytest.fixture
 def mock_coordinator():
     """Create a mock coordinator."""
     coordinator = Mock(spec=SolarmaxCoordinator)
-    coordinator.data = {
-        "SYS": {"value": 20019, "raw_value": 20019},
-        "PAC": {"value": 1500.0, "raw_value": 3000},
-    }
+    coordinator.data = Snapshot.from_data(
+        {
+            "SYS": {"value": 20019, "raw_value": 20019},
+            "PAC": {"value": 1500.0, "raw_value": 3000},
+        }
+    )
     coordinator.last_update_success = True
+    coordinator.consecutive_failures = 0
+    coordinator.is_expected_offline = False
+    coordinator.imports_statistics = False
+    coordinator.last_successful_update = None
+    coordinator.api = Mock(last_successful_connection=None)
+    coordinator.update_interval = timedelta(seconds=30)
+    coordinator.field_age.return_value = 0.0
+    coordinator.field_read_interval.return_value = 30.0
+    coordinator.is_field_fresh.return_value = True
     coordinator.hass = Mock(spec=HomeAssistant)
-    coordinator.hass.config.language = "en"
+    coordinator.hass.config = Mock(language="en")
+    coordinator.hass.states = Mock()
     coordinator.hass.states.get.return_value = None  # No sun component
     return coordinator
 
@@ -71,34 +94,68 @@ def test_sys_sensor_available_when_coordinator_fails(
     assert sensor.available is True
 
 
-@patch("custom_components.solarmax.sensor.dt_util.now")
-def test_other_sensor_unavailable_during_night_when_coordinator_fails(
-    mock_now, mock_coordinator, mock_config_entry
+async def test_sensors_unavailable_after_repeated_failures(
+    hass: HomeAssistant, freezer
 ):
-    """Test other sensors become unavailable during night when coordinator fails."""
-    # Mock night time (22:00)
-    mock_now.return_value = datetime(2024, 1, 1, 22, 0, 0)
-    mock_coordinator.last_update_success = False
-
+    """Test entities are told when their last good value turns stale."""
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Test Inverter",
+        data={CONF_HOST: "192.168.1.100", CONF_PORT: 12345},
+        source="user",
+        entry_id="test_entry_id",
+    )
+    coordinator = SolarmaxCoordinator(hass, entry)
+    coordinator.api = MagicMock()
+    coordinator.api.get_data.return_value = {
+        "PAC": {"value": 1500.0, "raw_value": 3000},
+        "SAL": {"value": 0, "raw_value": 0},
+    }
     sensor = SolarmaxSensor(
-        coordinator=mock_coordinator,
-        entry=mock_config_entry,
+        coordinator=coordinator,
+        entry=entry,
         sensor_key="PAC",
         sensor_config=SENSOR_TYPES["PAC"],
         device_name="Test Inverter",
     )
+    alarm = SolarmaxBinarySensor(
+        coordinator,
+        entry,
+        "alarm_active",
+        BINARY_SENSOR_TYPES["alarm_active"],
+        "Test Inverter",
+    )
+    notified = []
+    unsubscribe = coordinator.async_add_listener(
+        lambda: notified.append((sensor.available, alarm.available))
+    )
+
+    await coordinator.async_refresh()
+    assert notified == [(True, True)]
 
-    assert sensor.available is False
+    # Only the first of the failed polls notifies the entities
+    coordinator.api.get_data.side_effect = SolarmaxConnectionError("Unreachable")
+    overdue = coordinator.update_interval.total_seconds() + coordinator.stale_window
+    for _ in range(int(overdue // 30) + 1):
+        freezer.tick(30)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
 
+    assert coordinator.consecutive_failures > 2
+    assert notified[-1] == (False, False)
 
-@patch("custom_components.solarmax.sensor.dt_util.now")
-def test_other_sensor_available_during_day_when_coordinator_fails(
-    mock_now, mock_coordinator, mock_config_entry
+    unsubscribe()
+    await coordinator.async_shutdown()
+
+
+def test_other_sensor_serves_last_good_value_within_stale_window(
+    mock_coordinator, mock_config_entry
 ):
-    """Test other sensors remain available during day when coordinator fails."""
-    # Mock day time (12:00)
-    mock_now.return_value = datetime(2024, 1, 1, 12, 0, 0)
+    """Test other sensors keep their last good value with its age."""
     mock_coordinator.last_update_success = False
+    mock_coordinator.field_age.return_value = 95.4
 
     sensor = SolarmaxSensor(
         coordinator=mock_coordinator,
@@ -109,28 +166,30 @@ def test_other_sensor_available_during_day_when_coordinator_fails(
     )
 
     assert sensor.available is True
+    assert sensor.native_value == 1500.0
+    assert sensor.extra_state_attributes["age"] == 95
+    mock_coordinator.is_field_fresh.assert_called_with("PAC")
 
 
-def test_sys_sensor_shows_offline_when_coordinator_fails(
-    mock_coordinator, mock_config_entry
-):
-    """Test SYS sensor shows offline status when coordinator update fails."""
-    mock_coordinator.last_update_success = False
-
+def test_fresh_value_has_no_age(mock_coordinator, mock_config_entry):
+    """Test the age attribute is only added to stale values."""
     sensor = SolarmaxSensor(
         coordinator=mock_coordinator,
         entry=mock_config_entry,
-        sensor_key="SYS",
-        sensor_config=SENSOR_TYPES["SYS"],
+        sensor_key="PAC",
+        sensor_config=SENSOR_TYPES["PAC"],
         device_name="Test Inverter",
     )
 
-    assert sensor.native_value == "Offline"
+    assert "age" not in sensor.extra_state_attributes
 
 
-def test_sys_sensor_offline_attributes(mock_coordinator, mock_config_entry):
-    """Test SYS sensor shows offline attributes when coordinator update fails."""
+def test_sys_sensor_keeps_status_code_when_coordinator_fails(
+    mock_coordinator, mock_config_entry
+):
+    """Test SYS sensor keeps the inverter's status instead of connection text."""
     mock_coordinator.last_update_success = False
+    mock_coordinator.consecutive_failures = 3
 
     sensor = SolarmaxSensor(
         coordinator=mock_coordinator,
@@ -140,9 +199,10 @@ def test_sys_sensor_offline_attributes(mock_coordinator, mock_config_entry):
         device_name="Test Inverter",
     )
 
+    assert sensor.native_value == "Feed-in operation"
     attributes = sensor.extra_state_attributes
-    assert attributes["raw_value"] == "offline"
-    assert attributes["code"] == "offline"
+    assert attributes["code"] == 20019
+    assert "consecutive_failures" not in attributes
 
 
 def test_normal_sensor_operation(mock_coordinator, mock_config_entry):
@@ -162,3 +222,156 @@ def test_normal_sensor_operation(mock_coordinator, mock_config_entry):
     attributes = sensor.extra_state_attributes
     assert attributes["raw_value"] == 20019
     assert attributes["code"] == 20019
+
+
+def test_diagnostic_attributes_not_recorded():
+    """Test diagnostic attributes are excluded from the recorder."""
+    unrecorded = SolarmaxSensor._unrecorded_attributes
+    assert "raw_value" in unrecorded
+    assert "age" in unrecorded
+    assert "code" not in unrecorded
+
+
+def test_deadband_holds_back_small_changes(mock_coordinator, mock_config_entry):
+    """Test changes inside the deadband are not published."""
+    mock_config_entry.data = {
+        **mock_config_entry.data,
+        "deadbands": {
+            "PAC": {
+                "deadband_absolute": 50,
+                "deadband_relative": 0,
+                "deadband_max_age": 600,
+            }
+        },
+    }
+    sensor = SolarmaxSensor(
+        coordinator=mock_coordinator,
+        entry=mock_config_entry,
+        sensor_key="PAC",
+        sensor_config=SENSOR_TYPES["PAC"],
+        device_name="Test Inverter",
+    )
+    assert sensor.native_value == 1500.0
+
+    with patch.object(sensor, "async_write_ha_state") as mock_write:
+        mock_coordinator.data = Snapshot.from_data(
+            {"PAC": {"value": 1520.0, "raw_value": 3040}}
+        )
+        sensor._handle_coordinator_update()
+        mock_write.assert_not_called()
+        assert sensor.native_value == 1500.0
+
+        mock_coordinator.data = Snapshot.from_data(
+            {"PAC": {"value": 1600.0, "raw_value": 3200}}
+        )
+        sensor._handle_coordinator_update()
+        mock_write.assert_called_once()
+        assert sensor.native_value == 1600.0
+
+
+@patch("custom_components.solarmax.sensor.time.monotonic")
+def test_deadband_max_age_heartbeat(mock_time, mock_coordinator, mock_config_entry):
+    """Test values are republished once the maximum age is reached."""
+    mock_time.return_value = 1000.0
+    mock_config_entry.data = {
+        **mock_config_entry.data,
+        "deadbands": {
+            "PAC": {
+                "deadband_absolute": 0,
+                "deadband_relative": 10,
+                "deadband_max_age": 60,
+            }
+        },
+    }
+    sensor = SolarmaxSensor(
+        coordinator=mock_coordinator,
+        entry=mock_config_entry,
+        sensor_key="PAC",
+        sensor_config=SENSOR_TYPES["PAC"],
+        device_name="Test Inverter",
+    )
+
+    with patch.object(sensor, "async_write_ha_state") as mock_write:
+        mock_coordinator.data = Snapshot.from_data(
+            {"PAC": {"value": 1510.0, "raw_value": 3020}}
+        )
+        mock_time.return_value = 1030.0
+        sensor._handle_coordinator_update()
+        mock_write.assert_not_called()
+
+        mock_time.return_value = 1061.0
+        sensor._handle_coordinator_update()
+        mock_write.assert_called_once()
+        assert sensor.native_value == 1510.0
+
+
+def test_deadband_ignored_for_status(mock_coordinator, mock_config_entry):
+    """Test status codes are translated and published despite a deadband."""
+    mock_config_entry.data = {
+        **mock_config_entry.data,
+        "deadbands": {
+            "SYS": {
+                "deadband_absolute": 50,
+                "deadband_relative": 0,
+                "deadband_max_age": 600,
+            }
+        },
+    }
+    sensor = SolarmaxSensor(
+        coordinator=mock_coordinator,
+        entry=mock_config_entry,
+        sensor_key="SYS",
+        sensor_config=SENSOR_TYPES["SYS"],
+        device_name="Test Inverter",
+    )
+    assert sensor.native_value == "Feed-in operation"
+
+    with patch.object(sensor, "async_write_ha_state") as mock_write:
+        mock_coordinator.data = Snapshot.from_data(
+            {"SYS": {"value": 20018, "raw_value": 20018}}
+        )
+        sensor._handle_coordinator_update()
+        mock_write.assert_called_once()
+        assert sensor.native_value == "Starting up"
+
+
+def test_aggregate_sensor_reads_statistic(mock_coordinator, mock_config_entry):
+    """Test min/max sensors read their statistic from the source field."""
+    mock_coordinator.data = Snapshot.from_data(
+        {
+            "PAC": {
+                "value": 1500.0,
+                "raw_value": 3000,
+                "min": 900.0,
+                "max": 2100.0,
+                "samples": 12,
+            }
+        }
+    )
+
+    sensor = SolarmaxSensor(
+        coordinator=mock_coordinator,
+        entry=mock_config_entry,
+        sensor_key="PAC_max",
+        sensor_config=AGGREGATE_SENSOR_TYPES["PAC_max"],
+        device_name="Test Inverter",
+    )
+
+    assert sensor.unique_id == "test_entry_id-pac_max"
+    assert sensor.native_value == 2100.0
+    assert sensor.extra_state_attributes is None
+
+
+def test_imported_statistics_replace_state_class(mock_coordinator, mock_config_entry):
+    """Test sensors with imported statistics are not compiled by the recorder."""
+    mock_coordinator.imports_statistics = True
+
+    for key in ("PAC", "KDY"):
+        sensor = SolarmaxSensor(
+            coordinator=mock_coordinator,
+            entry=mock_config_entry,
+            sensor_key=key,
+            sensor_config=SENSOR_TYPES[key],
+            device_name="Test Inverter",
+        )
+        assert sensor.state_class is None
@@ -0,0 +1,171 @@
+"""Test the Solarmax RS485 transport."""
+
+import os
+import pty
+import select
+import threading
+import time
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.solarmax.const import (
+    CONF_ADDRESS,
+    CONF_BAUDRATE,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_PROTOCOL,
+    DOMAIN,
+    PROTOCOL_SERIAL,
+)
+from custom_components.solarmax.coordinator import SolarmaxCoordinator
+from custom_components.solarmax.serial_api import SerialAPI
+from custom_components.solarmax.solarmax_api import (
+    SolarmaxAPI,
+    SolarmaxConnectionError,
+    SolarmaxProtocolError,
+)
+
+from .simulator import SimulatedInverter
+
+
+class BusSimulator:
+    """Inverters answering on the far end of a pseudo-terminal."""
+
+    def __init__(self, addresses: tuple[int, ...] = (1,)) -> None:
+        """Open the pseudo-terminal; nothing answers before start()."""
+        self.inverters = {address: SimulatedInverter(address) for address in addresses}
+        self.frames: list[str] = []
+        self.stale_response: str | None = None
+        self._master, self._slave = pty.openpty()
+        self.device = os.ttyname(self._slave)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rs485_simulator")
+
+    def _run(self) -> None:
+        """Answer every request addressed to a simulated inverter."""
+        buffer = b""
+        while not self._stop.is_set():
+            if not select.select([self._master], [], [], 0.05)[0]:
+                continue
+            buffer += os.read(self._master, 1024)
+            while b"}" in buffer:
+                frame, buffer = buffer.split(b"}", 1)
+                request = frame.decode() + "}"
+                self.frames.append(request)
+                if self.stale_response is not None:
+                    os.write(self._master, self.stale_response.encode())
+                    self.stale_response = None
+                address = int(request.split(";", 2)[1], 16)
+                if inverter := self.inverters.get(address):
+                    os.write(self._master, inverter.answer(request).encode())
+
+    def __enter__(self) -> "BusSimulator":
+        """Start answering."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop answering and close the pseudo-terminal."""
+        self._stop.set()
+        self._thread.join()
+        os.close(self._slave)
+        os.close(self._master)
+
+
+def test_get_data():
+    """Test a poll over the serial line."""
+    with BusSimulator() as bus:
+        api = SerialAPI(bus.device, timeout=2)
+        data = api.get_data({"PAC": "AC_Power (W)", "SYS": "status_Code"})
+
+    assert bus.frames[0].startswith("{FB;01;")
+    assert data["SYS"]["raw_value"] == 0x4E33
+    assert data["PAC"]["value"] > 0
+
+
+def test_attributes():
+    """Test the device is the host and the bus address is not taken as port."""
+    api = SerialAPI("/dev/ttyUSB0")
+
+    assert api.host == "/dev/ttyUSB0"
+    assert api.port is None
+    assert api.endpoint == "/dev/ttyUSB0"
+    assert api.address == 1
+    assert api.baudrate == 19200
+    assert api.frame_gap == 0.05
+
+
+def test_bus_addresses():
+    """Test inverters sharing a bus are polled by their address."""
+    with BusSimulator((1, 2)) as bus:
+        for address in (1, 2):
+            api = SerialAPI(bus.device, address=address, frame_gap=0, timeout=2)
+            assert api.get_data({"SYS": "status_Code"})["SYS"]["raw_value"] == 0x4E33
+
+    assert [inverter.requests for inverter in bus.inverters.values()] == [1, 1]
+    assert bus.frames[1].startswith("{FB;02;")
+
+
+def test_answer_of_other_inverter_discarded():
+    """Test a late answer of another inverter is not taken as the own."""
+    with BusSimulator((2,)) as bus:
+        bus.stale_response = SolarmaxAPI("bus").build_response({"PAC": "FFFF"})
+        api = SerialAPI(bus.device, address=2, frame_gap=0, timeout=2)
+        data = api.get_data({"PAC": "AC_Power (W)"})
+
+    # The stale frame fails the first read, the field group is read again
+    assert len(bus.frames) == 2
+    assert data["PAC"]["raw_value"] != 0xFFFF
+
+    api = SerialAPI("/dev/null", address=2)
+    with pytest.raises(SolarmaxProtocolError):
+        api.verify_frame(SolarmaxAPI("bus").build_response({"PAC": "10"}))
+
+
+def test_frame_gap():
+    """Test the bus is kept quiet between frames."""
+    with BusSimulator() as bus:
+        api = SerialAPI(bus.device, frame_gap=0.2, timeout=2)
+        api.get_data({"SYS": "status_Code"})
+        started = time.monotonic()
+        api.get_data({"SYS": "status_Code"})
+        elapsed = time.monotonic() - started
+
+    assert elapsed >= 0.2
+
+
+def test_open_failure():
+    """Test a missing device fails like a refused connection."""
+    api = SerialAPI("/dev/solarmax-missing", timeout=1)
+
+    assert not api.test_connection()
+    with pytest.raises(SolarmaxConnectionError):
+        api._create_socket_connection()
+
+
+async def test_coordinator_uses_serial(hass: HomeAssistant):
+    """Test the protocol option selects the serial transport."""
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="RS485",
+        data={
+            CONF_HOST: "/dev/ttyUSB0",
+            CONF_PORT: 12345,
+            CONF_PROTOCOL: PROTOCOL_SERIAL,
+            CONF_ADDRESS: 3,
+            CONF_BAUDRATE: 9600,
+        },
+        source="user",
+        entry_id="rs485",
+    )
+    coordinator = SolarmaxCoordinator(hass, entry)
+
+    assert isinstance(coordinator.api, SerialAPI)
+    assert (coordinator.api.host, coordinator.api.port) == ("/dev/ttyUSB0", None)
+    assert coordinator.api.address == 3
+    assert coordinator.api.baudrate == 9600
+    assert coordinator.api.frame_gap == 0.05
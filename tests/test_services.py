@@ -0,0 +1,125 @@
+"""Test the Solarmax services."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from custom_components.solarmax.const import (
+    DOMAIN,
+    SERVICE_PROFILE,
+    SERVICE_REFRESH,
+    SERVICE_TRACE_MEMORY,
+)
+from custom_components.solarmax.services import async_setup_services
+from custom_components.solarmax.solarmax_api import SolarmaxConnectionError
+
+
+@pytest.fixture
+def loaded_entry(hass: HomeAssistant, mock_config_entry):
+    """Return a loaded config entry with a mock coordinator."""
+    mock_config_entry.add_to_hass(hass)
+    mock_config_entry.mock_state(hass, ConfigEntryState.LOADED)
+    coordinator = MagicMock()
+    coordinator.async_refresh_fields = AsyncMock()
+    mock_config_entry.runtime_data = coordinator
+    return mock_config_entry
+
+
+async def test_refresh_service_all_entries(hass: HomeAssistant, loaded_entry):
+    """Test refreshing every loaded inverter."""
+    await async_setup_services(hass)
+
+    await hass.services.async_call(DOMAIN, SERVICE_REFRESH, {}, blocking=True)
+
+    loaded_entry.runtime_data.async_refresh_fields.assert_awaited_once_with(None)
+
+
+async def test_refresh_service_group(hass: HomeAssistant, loaded_entry):
+    """Test refreshing a single field group of one inverter."""
+    await async_setup_services(hass)
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_REFRESH,
+        {"config_entry_id": loaded_entry.entry_id, "group": "power"},
+        blocking=True,
+    )
+
+    loaded_entry.runtime_data.async_refresh_fields.assert_awaited_once_with("power")
+
+
+async def test_refresh_service_unknown_entry(hass: HomeAssistant):
+    """Test refreshing an unknown config entry is rejected."""
+    await async_setup_services(hass)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_REFRESH,
+            {"config_entry_id": "does_not_exist"},
+            blocking=True,
+        )
+
+
+async def test_refresh_service_failure(hass: HomeAssistant, loaded_entry):
+    """Test a failed refresh is surfaced to the caller."""
+    await async_setup_services(hass)
+    loaded_entry.runtime_data.async_refresh_fields.side_effect = (
+        SolarmaxConnectionError("Connection refused")
+    )
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(DOMAIN, SERVICE_REFRESH, {}, blocking=True)
+
+
+async def test_profile_service(hass: HomeAssistant, loaded_entry):
+    """Test profiling attaches one session and refuses a second one."""
+    await async_setup_services(hass)
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_PROFILE, {"refreshes": 3}, blocking=True
+    )
+
+    coordinator = loaded_entry.runtime_data
+    coordinator.attach_refresh_session.assert_called_once()
+    session = coordinator.attach_refresh_session.call_args[0][0]
+    assert session._refreshes == 3
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {}, blocking=True)
+
+    # Unloaded before its first refresh: nothing to write
+    session.detach(coordinator)
+    assert await session.finished is None
+
+
+async def test_profile_service_no_entries(hass: HomeAssistant):
+    """Test profiling without loaded inverters is rejected."""
+    await async_setup_services(hass)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(DOMAIN, SERVICE_PROFILE, {}, blocking=True)
+
+
+async def test_trace_memory_service(hass: HomeAssistant, loaded_entry):
+    """Test a memory trace attaches one session and refuses a second one."""
+    await async_setup_services(hass)
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_TRACE_MEMORY, {"polls": 2}, blocking=True
+    )
+
+    coordinator = loaded_entry.runtime_data
+    coordinator.attach_refresh_session.assert_called_once()
+    session = coordinator.attach_refresh_session.call_args[0][0]
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(DOMAIN, SERVICE_TRACE_MEMORY, {}, blocking=True)
+
+    # Two refreshes finish the trace
+    assert session.exit(coordinator) is False
+    assert session.exit(coordinator) is True
+    assert await session.finished is hass.data[DOMAIN]["memory_report"]
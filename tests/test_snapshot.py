@@ -0,0 +1,94 @@
+"""Test the Solarmax data snapshots."""
+
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timezone
+
+import pytest
+
+from custom_components.solarmax.snapshot import Snapshot
+
+SAMPLED_AT = datetime(2024, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_snapshot_access():
+    """Test indexed access to values, raw values and statistics."""
+    snapshot = Snapshot.from_data(
+        {
+            "PAC": {"value": 1500.0, "raw_value": 3000},
+            "SYS": {"value": 20019, "raw_value": 20019},
+            "PDC": {
+                "value": 1600.0,
+                "raw_value": 3200,
+                "min": 1400.0,
+                "max": 1800.0,
+                "samples": 6,
+            },
+            "XYZ": {"value": 1, "raw_value": 1},
+        },
+        sequence=3,
+        sampled_at=SAMPLED_AT,
+        duration=0.25,
+    )
+
+    assert snapshot.value("PAC") == 1500.0
+    assert snapshot.raw("PAC") == 3000
+    assert snapshot.value("KDY") is None
+    assert snapshot.value("XYZ") is None
+    assert snapshot.statistic("PDC", "max") == 1800.0
+    assert snapshot.statistic("PAC", "max") is None
+    assert "PAC" in snapshot
+    assert "KDY" not in snapshot
+    assert set(snapshot) == {"PAC", "PDC", "SYS"}
+    assert len(snapshot) == 3
+    assert snapshot.sequence == 3
+    assert snapshot.duration == 0.25
+    assert snapshot.as_dict()["PDC"] == {
+        "value": 1600.0,
+        "raw_value": 3200,
+        "min": 1400.0,
+        "max": 1800.0,
+        "samples": 6,
+    }
+
+
+def test_snapshot_is_immutable():
+    """Test snapshots cannot be changed."""
+    snapshot = Snapshot.from_data({"PAC": {"value": 1500.0, "raw_value": 3000}})
+
+    with pytest.raises(FrozenInstanceError):
+        snapshot.sequence = 2
+    with pytest.raises(TypeError):
+        snapshot.statistics["PAC"] = (0, 0, 0)
+
+
+def test_snapshot_equality_ignores_metadata():
+    """Test snapshots with the same values are equal."""
+    data = {"PAC": {"value": 1500.0, "raw_value": 3000}}
+
+    assert Snapshot.from_data(data, sequence=1) == Snapshot.from_data(
+        data, sequence=2, sampled_at=SAMPLED_AT
+    )
+    assert Snapshot.from_data(data) != Snapshot.from_data(
+        {"PAC": {"value": 1510.0, "raw_value": 3020}}
+    )
+
+
+def test_snapshot_diff():
+    """Test the changed fields between two snapshots."""
+    previous = Snapshot.from_data(
+        {
+            "PAC": {"value": 1500.0, "raw_value": 3000},
+            "SYS": {"value": 20019, "raw_value": 20019},
+        }
+    )
+    current = Snapshot.from_data(
+        {
+            "PAC": {"value": 1600.0, "raw_value": 3200},
+            "SYS": {"value": 20019, "raw_value": 20019},
+            "KDY": {"value": 100, "raw_value": 100},
+        }
+    )
+
+    assert current.diff(previous) == {"PAC": (1500.0, 1600.0), "KDY": (None, 100)}
+    assert current.diff(current) == {}
+    assert set(current.diff(None)) == {"PAC", "SYS", "KDY"}
@@ -0,0 +1,150 @@
+"""Test the Solarmax long-term statistics import."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.solarmax.statistics_import import (
+    HourlyStatistics,
+    statistic_id,
+)
+
+
+def test_statistic_id():
+    """Test external statistic IDs are valid slugs."""
+    assert statistic_id("01HABCDEF", "PAC") == "solarmax:01habcdef_pac"
+
+
+async def test_hourly_statistics_import(hass: HomeAssistant):
+    """Test a completed hour is imported with mean/min/max and sums."""
+    statistics = HourlyStatistics(hass, "test_entry", "Test Inverter")
+
+    def poll(pac, kdy, kt0):
+        return {
+            "PAC": {"value": pac, "raw_value": pac * 2},
+            "KDY": {"value": kdy, "raw_value": kdy},
+            "KT0": {"value": kt0, "raw_value": kt0},
+        }
+
+    with (
+        patch(
+            "custom_components.solarmax.statistics_import.async_add_external_statistics"
+        ) as mock_add,
+        patch.object(
+            statistics,
+            "_async_load_sums",
+            AsyncMock(return_value={"KDY": 100.0, "KT0": 5000.0}),
+        ),
+    ):
+        statistics.add(
+            poll(1000.0, 2000, 1200), datetime(2024, 6, 1, 10, 5, tzinfo=timezone.utc)
+        )
+        statistics.add(
+            poll(3000.0, 2500, 1201), datetime(2024, 6, 1, 10, 35, tzinfo=timezone.utc)
+        )
+        mock_add.assert_not_called()
+
+        # The first poll of the next hour closes the previous one
+        statistics.add(
+            poll(500.0, 2600, 1201), datetime(2024, 6, 1, 11, 0, tzinfo=timezone.utc)
+        )
+        await hass.async_block_till_done()
+    statistics.async_stop()
+
+    imported = {
+        call[0][1]["statistic_id"]: call[0][2][0] for call in mock_add.call_args_list
+    }
+
+    pac = imported["solarmax:test_entry_pac"]
+    assert pac["start"] == datetime(2024, 6, 1, 10, 0, tzinfo=timezone.utc)
+    assert pac["mean"] == 2000.0
+    assert pac["min"] == 1000.0
+    assert pac["max"] == 3000.0
+
+    kdy = imported["solarmax:test_entry_kdy"]
+    assert kdy["state"] == 2500
+    assert kdy["sum"] == 600.0
+    assert "last_reset" in kdy
+
+    kt0 = imported["solarmax:test_entry_kt0"]
+    assert kt0["sum"] == 5001.0
+
+
+def test_hourly_statistics_counter_reset(hass: HomeAssistant):
+    """Test a daily counter reset counts the new value as growth."""
+    statistics = HourlyStatistics(hass, "test_entry", "Test Inverter")
+    now = datetime(2024, 6, 1, 0, 5, tzinfo=timezone.utc)
+
+    statistics.add({"KDY": {"value": 9000, "raw_value": 9000}}, now)
+    statistics.add({"KDY": {"value": 20, "raw_value": 20}}, now)
+    statistics.async_stop()
+
+    assert statistics._energy_growth["KDY"] == 20
+
+
+async def test_hour_closed_at_top_of_hour(hass: HomeAssistant, freezer):
+    """Test the last hour of the day is imported without a following poll."""
+    freezer.move_to("2024-06-01 19:40:00+00:00")
+    statistics = HourlyStatistics(hass, "test_entry", "Test Inverter")
+
+    with (
+        patch(
+            "custom_components.solarmax.statistics_import.async_add_external_statistics"
+        ) as mock_add,
+        patch.object(
+            statistics,
+            "_async_load_sums",
+            AsyncMock(return_value={"KDY": 100.0, "KT0": 5000.0}),
+        ),
+    ):
+        statistics.add({"PAC": {"value": 80.0, "raw_value": 160}}, dt_util.utcnow())
+        freezer.move_to("2024-06-01 20:00:00+00:00")
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+        (call,) = mock_add.call_args_list
+        assert call[0][1]["statistic_id"] == "solarmax:test_entry_pac"
+        assert call[0][2][0]["start"] == datetime(
+            2024, 6, 1, 19, 0, tzinfo=timezone.utc
+        )
+
+        # Hours without polls are not imported
+        freezer.move_to("2024-06-01 21:00:00+00:00")
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        assert mock_add.call_count == 1
+
+    statistics.async_stop()
+
+
+async def test_overlapping_imports_serialized(hass: HomeAssistant):
+    """Test imports of consecutive hours load the sums once and add up."""
+    statistics = HourlyStatistics(hass, "test_entry", "Test Inverter")
+    start = datetime(2024, 6, 1, 10, 0, tzinfo=timezone.utc)
+
+    async def load_sums():
+        await asyncio.sleep(0)
+        return {"KDY": 100.0, "KT0": 5000.0}
+
+    with (
+        patch(
+            "custom_components.solarmax.statistics_import.async_add_external_statistics"
+        ) as mock_add,
+        patch.object(
+            statistics, "_async_load_sums", AsyncMock(side_effect=load_sums)
+        ) as mock_load,
+    ):
+        await asyncio.gather(
+            statistics._async_import(start, {}, {"KT0": (1201, 1.0)}),
+            statistics._async_import(start, {}, {"KT0": (1203, 2.0)}),
+        )
+
+    mock_load.assert_called_once()
+    assert [call[0][2][0]["sum"] for call in mock_add.call_args_list] == [
+        5001.0,
+        5003.0,
+    ]
@@ -0,0 +1,129 @@
+"""Test the Solarmax trace ring."""
+
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.solarmax.solarmax_api import SolarmaxAPI, SolarmaxTimeoutError
+from custom_components.solarmax.tracing import Tracer
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _Costly:
+    """An argument that counts how often it is formatted."""
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self.formatted = 0
+
+    def __str__(self) -> str:
+        """Count the formatting."""
+        self.formatted += 1
+        return "costly"
+
+
+def test_messages_are_formatted_lazily():
+    """Test messages are only assembled when the ring is dumped."""
+    tracer = Tracer(LOGGER)
+
+    with (
+        patch.object(LOGGER, "isEnabledFor", return_value=False),
+        patch("custom_components.solarmax.tracing.TraceRecord.format") as format_,
+    ):
+        tracer.debug("Sending request: %s", "{FB;01;1A|64:PAC|0C5C}")
+    format_.assert_not_called()
+
+    (record,) = tracer.as_list()
+    assert record["message"] == "Sending request: {FB;01;1A|64:PAC|0C5C}"
+    assert record["level"] == "DEBUG"
+    assert record["time"].endswith("+00:00")
+
+
+def test_arguments_are_captured():
+    """Test objects are kept as they were, without pinning them."""
+    tracer = Tracer(LOGGER)
+    costly = _Costly()
+    data = {"PAC": 1000}
+
+    tracer.debug("Converted data: %s %r", data, costly)
+    data["PAC"] = 2000
+
+    (record,) = tracer.as_list()
+    assert record["message"] == "Converted data: {'PAC': 1000} costly"
+    assert costly.formatted == 1
+    assert all(isinstance(arg, str) for arg in tracer._records[0].args)
+
+
+def test_polls_are_sampled():
+    """Test only sampled or failed polls are kept."""
+    tracer = Tracer(LOGGER, sample_rate=0.5)
+
+    with patch("custom_components.solarmax.tracing.random.random") as sample:
+        sample.return_value = 0.7
+        tracer.begin()
+        tracer.debug("Skipped poll")
+        tracer.end(failed=False)
+
+        tracer.begin()
+        tracer.debug("Failed poll")
+        tracer.error("Failed after %d attempts", 3)
+        tracer.end(failed=True)
+
+        sample.return_value = 0.2
+        tracer.begin()
+        tracer.debug("Sampled poll")
+        tracer.end(failed=False)
+
+    assert [record["message"] for record in tracer.as_list()] == [
+        "Failed poll",
+        "Failed after 3 attempts",
+        "Sampled poll",
+    ]
+    assert (tracer.polls, tracer.kept) == (3, 2)
+
+
+def test_ring_is_bounded():
+    """Test the oldest records are dropped."""
+    tracer = Tracer(LOGGER, size=3)
+    for index in range(5):
+        tracer.debug("Record %d", index)
+
+    assert [record["message"] for record in tracer.as_list()] == [
+        "Record 2",
+        "Record 3",
+        "Record 4",
+    ]
+
+
+def test_redaction_and_bad_arguments():
+    """Test secrets are replaced and broken messages still dumped."""
+    tracer = Tracer(LOGGER)
+    tracer.debug("Connecting to %s:%s", "192.168.1.100", 12345)
+    tracer.debug("Two values %s %s", "one")
+
+    records = tracer.as_list(redact=["192.168.1.100", ""])
+
+    assert records[0]["message"] == "Connecting to **REDACTED**:12345"
+    assert records[1]["message"] == "Two values %s %s ('one',)"
+
+
+@patch("socket.socket")
+@patch("custom_components.solarmax.solarmax_api.time.sleep")
+def test_api_keeps_failed_polls(mock_sleep, mock_socket):
+    """Test a failed poll is kept even though no poll is sampled."""
+    mock_sock = MagicMock()
+    mock_socket.return_value = mock_sock
+    mock_sock.recv.return_value = b""
+    api = SolarmaxAPI("192.168.1.100", timeout=0)
+    api.tracer.sample_rate = 0
+
+    with pytest.raises(SolarmaxTimeoutError):
+        api.get_data({"PAC": "AC_Power (W)"})
+
+    messages = [record["message"] for record in api.tracer.as_list()]
+    assert messages[0] == "Getting data from inverter (attempt 1/3)"
+    assert any(message.startswith("Sending request: {FB;01;") for message in messages)
+    assert messages[-1] == "Failed to get data from inverter after 3 attempts"
+    assert (api.tracer.polls, api.tracer.kept) == (1, 1)
@@ -0,0 +1,170 @@
+"""Test the Solarmax websocket API."""
+
+from collections import deque
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.solarmax.const import DOMAIN
+from custom_components.solarmax.snapshot import Snapshot
+from custom_components.solarmax.websocket_api import websocket_subscribe
+
+SAMPLED_AT = datetime(2025, 9, 11, 10, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def entry(hass: HomeAssistant):
+    """Return a loaded entry with a coordinator stand-in."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, entry_id="entry1", state=ConfigEntryState.LOADED
+    )
+    entry.add_to_hass(hass)
+    entry.runtime_data = MagicMock()
+    entry.runtime_data.data = Snapshot.from_data(
+        {
+            "PAC": {"value": 1500.0, "raw_value": 3000},
+            "SYS": {"value": 20019, "raw_value": 20019},
+        },
+        sampled_at=SAMPLED_AT,
+    )
+    return entry
+
+
+def _schema():
+    """Return the validated message schema of the subscribe command."""
+    return websocket_subscribe._ws_schema
+
+
+def test_subscribe_schema():
+    """Test the subscribe command validates fields and interval."""
+    schema = _schema()
+
+    msg = schema({"id": 1, "type": "solarmax/subscribe", "config_entry_id": "x"})
+    assert msg["interval"] == 2
+    assert "fields" not in msg
+
+    msg = schema(
+        {
+            "id": 1,
+            "type": "solarmax/subscribe",
+            "config_entry_id": "x",
+            "fields": "PAC",
+            "interval": 1,
+        }
+    )
+    assert msg["fields"] == ["PAC"]
+
+    with pytest.raises(vol.Invalid):
+        schema(
+            {
+                "id": 1,
+                "type": "solarmax/subscribe",
+                "config_entry_id": "x",
+                "fields": ["XYZ"],
+            }
+        )
+    with pytest.raises(vol.Invalid):
+        schema(
+            {
+                "id": 1,
+                "type": "solarmax/subscribe",
+                "config_entry_id": "x",
+                "interval": 0.1,
+            }
+        )
+
+
+async def test_subscribe(hass: HomeAssistant, entry):
+    """Test subscribing streams the current and later samples."""
+    connection = MagicMock()
+    connection.subscriptions = {}
+    coordinator = entry.runtime_data
+
+    websocket_subscribe(
+        hass,
+        connection,
+        _schema()(
+            {
+                "id": 5,
+                "type": "solarmax/subscribe",
+                "config_entry_id": "entry1",
+                "fields": ["PAC"],
+            }
+        ),
+    )
+
+    coordinator.async_subscribe_live.assert_called_once()
+    forward, fields, interval = coordinator.async_subscribe_live.call_args[0]
+    assert fields == {"PAC"}
+    assert interval == 2
+    busy = coordinator.async_subscribe_live.call_args[1]["busy"]
+    assert connection.subscriptions[5] is coordinator.async_subscribe_live.return_value
+    connection.send_result.assert_called_once_with(5)
+
+    # The current value is sent right away
+    assert connection.send_message.call_args[0][0] == websocket_api.event_message(
+        5,
+        {
+            "sampled_at": SAMPLED_AT.isoformat(),
+            "data": {"PAC": {"value": 1500.0, "raw_value": 3000}},
+            "dropped": 0,
+        },
+    )
+
+    forward({"PAC": {"value": 1600.0, "raw_value": 3200}}, SAMPLED_AT, 3)
+    assert connection.send_message.call_args[0][0]["event"]["dropped"] == 3
+
+    # Without the handler's send queue the client is never considered busy
+    assert busy() is False
+
+
+async def test_subscribe_busy_while_messages_pending(hass: HomeAssistant, entry):
+    """Test deliveries wait while messages are queued for the client."""
+
+    class Handler:
+        """A websocket handler that writes nothing to the client."""
+
+        def __init__(self) -> None:
+            """Initialize the send queue."""
+            self._message_queue = deque()
+
+        def send_message(self, message) -> None:
+            """Queue a message."""
+            self._message_queue.append(message)
+
+    handler = Handler()
+    connection = MagicMock()
+    connection.subscriptions = {}
+    connection.send_message = handler.send_message
+
+    websocket_subscribe(
+        hass,
+        connection,
+        _schema()({"id": 5, "type": "solarmax/subscribe", "config_entry_id": "entry1"}),
+    )
+    busy = entry.runtime_data.async_subscribe_live.call_args[1]["busy"]
+
+    # The current values are still waiting to be written
+    assert busy() is True
+    handler._message_queue.clear()
+    assert busy() is False
+
+
+async def test_subscribe_unknown_entry(hass: HomeAssistant):
+    """Test subscribing to an unknown entry fails."""
+    connection = MagicMock()
+
+    websocket_subscribe(
+        hass,
+        connection,
+        {"id": 5, "type": "solarmax/subscribe", "config_entry_id": "missing"},
+    )
+
+    connection.send_error.assert_called_once()
+    assert connection.send_error.call_args[0][1] == websocket_api.ERR_NOT_FOUND
@@ -0,0 +1,176 @@
+"""Test the Solarmax I/O worker."""
+
+import asyncio
+import gc
+import threading
+import time
+
+import pytest
+
+from custom_components.solarmax.worker import IOWorker
+
+
+@pytest.fixture
+async def worker():
+    """Return a worker."""
+    worker = IOWorker(asyncio.get_running_loop())
+    yield worker
+    worker.shutdown()
+
+
+class Tracker:
+    """Blocking call that records how many calls run at once."""
+
+    def __init__(self):
+        """Initialize the tracker."""
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.calls = []
+
+    def __call__(self, name, delay=0.02):
+        """Run a call for a while."""
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.calls.append(name)
+        time.sleep(delay)
+        with self.lock:
+            self.running -= 1
+        return name
+
+
+async def test_gateway_requests_run_in_order(worker):
+    """Test requests to one gateway never overlap and keep their order."""
+    tracker = Tracker()
+
+    jobs = [worker.submit("gw1", tracker, index) for index in range(4)]
+    assert worker.stats("gw1")["depth"] == 3
+    assert worker.stats("gw1")["busy"] is True
+
+    assert await asyncio.gather(*jobs) == [0, 1, 2, 3]
+    assert tracker.peak == 1
+    assert tracker.calls == [0, 1, 2, 3]
+
+    stats = worker.stats("gw1")
+    assert stats["depth"] == 0
+    assert stats["busy"] is False
+    assert stats["started"] == 4
+    # Later jobs waited for the earlier ones
+    assert jobs[3].wait >= jobs[0].duration
+    assert stats["mean_wait"] > 0
+
+
+async def test_gateways_run_in_parallel(worker):
+    """Test a gateway hanging in a call does not delay other gateways."""
+    tracker = Tracker()
+    hanging = threading.Event()
+
+    stuck = worker.submit("gw0", hanging.wait, 5)
+    jobs = [worker.submit(f"gw{index}", tracker, index) for index in range(1, 4)]
+    assert await asyncio.gather(*jobs) == [1, 2, 3]
+
+    assert tracker.peak == 3
+    assert worker.stats("gw0")["busy"] is True
+    hanging.set()
+    assert await stuck is True
+
+
+async def test_threads_are_bounded():
+    """Test all gateways share a fixed number of threads."""
+    worker = IOWorker(asyncio.get_running_loop(), max_threads=2)
+    tracker = Tracker()
+
+    jobs = [worker.submit(f"gw{index}", tracker, index) for index in range(6)]
+    assert await asyncio.gather(*jobs) == list(range(6))
+
+    assert tracker.peak == 2
+    worker.shutdown()
+
+
+async def test_release_drops_queue_when_idle(worker):
+    """Test a released gateway's queue is dropped once its jobs are done."""
+    tracker = Tracker()
+    running = worker.submit("gw1", tracker, "running", 0.05)
+
+    worker.release("gw1")
+    assert "gw1" in worker.queues
+    assert await running == "running"
+    assert "gw1" not in worker.queues
+
+    # A later request gets a new queue
+    assert await worker.submit("gw1", tracker, "again") == "again"
+    assert "gw1" in worker.queues
+
+
+async def test_errors_reach_the_caller(worker):
+    """Test exceptions of the call are raised by awaiting the job."""
+
+    def fail():
+        raise ConnectionRefusedError("refused")
+
+    job = worker.submit("gw1", fail)
+    with pytest.raises(ConnectionRefusedError):
+        await job
+
+    # The queue keeps working
+    assert await worker.submit("gw1", lambda: 42) == 42
+    assert job.duration is not None
+
+
+async def test_abandoned_jobs_are_skipped(worker):
+    """Test a job whose caller gave up before it started never runs."""
+    tracker = Tracker()
+
+    first = worker.submit("gw1", tracker, "first", 0.05)
+    abandoned = worker.submit("gw1", tracker, "abandoned")
+    abandoned.future.cancel()
+    last = worker.submit("gw1", tracker, "last")
+
+    await asyncio.gather(first, last)
+
+    assert tracker.calls == ["first", "last"]
+
+
+async def test_cancelled_caller_does_not_leak_errors(worker):
+    """Test a failing call whose caller was cancelled logs nothing."""
+    loop = asyncio.get_running_loop()
+    errors = []
+    loop.set_exception_handler(lambda loop, context: errors.append(context))
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.02)
+        raise ConnectionRefusedError("refused")
+
+    running = worker.submit("gw1", fail)
+    queued = worker.submit("gw1", fail)
+    caller = asyncio.ensure_future(asyncio.gather(running, queued))
+    await loop.run_in_executor(None, started.wait)
+    caller.cancel()
+    await asyncio.sleep(0)
+
+    # The queued job is dropped right away, the running one finishes
+    assert worker.stats("gw1")["depth"] == 0
+    while worker.stats("gw1")["busy"]:
+        await asyncio.sleep(0.01)
+    gc.collect()
+    loop.set_exception_handler(None)
+
+    assert errors == []
+    assert worker.stats("gw1")["started"] == 1
+
+
+async def test_shutdown_cancels_queued_jobs(worker):
+    """Test shutting down drops the jobs that did not start."""
+    tracker = Tracker()
+    running = worker.submit("gw1", tracker, "running", 0.05)
+    queued = worker.submit("gw1", tracker, "queued")
+
+    worker.shutdown()
+
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    assert await running == "running"
+    assert tracker.calls == ["running"]